@@ -8,15 +8,46 @@ functions for S3 file discovery, download management, and coverage data merging.
 
 import os
 import json
+import dataclasses
+import functools
+import gzip
+import itertools
+import mmap
+import re
+import shutil
 import tempfile
+import uuid
+from contextlib import contextmanager
+from queue import Empty, SimpleQueue
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
 from datetime import datetime
 from typing import List, Dict, Any, Optional, Tuple
 from pathlib import Path
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.exceptions import ClientError, NoCredentialsError
 import coverage
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj, default=str).decode('utf-8')
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+    
+    def _json_dumps(obj: Any) -> str:
+        return json.dumps(obj, default=str)
+
+try:
+    import ijson
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError, ijson.JSONError)
+except ImportError:  # ijson is optional; fall back to parsing the whole report
+    ijson = None
+    _JSON_DECODE_ERRORS = (json.JSONDecodeError,)
+
 from .models import CoverageConfig, CombinerResult
 from .s3_uploader import get_s3_config
 from .logging_utils import get_logger, performance_timer
@@ -24,11 +55,66 @@ from .logging_utils import get_logger, performance_timer
 # Set up structured logging
 logger = get_logger(__name__)
 
+# Maximum number of concurrent deletions when cleaning up downloaded files
+_CLEANUP_MAX_WORKERS = 8
+
+# Default number of concurrent S3 downloads, overridable via COVERAGE_DL_CONCURRENCY
+_DOWNLOAD_MAX_WORKERS = 16
+
+# Default number of concurrent multipart upload parts, overridable via COVERAGE_UL_CONCURRENCY
+_UPLOAD_MAX_CONCURRENCY = 10
+
+# Combined reports above this size are uploaded in parts of the same size
+_MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+
+# Splits "{function_name}-{execution_id}" at the last hyphen; execution IDs
+# are at most 20 characters and never contain a hyphen
+_FUNCTION_EXECUTION_RE = re.compile(r'(?P<function_name>.*)-(?P<execution_id>[^-]{1,20})')
+
+# Trailing key segments that belong to the function name, not an execution ID
+_COMMON_FUNCTION_WORDS = frozenset(['function', 'lambda', 'handler', 'service', 'api', 'worker'])
+
+# S3 error codes returned for an object that was deleted after it was listed
+_MISSING_OBJECT_ERROR_CODES = ('404', 'NoSuchKey')
+
+# Size of the reusable buffers used to copy and (de)compress report files
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Copy buffers returned after use, so warm invocations do not reallocate them
+_COPY_BUFFER_POOL = SimpleQueue()
+
+# Objects requested per list_objects_v2 page
+_LIST_PAGE_SIZE = 1000
+
+# Number of parsed report summaries kept for reuse across validation passes
+_REPORT_CACHE_SIZE = 1024
+
+# Maximum number of keys accepted by a single S3 DeleteObjects request
+_S3_DELETE_BATCH_SIZE = 1000
+
+# Error reported for an invalid value of each event parameter
+_COMBINER_EVENT_ERRORS = {
+    'bucket_name': "bucket_name is required in event",
+    'prefix': "prefix must be a string",
+    'output_key': "output_key must be a string",
+    'max_files': "max_files must be a positive integer"
+}
+
+# Shared shape of every failed combination; callers always replace errors
+_FAILED_RESULT = CombinerResult(
+    success=False,
+    combined_file_key="",
+    files_processed=0,
+    files_skipped=0,
+    total_coverage_percentage=0.0
+)
+
 
 @performance_timer("coverage_files_download")
 def download_coverage_files(bucket_name: str, 
                           prefix: str = "coverage/",
-                          max_files: Optional[int] = None) -> List[Dict[str, Any]]:
+                          max_files: Optional[int] = None,
+                          download_dir: Optional[str] = None) -> List[Dict[str, Any]]:
     """
     Download coverage files from S3 prefix and return file information.
     
@@ -41,6 +127,10 @@ def download_coverage_files(bucket_name: str,
         bucket_name (str): S3 bucket name containing coverage files
         prefix (str): S3 key prefix to search for coverage files (default: "coverage/")
         max_files (Optional[int]): Maximum number of files to download (None for unlimited)
+        download_dir (Optional[str]): Caller-owned directory to download files into.
+                                     If None, each file is written to the system
+                                     temp directory and the caller removes them
+                                     individually with cleanup_downloaded_files
         
     Returns:
         List[Dict[str, Any]]: List of dictionaries containing file information:
@@ -66,70 +156,52 @@ def download_coverage_files(bucket_name: str,
                bucket=bucket_name, prefix=prefix, max_files=max_files)
     
     try:
-        # Initialize S3 client
-        s3_client = boto3.client('s3')
+        # Reuse the module-level S3 client across invocations
+        s3_client = _s3()
         
-        # List all objects in the prefix
+        # Listing is lazy: the next page is only fetched once the downloads
+        # already queued leave room for more, so listing overlaps with GETs
+        candidates = _iter_coverage_objects(s3_client, bucket_name, prefix)
         downloaded_files = []
-        continuation_token = None
-        files_processed = 0
-        
-        while True:
-            # Prepare list_objects_v2 parameters
-            list_params = {
-                'Bucket': bucket_name,
-                'Prefix': prefix,
-                'MaxKeys': 1000  # Process in batches
-            }
-            
-            if continuation_token:
-                list_params['ContinuationToken'] = continuation_token
-            
-            # List objects
-            response = s3_client.list_objects_v2(**list_params)
-            
-            if 'Contents' not in response:
-                logger.info("No coverage files found", bucket=bucket_name, prefix=prefix)
-                break
-            
-            # Process each object
-            for obj in response['Contents']:
-                s3_key = obj['Key']
+        in_flight = set()
+        listing_done = False
+        max_workers = _get_concurrency('COVERAGE_DL_CONCURRENCY', _DOWNLOAD_MAX_WORKERS)
+        
+        # A single client is shared across workers; boto3 clients are thread-safe
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while True:
+                # Keep the pool fed without queueing more than max_files could use
+                while (not listing_done
+                       and len(in_flight) < max_workers * 2
+                       and not (max_files and len(downloaded_files) + len(in_flight) >= max_files)):
+                    obj = next(candidates, None)
+                    if obj is None:
+                        listing_done = True
+                        break
+                    in_flight.add(executor.submit(
+                        _download_single_file, s3_client, bucket_name, obj['Key'], obj, download_dir
+                    ))
                 
-                # Check if we've reached the maximum file limit
-                if max_files and files_processed >= max_files:
-                    logger.info("Reached maximum file limit, stopping download", 
-                               max_files=max_files, files_processed=files_processed)
+                if not in_flight:
                     break
                 
-                # Filter valid coverage files
-                if not _is_valid_coverage_file(s3_key):
-                    logger.debug("Skipping non-coverage file", s3_key=s3_key)
-                    continue
-                
-                try:
-                    # Download the file
-                    file_info = _download_single_file(s3_client, bucket_name, s3_key, obj)
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        file_info = future.result()
+                    except Exception as e:
+                        logger.warning("Failed to download coverage file", 
+                                      error=str(e), error_type=type(e).__name__)
+                        continue
+                    
                     if file_info:
                         downloaded_files.append(file_info)
-                        files_processed += 1
-                        logger.debug("Downloaded coverage file", s3_key=s3_key, 
+                        logger.debug("Downloaded coverage file", s3_key=file_info['s3_key'], 
                                    file_size=file_info.get('file_size', 0))
-                    
-                except Exception as e:
-                    logger.warning("Failed to download coverage file", 
-                                  s3_key=s3_key, error=str(e), error_type=type(e).__name__)
-                    continue
-            
-            # Check if there are more objects to process
-            if not response.get('IsTruncated', False):
-                break
-            
-            continuation_token = response.get('NextContinuationToken')
-            
-            # Break if we've reached the file limit
-            if max_files and files_processed >= max_files:
-                break
+        
+        if max_files and len(downloaded_files) >= max_files:
+            logger.info("Reached maximum file limit, stopping download", 
+                       max_files=max_files, files_processed=len(downloaded_files))
         
         logger.info("Successfully downloaded coverage files", 
                    files_downloaded=len(downloaded_files),
@@ -157,6 +229,84 @@ def download_coverage_files(bucket_name: str,
         raise
 
 
+@functools.lru_cache(maxsize=4)
+def _s3(region: Optional[str] = None):
+    """
+    Get a cached S3 client so the service model is only loaded once.
+    
+    Args:
+        region: Optional AWS region; None uses the default resolution chain
+        
+    Returns:
+        S3 client shared by every caller in this process
+    """
+    return boto3.client('s3', region_name=region)
+
+
+def _get_concurrency(env_var: str, default: int) -> int:
+    """
+    Get a concurrency setting from the environment.
+    
+    Args:
+        env_var (str): Name of the environment variable to read
+        default (int): Value used when the variable is unset or invalid
+        
+    Returns:
+        int: The configured value, or the default when it is unset or not
+             a positive integer
+    """
+    value = os.environ.get(env_var)
+    if not value:
+        return default
+    
+    try:
+        concurrency = int(value)
+    except ValueError:
+        concurrency = 0
+    
+    if concurrency < 1:
+        logger.warning(f"Invalid {env_var}, using default",
+                      value=value, default=default)
+        return default
+    
+    return concurrency
+
+
+def _iter_coverage_objects(s3_client, bucket_name: str, prefix: str):
+    """
+    Lazily yield listing entries for coverage files under an S3 prefix.
+    
+    Uses the list_objects_v2 paginator so pages are requested on demand and
+    the full key list is never materialized.
+    
+    Args:
+        s3_client: Boto3 S3 client instance
+        bucket_name (str): S3 bucket name
+        prefix (str): S3 key prefix to search
+        
+    Yields:
+        Dict: list_objects_v2 ``Contents`` entries for valid coverage files
+    """
+    paginator = s3_client.get_paginator('list_objects_v2')
+    pages = paginator.paginate(
+        Bucket=bucket_name,
+        Prefix=prefix,
+        PaginationConfig={'PageSize': _LIST_PAGE_SIZE}
+    )
+    
+    found_any = False
+    for page in pages:
+        for obj in page.get('Contents', []):
+            found_any = True
+            if not _is_valid_coverage_file(obj['Key']):
+                logger.debug("Skipping non-coverage file", s3_key=obj['Key'])
+                continue
+            yield obj
+    
+    if not found_any:
+        logger.info("No coverage files found", bucket=bucket_name, prefix=prefix)
+
+
 def _is_valid_coverage_file(s3_key: str) -> bool:
     """
     Check if an S3 key represents a valid coverage file.
@@ -209,62 +359,136 @@ def _is_valid_coverage_file(s3_key: str) -> bool:
     return True
 
 
-def _download_single_file(s3_client, bucket_name: str, s3_key: str, obj_metadata: Dict) -> Optional[Dict[str, Any]]:
+def _download_single_file(s3_client, bucket_name: str, s3_key: str, obj_metadata: Dict,
+                          download_dir: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """
     Download a single coverage file from S3 to local temporary storage.
     
+    Object size and timestamp are taken from the caller's listing entry rather
+    than a per-object head_object request, so each file costs a single GET.
+    
     Args:
         s3_client: Boto3 S3 client instance
         bucket_name (str): S3 bucket name
         s3_key (str): S3 object key
-        obj_metadata (Dict): S3 object metadata from list_objects_v2
+        obj_metadata (Dict): The list_objects_v2 ``Contents`` entry for the object.
+                             Must contain ``Size`` and ``LastModified``; ``ETag``
+                             is forwarded by the listing but not required
+        download_dir (Optional[str]): Directory to write the file into
+                                     (defaults to the system temp directory)
         
     Returns:
-        Optional[Dict[str, Any]]: File information dictionary or None if download failed
+        Optional[Dict[str, Any]]: File information dictionary, including its
+                                  'validation_status' or 'validation_error',
+                                  or None if download failed
     """
+    # A random name inside a caller-owned directory avoids a mkstemp per file
+    local_path = os.path.join(download_dir or tempfile.gettempdir(),
+                              f"coverage_{uuid.uuid4().hex}.json")
+    
     try:
-        # Create temporary file
-        temp_file = tempfile.NamedTemporaryFile(
-            mode='wb',
-            suffix='.json',
-            prefix='coverage_',
-            delete=False  # Keep file for processing
-        )
-        
         # Download file from S3
-        s3_client.download_fileobj(bucket_name, s3_key, temp_file)
-        temp_file.close()
+        with open(local_path, 'wb') as f:
+            s3_client.download_fileobj(bucket_name, s3_key, f)
         
         # Extract metadata from S3 key
         function_name, execution_id = _extract_metadata_from_key(s3_key)
         
         # Validate downloaded file
-        if not _validate_coverage_file(temp_file.name):
+        if not _validate_coverage_file(local_path):
             logger.warning(f"Downloaded file {s3_key} failed validation, skipping")
-            os.unlink(temp_file.name)  # Clean up invalid file
+            os.unlink(local_path)  # Clean up invalid file
             return None
         
-        # Return file information
-        return {
+        file_info = {
             's3_key': s3_key,
-            'local_path': temp_file.name,
+            'local_path': local_path,
             'file_size': obj_metadata['Size'],
             'last_modified': obj_metadata['LastModified'],
             'function_name': function_name,
             'execution_id': execution_id
         }
         
+        # Finish validating here so it overlaps with the downloads still in
+        # flight; validate_coverage_files_integrity reuses the result
+        validation_result = _perform_advanced_validation(local_path)
+        if validation_result['valid']:
+            file_info['validation_status'] = 'valid'
+        else:
+            file_info['validation_error'] = validation_result['error']
+        
+        # Return file information
+        return file_info
+        
+    except ClientError as e:
+        # Objects deleted between listing and download 404 on the GET itself,
+        # which costs no more than a HEAD would have
+        if e.response.get('Error', {}).get('Code') in _MISSING_OBJECT_ERROR_CODES:
+            logger.warning(f"Coverage file {s3_key} no longer exists, skipping")
+        else:
+            logger.error(f"Error downloading {s3_key}: {str(e)}")
+        _remove_partial_download(local_path)
+        return None
     except Exception as e:
         logger.error(f"Error downloading {s3_key}: {str(e)}")
-        # Clean up temporary file if it was created
-        if 'temp_file' in locals() and hasattr(temp_file, 'name'):
-            try:
-                os.unlink(temp_file.name)
-            except OSError:
-                pass
+        _remove_partial_download(local_path)
         return None
 
 
+def _remove_partial_download(local_path: str) -> None:
+    """
+    Remove a partially written download, if any.
+    
+    Args:
+        local_path (str): Path the download was being written to
+    """
+    try:
+        os.unlink(local_path)
+    except OSError:
+        pass
+
+
+@contextmanager
+def _pooled_buffer():
+    """
+    Borrow a copy buffer from the pool, allocating one if none is free.
+    
+    Yields:
+        bytearray: Buffer of _COPY_BUFFER_SIZE bytes, returned to the pool on exit
+    """
+    try:
+        buffer = _COPY_BUFFER_POOL.get_nowait()
+    except Empty:
+        buffer = bytearray(_COPY_BUFFER_SIZE)
+    
+    try:
+        yield buffer
+    finally:
+        _COPY_BUFFER_POOL.put(buffer)
+
+
+def _copy_stream(src, dst) -> int:
+    """
+    Copy a binary stream through a pooled buffer instead of per-chunk bytes.
+    
+    Args:
+        src: Readable binary file object supporting readinto
+        dst: Writable binary file object
+        
+    Returns:
+        int: Number of bytes copied
+    """
+    copied = 0
+    with _pooled_buffer() as buffer, memoryview(buffer) as view:
+        while True:
+            size = src.readinto(buffer)
+            if not size:
+                break
+            dst.write(view[:size])
+            copied += size
+    return copied
+
+
 def _extract_metadata_from_key(s3_key: str) -> Tuple[Optional[str], Optional[str]]:
     """
     Extract function name and execution ID from S3 key.
@@ -279,39 +503,28 @@ def _extract_metadata_from_key(s3_key: str) -> Tuple[Optional[str], Optional[str
     """
     try:
         # Get filename without path and extension
-        filename = Path(s3_key).stem
+        filename = os.path.splitext(s3_key.rsplit('/', 1)[-1])[0]
         
         # Remove 'coverage-' prefix if present
         if filename.startswith('coverage-'):
             filename = filename[9:]  # Remove 'coverage-' prefix
         
-        # For files without execution ID, the entire remaining string is the function name
-        # For files with execution ID, split by last hyphen
-        if '-' in filename:
-            # Try to split by last hyphen - this assumes execution IDs don't contain hyphens
-            # but function names might
-            parts = filename.rsplit('-', 1)
-            if len(parts) == 2:
-                function_name, potential_execution_id = parts
-                # Check if the last part looks like an execution ID
-                # Execution IDs are typically short alphanumeric strings (UUIDs, timestamps, etc.)
-                # They usually don't contain common words like "function", "lambda", "handler"
-                common_function_words = ['function', 'lambda', 'handler', 'service', 'api', 'worker']
-                
-                if (potential_execution_id and 
-                    len(potential_execution_id) <= 20 and 
-                    potential_execution_id.lower() not in common_function_words and
-                    # Check if it's mostly alphanumeric (allowing some special chars)
-                    len([c for c in potential_execution_id if c.isalnum()]) / len(potential_execution_id) > 0.7):
-                    return function_name, potential_execution_id
-                else:
-                    # Last part doesn't look like execution ID, treat whole thing as function name
-                    return filename, None
-            else:
-                return filename, None
-        else:
-            # No hyphens, entire string is function name
+        # Split at the last hyphen; without a plausible execution ID suffix
+        # the entire remaining string is the function name
+        match = _FUNCTION_EXECUTION_RE.fullmatch(filename)
+        if not match:
             return filename, None
+        
+        function_name, potential_execution_id = match.group('function_name', 'execution_id')
+        
+        # Execution IDs are short, mostly alphanumeric strings (UUIDs, timestamps, etc.)
+        # and are not common words like "function", "lambda", "handler"
+        if (potential_execution_id.lower() not in _COMMON_FUNCTION_WORDS and
+                sum(c.isalnum() for c in potential_execution_id) / len(potential_execution_id) > 0.7):
+            return function_name, potential_execution_id
+        
+        # Last part doesn't look like execution ID, treat whole thing as function name
+        return filename, None
             
     except Exception as e:
         logger.debug(f"Could not extract metadata from key {s3_key}: {str(e)}")
@@ -332,13 +545,17 @@ def _validate_coverage_file(file_path: str) -> bool:
         bool: True if the file is valid, False otherwise
     """
     try:
-        # Check if file exists and is not empty
-        if not os.path.exists(file_path) or os.path.getsize(file_path) == 0:
+        # Reject missing files and anything shorter than the smallest
+        # JSON object ("{}") with a single stat call, before opening it
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        if stat.st_size < 2:
             return False
         
-        # Try to parse as JSON
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        # Parse once per file version; later validation passes reuse it
+        data = _load_report_summary(file_path, stat.st_mtime_ns, stat.st_size)
         
         # Check for required coverage.py JSON structure
         required_keys = ['files', 'totals']
@@ -359,7 +576,7 @@ def _validate_coverage_file(file_path: str) -> bool:
         # Basic validation passed
         return True
         
-    except json.JSONDecodeError as e:
+    except _JSON_DECODE_ERRORS as e:
         logger.debug(f"Coverage file {file_path} is not valid JSON: {str(e)}")
         return False
     except Exception as e:
@@ -367,27 +584,192 @@ def _validate_coverage_file(file_path: str) -> bool:
         return False
 
 
-def cleanup_downloaded_files(file_list: List[Dict[str, Any]]) -> None:
+def _load_json_file(file_path: str) -> Any:
+    """
+    Parse a JSON file by memory-mapping it instead of reading it into a str.
+    
+    Uses orjson when it is installed and the stdlib parser otherwise. Both
+    raise a json.JSONDecodeError subclass on malformed input.
+    
+    Args:
+        file_path (str): Path to the JSON file
+        
+    Returns:
+        Any: The decoded JSON document
+    """
+    with open(file_path, 'rb') as f:
+        # mmap cannot map an empty file; let the parser report it instead
+        if os.fstat(f.fileno()).st_size == 0:
+            return _json_loads(b'')
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _json_loads(mm[:])
+
+
+@functools.lru_cache(maxsize=_REPORT_CACHE_SIZE)
+def _load_report_summary(file_path: str, mtime_ns: int, size: int) -> Any:
+    """
+    Parse a coverage report into the summary used by the validators.
+    
+    Results are cached by path, modification time and size, so the download,
+    integrity and merge validation passes parse each file only once. Only a
+    summary is cached: entries under 'files' are replaced by None.
+    
+    Args:
+        file_path (str): Path to the coverage report
+        mtime_ns (int): File modification time in nanoseconds
+        size (int): File size in bytes
+        
+    Returns:
+        Any: Decoded report with every files entry replaced by None
+    """
+    if ijson:
+        with open(file_path, 'rb') as f:
+            return _stream_report_summary(f)
+    
+    data = _load_json_file(file_path)
+    if isinstance(data, dict) and isinstance(data.get('files'), dict):
+        data = {**data, 'files': dict.fromkeys(data['files'])}
+    return data
+
+
+def cleanup_downloaded_files(file_list: List[Dict[str, Any]],
+                             download_dir: Optional[str] = None) -> None:
     """
     Clean up temporary files downloaded from S3.
     
     This function removes all temporary files created during the download process
-    to free up disk space.
+    to free up disk space. Deletions are issued concurrently so that slow
+    network filesystems (e.g. EFS) cost roughly one round-trip instead of one
+    per file. When the download directory is given it is removed in one go and
+    files inside it are not unlinked individually.
     
     Args:
         file_list (List[Dict[str, Any]]): List of file information dictionaries
                                          containing 'local_path' keys
+        download_dir (Optional[str]): Download directory to remove afterwards
     """
     logger.debug(f"Cleaning up {len(file_list)} temporary coverage files")
     
-    for file_info in file_list:
-        local_path = file_info.get('local_path')
-        if local_path and os.path.exists(local_path):
-            try:
-                os.unlink(local_path)
-                logger.debug(f"Removed temporary file: {local_path}")
-            except OSError as e:
-                logger.warning(f"Failed to remove temporary file {local_path}: {str(e)}")
+    local_paths = [f.get('local_path') for f in file_list if f.get('local_path')]
+    if download_dir:
+        local_paths = [p for p in local_paths if os.path.dirname(p) != download_dir]
+    
+    if local_paths:
+        with ThreadPoolExecutor(max_workers=_CLEANUP_MAX_WORKERS) as executor:
+            list(executor.map(_safe_unlink, local_paths))
+    
+    if download_dir:
+        shutil.rmtree(download_dir, ignore_errors=True)
+        logger.debug(f"Removed download directory: {download_dir}")
+
+
+def _safe_unlink(local_path: str) -> None:
+    """
+    Remove a single temporary file, ignoring files that are already gone.
+    
+    Args:
+        local_path (str): Path of the file to remove
+    """
+    try:
+        os.unlink(local_path)
+        logger.debug(f"Removed temporary file: {local_path}")
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Failed to remove temporary file {local_path}: {str(e)}")
+
+
+def cleanup_s3_objects(bucket_name: str, s3_keys: List[str], s3_client=None) -> int:
+    """
+    Delete source coverage objects from S3 in batches.
+    
+    Keys are removed with DeleteObjects in batches of up to 1000, so N
+    objects cost ceil(N / 1000) requests instead of N.
+    
+    Args:
+        bucket_name (str): S3 bucket containing the objects
+        s3_keys (List[str]): Keys of the objects to delete
+        s3_client: Boto3 S3 client instance (created if not provided)
+        
+    Returns:
+        int: Number of objects S3 reported as deleted
+        
+    Raises:
+        ClientError: If a DeleteObjects request fails
+    """
+    if not s3_keys:
+        return 0
+    
+    if s3_client is None:
+        s3_client = _s3()
+    
+    deleted_count = 0
+    keys = iter(s3_keys)
+    while True:
+        batch = list(itertools.islice(keys, _S3_DELETE_BATCH_SIZE))
+        if not batch:
+            break
+        
+        response = s3_client.delete_objects(
+            Bucket=bucket_name,
+            Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+        )
+        
+        errors = response.get('Errors', [])
+        for error in errors:
+            logger.warning(f"Failed to delete s3://{bucket_name}/{error.get('Key')}: "
+                           f"{error.get('Code')} - {error.get('Message')}")
+        deleted_count += len(batch) - len(errors)
+    
+    logger.info(f"Deleted {deleted_count} of {len(s3_keys)} coverage objects from s3://{bucket_name}")
+    return deleted_count
+
+
+@dataclasses.dataclass(frozen=True)
+class _FileSummary:
+    """
+    Size, function and date reductions over a file info list.
+    
+    Built in a single pass so get_coverage_file_stats and the merge
+    statistics share one loop instead of each walking the list per field.
+    """
+    total_size: int
+    function_names: frozenset
+    earliest: Optional[datetime]
+    latest: Optional[datetime]
+    
+    @classmethod
+    def from_files(cls, file_list: List[Dict[str, Any]]) -> '_FileSummary':
+        """Reduce file info dicts in one loop, skipping missing values."""
+        total_size = 0
+        function_names = set()
+        earliest = latest = None
+        
+        for file_info in file_list:
+            total_size += file_info.get('file_size', 0)
+            
+            function_name = file_info.get('function_name')
+            if function_name:
+                function_names.add(function_name)
+            
+            last_modified = file_info.get('last_modified')
+            if last_modified:
+                if earliest is None or last_modified < earliest:
+                    earliest = last_modified
+                if latest is None or last_modified > latest:
+                    latest = last_modified
+        
+        return cls(total_size, frozenset(function_names), earliest, latest)
+    
+    def functions(self) -> List[str]:
+        """Sorted distinct function names."""
+        return sorted(self.function_names)
+    
+    def date_range(self) -> Optional[Dict[str, datetime]]:
+        """Earliest and latest modification times, or None if none are known."""
+        if self.earliest is None:
+            return None
+        return {'earliest': self.earliest, 'latest': self.latest}
 
 
 def get_coverage_file_stats(file_list: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -408,24 +790,17 @@ def get_coverage_file_stats(file_list: List[Dict[str, Any]]) -> Dict[str, Any]:
             'date_range': None
         }
     
-    # Calculate statistics
-    total_size = sum(f['file_size'] for f in file_list)
-    functions = list(set(f['function_name'] for f in file_list if f['function_name']))
-    
-    # Find date range
-    dates = [f['last_modified'] for f in file_list]
-    date_range = {
-        'earliest': min(dates),
-        'latest': max(dates)
-    } if dates else None
+    summary = _FileSummary.from_files(file_list)
+    total_size = summary.total_size
+    functions = summary.functions()
     
     return {
         'file_count': len(file_list),
         'total_size_bytes': total_size,
         'total_size_mb': round(total_size / (1024 * 1024), 2),
-        'functions': sorted(functions),
+        'functions': functions,
         'function_count': len(functions),
-        'date_range': date_range
+        'date_range': summary.date_range()
     }
 
 
@@ -433,8 +808,8 @@ def merge_coverage_data(file_list: List[Dict[str, Any]]) -> Tuple[str, Dict[str,
     """
     Merge multiple coverage files into a single coverage report.
     
-    This function uses coverage.py's combine functionality to merge multiple
-    coverage data files into a single consolidated report. It handles duplicate
+    This function uses coverage.py's data API to merge multiple coverage
+    data files into a single consolidated report. It handles duplicate
     and overlapping coverage data appropriately and validates file integrity.
     
     Args:
@@ -482,15 +857,18 @@ def merge_coverage_data(file_list: List[Dict[str, Any]]) -> Tuple[str, Dict[str,
     try:
         # Create temporary directory for coverage operations
         with tempfile.TemporaryDirectory(prefix='coverage_merge_') as temp_dir:
+            combined_data_file = os.path.join(temp_dir, '.coverage_combined')
+            data_files = [f['local_path'] for f in valid_files]
+            
             # Create coverage instance for combining
             combined_coverage = coverage.Coverage(
-                data_file=os.path.join(temp_dir, '.coverage_combined'),
+                data_file=combined_data_file,
                 config_file=False
             )
             
-            # Combine all coverage files
-            data_files = [f['local_path'] for f in valid_files]
-            combined_coverage.combine(data_files, strict=False, keep=False)
+            # Merge the data files one by one through CoverageData
+            _update_coverage_data(data_files, combined_data_file)
+            combined_coverage.load()
             
             # Generate JSON report
             combined_file = tempfile.NamedTemporaryFile(
@@ -517,6 +895,38 @@ def merge_coverage_data(file_list: List[Dict[str, Any]]) -> Tuple[str, Dict[str,
         raise
 
 
+def _update_coverage_data(data_files: List[str], combined_data_file: str) -> int:
+    """
+    Merge coverage data files into one with CoverageData.update.
+    
+    Unlike Coverage.combine this skips configuration loading and plugin
+    setup, and writes the combined data file once. Files that coverage.py
+    cannot read are skipped with a warning, as combine(strict=False) does.
+    
+    Args:
+        data_files (List[str]): Paths of the coverage data files to merge
+        combined_data_file (str): Path of the combined data file to create
+        
+    Returns:
+        int: Number of data files merged
+    """
+    combined_data = coverage.CoverageData(basename=combined_data_file)
+    merged = 0
+    
+    for data_file in data_files:
+        data = coverage.CoverageData(basename=data_file)
+        try:
+            data.read()
+            combined_data.update(data)
+        except coverage.CoverageException as e:
+            logger.warning(f"Couldn't merge coverage data file {data_file}: {str(e)}")
+            continue
+        merged += 1
+    
+    combined_data.write()
+    return merged
+
+
 def _calculate_merge_statistics(valid_files: List[Dict[str, Any]], 
                                skipped_files: List[Dict[str, Any]], 
                                combined_file_path: str) -> Dict[str, Any]:
@@ -532,33 +942,26 @@ def _calculate_merge_statistics(valid_files: List[Dict[str, Any]],
         Dict[str, Any]: Merge statistics including coverage percentage and file counts
     """
     try:
-        # Read combined coverage data to get total coverage
-        with open(combined_file_path, 'r', encoding='utf-8') as f:
-            combined_data = json.load(f)
+        # Read combined coverage totals; coverage.py already aggregated them,
+        # so the per-file line arrays are skipped when ijson is available
+        with open(combined_file_path, 'rb') as f:
+            combined_data = _stream_report_summary(f) if ijson else _json_loads(f.read())
         
         # Extract coverage percentage from totals
         totals = combined_data.get('totals', {})
         total_coverage_percentage = totals.get('percent_covered', 0.0)
         
-        # Calculate file statistics
-        functions_merged = list(set(f.get('function_name') for f in valid_files if f.get('function_name')))
-        total_size_merged = sum(f.get('file_size', 0) for f in valid_files)
-        
-        # Get date range
-        dates = [f.get('last_modified') for f in valid_files if f.get('last_modified')]
-        date_range = {
-            'earliest': min(dates),
-            'latest': max(dates)
-        } if dates else None
+        summary = _FileSummary.from_files(valid_files)
+        functions_merged = summary.functions()
         
         return {
             'files_processed': len(valid_files),
             'files_skipped': len(skipped_files),
             'total_coverage_percentage': total_coverage_percentage,
-            'functions_merged': sorted(functions_merged),
+            'functions_merged': functions_merged,
             'function_count': len(functions_merged),
-            'total_size_bytes': total_size_merged,
-            'date_range': date_range,
+            'total_size_bytes': summary.total_size,
+            'date_range': summary.date_range(),
             'combined_file_size': os.path.getsize(combined_file_path),
             'merge_timestamp': datetime.utcnow()
         }
@@ -597,6 +1000,7 @@ def validate_coverage_files_integrity(file_list: List[Dict[str, Any]]) -> Tuple[
     
     valid_files = []
     invalid_files = []
+    existing_files = []
     
     for file_info in file_list:
         local_path = file_info.get('local_path')
@@ -607,32 +1011,69 @@ def validate_coverage_files_integrity(file_list: List[Dict[str, Any]]) -> Tuple[
             invalid_files.append({**file_info, 'validation_error': 'File not found'})
             continue
         
-        try:
-            # Basic file validation
-            if not _validate_coverage_file(local_path):
-                logger.warning(f"Basic validation failed: {s3_key}")
-                invalid_files.append({**file_info, 'validation_error': 'Basic validation failed'})
-                continue
-            
-            # Advanced integrity checks
-            validation_result = _perform_advanced_validation(local_path)
-            if not validation_result['valid']:
-                logger.warning(f"Advanced validation failed for {s3_key}: {validation_result['error']}")
-                invalid_files.append({**file_info, 'validation_error': validation_result['error']})
-                continue
-            
-            # File passed all validations
-            valid_files.append({**file_info, 'validation_status': 'valid'})
-            logger.debug(f"File validated successfully: {s3_key}")
-            
-        except Exception as e:
-            logger.error(f"Validation error for {s3_key}: {str(e)}")
-            invalid_files.append({**file_info, 'validation_error': f"Validation exception: {str(e)}"})
+        existing_files.append(file_info)
+    
+    for file_info in existing_files:
+        s3_key = file_info.get('s3_key', 'unknown')
+        
+        # Files validated while they were downloaded already carry a result
+        if _has_validation_result(file_info):
+            error = file_info.get('validation_error')
+        else:
+            error = _validate_one_file(file_info['local_path'])
+        
+        if error:
+            logger.warning(f"Validation failed for {s3_key}: {error}")
+            invalid_files.append({**file_info, 'validation_error': error})
+            continue
+        
+        # File passed all validations
+        valid_files.append({**file_info, 'validation_status': 'valid'})
+        logger.debug(f"File validated successfully: {s3_key}")
     
     logger.info(f"Validation complete: {len(valid_files)} valid, {len(invalid_files)} invalid")
     return valid_files, invalid_files
 
 
+def _has_validation_result(file_info: Dict[str, Any]) -> bool:
+    """
+    Check whether a file was already fully validated, e.g. during download.
+    
+    Args:
+        file_info (Dict[str, Any]): Downloaded file information
+        
+    Returns:
+        bool: True if the file carries a validation status or error
+    """
+    return 'validation_error' in file_info or file_info.get('validation_status') == 'valid'
+
+
+def _validate_one_file(local_path: str) -> Optional[str]:
+    """
+    Run basic and advanced validation on a single coverage file.
+    
+    Args:
+        local_path (str): Path to the coverage file
+        
+    Returns:
+        Optional[str]: Validation error message, or None if the file is valid
+    """
+    try:
+        # Basic file validation
+        if not _validate_coverage_file(local_path):
+            return 'Basic validation failed'
+        
+        # Advanced integrity checks
+        validation_result = _perform_advanced_validation(local_path)
+        if not validation_result['valid']:
+            return validation_result['error']
+        
+        return None
+        
+    except Exception as e:
+        return f"Validation exception: {str(e)}"
+
+
 def _perform_advanced_validation(file_path: str) -> Dict[str, Any]:
     """
     Perform advanced validation checks on a coverage file.
@@ -644,37 +1085,22 @@ def _perform_advanced_validation(file_path: str) -> Dict[str, Any]:
         Dict[str, Any]: Validation result with 'valid' boolean and optional 'error' message
     """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stat = os.stat(file_path)
+        data = _load_report_summary(file_path, stat.st_mtime_ns, stat.st_size)
         
-        # Check for reasonable data structure
-        files_data = data.get('files', {})
-        totals_data = data.get('totals', {})
+        # Check structure and numeric totals
+        report_error = _first_report_error(data)
+        if report_error:
+            return {'valid': False, 'error': report_error}
         
-        # Validate files section
-        if not isinstance(files_data, dict):
-            return {'valid': False, 'error': 'Invalid files section structure'}
+        totals_data = data['totals']
+        covered_lines = totals_data['covered_lines']
+        num_statements = totals_data['num_statements']
         
         # Check if files section has reasonable content
-        if len(files_data) == 0:
+        if len(data.get('files', {})) == 0:
             logger.debug(f"Coverage file {file_path} has no file coverage data")
         
-        # Validate totals section
-        required_total_keys = ['covered_lines', 'num_statements']
-        for key in required_total_keys:
-            if key not in totals_data:
-                return {'valid': False, 'error': f'Missing required total key: {key}'}
-        
-        # Check for reasonable numeric values
-        covered_lines = totals_data.get('covered_lines', 0)
-        num_statements = totals_data.get('num_statements', 0)
-        
-        if not isinstance(covered_lines, (int, float)) or covered_lines < 0:
-            return {'valid': False, 'error': 'Invalid covered_lines value'}
-        
-        if not isinstance(num_statements, (int, float)) or num_statements < 0:
-            return {'valid': False, 'error': 'Invalid num_statements value'}
-        
         # Check coverage percentage consistency
         if num_statements > 0:
             calculated_percentage = (covered_lines / num_statements) * 100
@@ -687,12 +1113,68 @@ def _perform_advanced_validation(file_path: str) -> Dict[str, Any]:
         
         return {'valid': True}
         
-    except json.JSONDecodeError as e:
+    except _JSON_DECODE_ERRORS as e:
         return {'valid': False, 'error': f'JSON decode error: {str(e)}'}
     except Exception as e:
         return {'valid': False, 'error': f'Validation error: {str(e)}'}
 
 
+def _stream_report_summary(file_obj) -> Any:
+    """
+    Stream-parse a coverage report, skipping the per-file coverage data.
+    
+    The files section is tokenized but never built: each file key is kept
+    with a None value so its type and size can still be checked. Memory use
+    is bounded by the totals object and the list of file names rather than
+    by the size of the report.
+    
+    Args:
+        file_obj: Binary file object positioned at the start of the report
+        
+    Returns:
+        Any: Decoded report with every files entry replaced by None
+    """
+    builder = ijson.ObjectBuilder()
+    
+    for prefix, event, value in ijson.parse(file_obj, use_float=True):
+        if prefix.startswith('files.'):
+            continue
+        builder.event(event, value)
+        if prefix == 'files' and event == 'map_key':
+            builder.event('null', None)
+    
+    return builder.value
+
+
+def _first_report_error(data: Any) -> Optional[str]:
+    """
+    Check the structure and numeric totals of a decoded coverage report.
+    
+    Args:
+        data (Any): Decoded coverage JSON document
+        
+    Returns:
+        Optional[str]: Message for the first problem found, or None if valid
+    """
+    if not isinstance(data, dict):
+        return 'Invalid coverage report structure'
+    if not isinstance(data.get('files', {}), dict):
+        return 'Invalid files section structure'
+    
+    totals_data = data.get('totals', {})
+    if not isinstance(totals_data, dict):
+        return 'Invalid totals section structure'
+    
+    for key in ('covered_lines', 'num_statements'):
+        if key not in totals_data:
+            return f'Missing required total key: {key}'
+        value = totals_data[key]
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value < 0:
+            return f'Invalid {key} value'
+    
+    return None
+
+
 def create_merge_report(merge_stats: Dict[str, Any], 
                        valid_files: List[Dict[str, Any]], 
                        invalid_files: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -757,7 +1239,9 @@ def upload_combined_report(combined_file_path: str,
     Upload combined coverage report to S3.
     
     This function uploads the merged coverage report back to S3 with appropriate
-    metadata and handles upload errors gracefully.
+    metadata and handles upload errors gracefully. When output_key ends in
+    '.gz' the report is stored gzip-compressed with ContentEncoding set;
+    any other key receives the plain JSON report unchanged.
     
     Args:
         combined_file_path (str): Path to the combined coverage file
@@ -784,13 +1268,12 @@ def upload_combined_report(combined_file_path: str,
     logger.info(f"Uploading combined coverage report to s3://{bucket_name}/{output_key}")
     
     try:
-        # Initialize S3 client
-        s3_client = boto3.client('s3')
+        # Reuse the module-level S3 client across invocations
+        s3_client = _s3()
         
         # Prepare metadata
         upload_metadata = {
             'Content-Type': 'application/json',
-            'Content-Encoding': 'utf-8',
             'CoverageType': 'combined-report',
             'UploadTimestamp': datetime.utcnow().isoformat(),
             'GeneratedBy': 'lambda-coverage-layer'
@@ -803,25 +1286,56 @@ def upload_combined_report(combined_file_path: str,
         # Get file size
         file_size = os.path.getsize(combined_file_path)
         
-        # Upload file to S3
-        with open(combined_file_path, 'rb') as f:
-            s3_client.upload_fileobj(
-                f,
-                bucket_name,
-                output_key,
-                ExtraArgs={
-                    'Metadata': upload_metadata,
-                    'ContentType': 'application/json'
-                }
-            )
+        # Large reports are split into parts that upload concurrently
+        transfer_config = TransferConfig(
+            multipart_threshold=_MULTIPART_CHUNK_SIZE,
+            multipart_chunksize=_MULTIPART_CHUNK_SIZE,
+            max_concurrency=_get_concurrency('COVERAGE_UL_CONCURRENCY', _UPLOAD_MAX_CONCURRENCY),
+            use_threads=True
+        )
         
-        logger.info(f"Successfully uploaded combined report: {file_size} bytes to s3://{bucket_name}/{output_key}")
+        extra_args = {
+            'Metadata': upload_metadata,
+            'ContentType': 'application/json'
+        }
+        
+        if output_key.endswith('.gz'):
+            # Upload a gzip-compressed copy; level 1 trades a little ratio for speed.
+            # The copy is streamed through a temporary file so memory stays flat.
+            extra_args['ContentEncoding'] = 'gzip'
+            with open(combined_file_path, 'rb') as f, tempfile.TemporaryFile() as body:
+                with gzip.GzipFile(fileobj=body, mode='wb', compresslevel=1, mtime=0) as gz:
+                    _copy_stream(f, gz)
+                compressed_size = body.tell()
+                body.seek(0)
+                
+                s3_client.upload_fileobj(
+                    body,
+                    bucket_name,
+                    output_key,
+                    ExtraArgs=extra_args,
+                    Config=transfer_config
+                )
+        else:
+            compressed_size = file_size
+            with open(combined_file_path, 'rb') as f:
+                s3_client.upload_fileobj(
+                    f,
+                    bucket_name,
+                    output_key,
+                    ExtraArgs=extra_args,
+                    Config=transfer_config
+                )
+        
+        logger.info(f"Successfully uploaded combined report: {file_size} bytes "
+                   f"({compressed_size} stored) to s3://{bucket_name}/{output_key}")
         
         return {
             'success': True,
             'bucket_name': bucket_name,
             'output_key': output_key,
             'file_size': file_size,
+            'compressed_size': compressed_size,
             'upload_timestamp': datetime.utcnow(),
             'metadata': upload_metadata
         }
@@ -863,112 +1377,139 @@ def combine_coverage_files(bucket_name: str,
     errors = []
     downloaded_files = []
     combined_file_path = None
-    
-    try:
-        # Step 1: Download coverage files from S3
-        logger.info("Step 1: Downloading coverage files from S3")
-        downloaded_files = download_coverage_files(bucket_name, prefix, max_files)
-        
-        if not downloaded_files:
-            logger.warning("No coverage files found to combine")
-            return CombinerResult(
-                success=False,
-                combined_file_key="",
-                files_processed=0,
-                files_skipped=0,
-                total_coverage_percentage=0.0,
-                errors=["No coverage files found in the specified S3 location"]
+    # Downloads share one directory that is removed in a single pass on exit
+    with tempfile.TemporaryDirectory(prefix='coverage_') as download_dir:
+        try:
+            # Step 1: Download coverage files from S3
+            logger.info("Step 1: Downloading coverage files from S3")
+            downloaded_files = download_coverage_files(bucket_name, prefix, max_files,
+                                                       download_dir=download_dir)
+            
+            if not downloaded_files:
+                logger.warning("No coverage files found to combine")
+                return dataclasses.replace(
+                    _FAILED_RESULT,
+                    errors=["No coverage files found in the specified S3 location"]
+                )
+            
+            logger.info(f"Downloaded {len(downloaded_files)} coverage files")
+            
+            # Step 2: Validate file integrity
+            logger.info("Step 2: Validating coverage file integrity")
+            valid_files, invalid_files = validate_coverage_files_integrity(downloaded_files)
+            
+            if not valid_files:
+                logger.error("No valid coverage files found after validation")
+                return dataclasses.replace(
+                    _FAILED_RESULT,
+                    files_skipped=len(invalid_files),
+                    errors=["No valid coverage files found after validation"] + 
+                           [f"Invalid file {f.get('s3_key', 'unknown')}: {f.get('validation_error', 'Unknown error')}" 
+                            for f in invalid_files[:5]]  # Limit error details
+                )
+            
+            logger.info(f"Validated files: {len(valid_files)} valid, {len(invalid_files)} invalid")
+            
+            # Step 3: Merge coverage data
+            logger.info("Step 3: Merging coverage data")
+            combined_file_path, merge_stats = merge_coverage_data(valid_files)
+            
+            logger.info(f"Successfully merged coverage data: {merge_stats['total_coverage_percentage']:.2f}% coverage")
+            
+            # Step 4: Generate output key if not provided
+            if not output_key:
+                timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+                output_key = f"{prefix}combined-coverage-{timestamp}.json"
+            
+            # Step 5: Upload combined report to S3
+            logger.info("Step 4: Uploading combined report to S3")
+            upload_metadata = {
+                'FilesProcessed': str(merge_stats['files_processed']),
+                'FilesSkipped': str(merge_stats['files_skipped']),
+                'CoveragePercentage': str(merge_stats['total_coverage_percentage']),
+                'FunctionCount': str(merge_stats['function_count'])
+            }
+            
+            upload_result = upload_combined_report(
+                combined_file_path,
+                bucket_name,
+                output_key,
+                upload_metadata
             )
-        
-        logger.info(f"Downloaded {len(downloaded_files)} coverage files")
-        
-        # Step 2: Validate file integrity
-        logger.info("Step 2: Validating coverage file integrity")
-        valid_files, invalid_files = validate_coverage_files_integrity(downloaded_files)
-        
-        if not valid_files:
-            logger.error("No valid coverage files found after validation")
+            
+            logger.info(f"Successfully uploaded combined report to s3://{bucket_name}/{output_key}")
+            
+            # Create comprehensive result
+            end_time = datetime.utcnow()
+            processing_time = (end_time - start_time).total_seconds()
+            
             return CombinerResult(
-                success=False,
-                combined_file_key="",
-                files_processed=0,
-                files_skipped=len(invalid_files),
-                total_coverage_percentage=0.0,
-                errors=["No valid coverage files found after validation"] + 
-                       [f"Invalid file {f.get('s3_key', 'unknown')}: {f.get('validation_error', 'Unknown error')}" 
-                        for f in invalid_files[:5]]  # Limit error details
+                success=True,
+                combined_file_key=output_key,
+                files_processed=merge_stats['files_processed'],
+                files_skipped=merge_stats['files_skipped'],
+                total_coverage_percentage=merge_stats['total_coverage_percentage'],
+                errors=errors
             )
+            
+        except Exception as e:
+            logger.error(f"Coverage combination failed: {str(e)}")
+            errors.append(f"Combination failed: {str(e)}")
+            
+            return dataclasses.replace(
+                _FAILED_RESULT,
+                combined_file_key=output_key or "",
+                files_skipped=len(downloaded_files),
+                errors=errors
+            )
+            
+        finally:
+            # Clean up the combined report; downloads are removed with their directory
+            try:
+                if combined_file_path and os.path.exists(combined_file_path):
+                    os.unlink(combined_file_path)
+                    logger.debug(f"Cleaned up combined file: {combined_file_path}")
+                    
+            except Exception as cleanup_error:
+                logger.warning(f"Error during cleanup: {str(cleanup_error)}")
+
+
+def _parse_combiner_event(event: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extract and validate the combiner parameters from a Lambda event.
+    
+    Args:
+        event (Dict[str, Any]): Lambda event containing combination parameters
         
-        logger.info(f"Validated files: {len(valid_files)} valid, {len(invalid_files)} invalid")
-        
-        # Step 3: Merge coverage data
-        logger.info("Step 3: Merging coverage data")
-        combined_file_path, merge_stats = merge_coverage_data(valid_files)
-        
-        logger.info(f"Successfully merged coverage data: {merge_stats['total_coverage_percentage']:.2f}% coverage")
-        
-        # Step 4: Generate output key if not provided
-        if not output_key:
-            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-            output_key = f"{prefix}combined-coverage-{timestamp}.json"
-        
-        # Step 5: Upload combined report to S3
-        logger.info("Step 4: Uploading combined report to S3")
-        upload_metadata = {
-            'FilesProcessed': str(merge_stats['files_processed']),
-            'FilesSkipped': str(merge_stats['files_skipped']),
-            'CoveragePercentage': str(merge_stats['total_coverage_percentage']),
-            'FunctionCount': str(merge_stats['function_count'])
-        }
-        
-        upload_result = upload_combined_report(
-            combined_file_path,
-            bucket_name,
-            output_key,
-            upload_metadata
-        )
-        
-        logger.info(f"Successfully uploaded combined report to s3://{bucket_name}/{output_key}")
-        
-        # Create comprehensive result
-        end_time = datetime.utcnow()
-        processing_time = (end_time - start_time).total_seconds()
-        
-        return CombinerResult(
-            success=True,
-            combined_file_key=output_key,
-            files_processed=merge_stats['files_processed'],
-            files_skipped=merge_stats['files_skipped'],
-            total_coverage_percentage=merge_stats['total_coverage_percentage'],
-            errors=errors
-        )
-        
-    except Exception as e:
-        logger.error(f"Coverage combination failed: {str(e)}")
-        errors.append(f"Combination failed: {str(e)}")
-        
-        return CombinerResult(
-            success=False,
-            combined_file_key=output_key or "",
-            files_processed=0,
-            files_skipped=len(downloaded_files),
-            total_coverage_percentage=0.0,
-            errors=errors
-        )
+    Returns:
+        Dict[str, Any]: bucket_name, prefix, output_key and max_files with defaults applied
         
-    finally:
-        # Clean up temporary files
-        try:
-            if downloaded_files:
-                cleanup_downloaded_files(downloaded_files)
-                logger.debug(f"Cleaned up {len(downloaded_files)} temporary files")
-            
-            if combined_file_path and os.path.exists(combined_file_path):
-                os.unlink(combined_file_path)
-                logger.debug(f"Cleaned up combined file: {combined_file_path}")
-                
-        except Exception as cleanup_error:
-            logger.warning(f"Error during cleanup: {str(cleanup_error)}")
+    Raises:
+        ValueError: If a parameter is missing or invalid
+    """
+    params = {
+        'bucket_name': event.get('bucket_name'),
+        'prefix': event.get('prefix', 'coverage/'),
+        'output_key': event.get('output_key'),
+        'max_files': event.get('max_files')
+    }
+    
+    if not isinstance(params['bucket_name'], str) or not params['bucket_name']:
+        raise ValueError(_COMBINER_EVENT_ERRORS['bucket_name'])
+    
+    if not isinstance(params['prefix'], str):
+        raise ValueError(_COMBINER_EVENT_ERRORS['prefix'])
+    
+    if params['output_key'] is not None and not isinstance(params['output_key'], str):
+        raise ValueError(_COMBINER_EVENT_ERRORS['output_key'])
+    
+    # bool is an int subclass, so it is rejected explicitly
+    max_files = params['max_files']
+    if max_files is not None and (isinstance(max_files, bool)
+                                  or not isinstance(max_files, int) or max_files <= 0):
+        raise ValueError(_COMBINER_EVENT_ERRORS['max_files'])
+    
+    return params
 
 
 def coverage_combiner_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
@@ -995,21 +1536,15 @@ def coverage_combiner_handler(event: Dict[str, Any], context: Any) -> Dict[str,
         Dict[str, Any]: Combination result with success status and details
     """
     logger.info("Coverage combiner Lambda handler invoked")
-    logger.debug(f"Event: {json.dumps(event, default=str)}")
+    logger.debug(f"Event: {_json_dumps(event)}")
     
     try:
-        # Extract parameters from event
-        bucket_name = event.get('bucket_name')
-        if not bucket_name:
-            raise ValueError("bucket_name is required in event")
-        
-        prefix = event.get('prefix', 'coverage/')
-        output_key = event.get('output_key')
-        max_files = event.get('max_files')
-        
-        # Validate parameters
-        if max_files is not None and (not isinstance(max_files, int) or max_files <= 0):
-            raise ValueError("max_files must be a positive integer")
+        # Extract and validate parameters from event
+        params = _parse_combiner_event(event)
+        bucket_name = params['bucket_name']
+        prefix = params['prefix']
+        output_key = params['output_key']
+        max_files = params['max_files']
         
         logger.info(f"Starting coverage combination: bucket={bucket_name}, prefix={prefix}, max_files={max_files}")
         
@@ -1040,14 +1575,7 @@ def coverage_combiner_handler(event: Dict[str, Any], context: Any) -> Dict[str,
         logger.error(f"Coverage combiner handler failed: {str(e)}")
         
         # Return error response
-        error_result = CombinerResult(
-            success=False,
-            combined_file_key="",
-            files_processed=0,
-            files_skipped=0,
-            total_coverage_percentage=0.0,
-            errors=[f"Handler error: {str(e)}"]
-        )
+        error_result = dataclasses.replace(_FAILED_RESULT, errors=[f"Handler error: {str(e)}"])
         
         response = error_result.to_dict()
         response['lambda_request_id'] = getattr(context, 'aws_request_id', 'unknown')
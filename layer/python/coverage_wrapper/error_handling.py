@@ -8,7 +8,6 @@ graceful degradation, fallback mechanisms, and timeout handling.
 import os
 import time
 import tempfile
-import threading
 from contextlib import contextmanager
 from typing import Any, Callable, Optional, Dict, Union, List
 from functools import wraps
@@ -17,6 +16,10 @@ from .logging_utils import get_logger
 
 logger = get_logger(__name__)
 
+# Clock used to measure protected operations; monotonic so wall-clock
+# adjustments never trigger or mask a timeout
+_now = time.monotonic
+
 
 class CoverageError(Exception):
     """Base exception for coverage-related errors."""
@@ -153,45 +156,36 @@ def timeout_protection(timeout_seconds: float, operation_name: str):
     Raises:
         TimeoutError: If the operation exceeds the timeout
     """
-    start_time = time.time()
-    timeout_occurred = False
-    
-    def timeout_handler():
-        nonlocal timeout_occurred
-        time.sleep(timeout_seconds)
-        timeout_occurred = True
-    
-    # Start timeout thread
-    timeout_thread = threading.Thread(target=timeout_handler, daemon=True)
-    timeout_thread.start()
+    start_time = _now()
+    logger.debug("Starting operation with timeout protection", 
+                operation=operation_name,
+                timeout_seconds=timeout_seconds)
     
     try:
-        logger.debug("Starting operation with timeout protection", 
-                    operation=operation_name,
-                    timeout_seconds=timeout_seconds)
         yield
-        
-        duration = time.time() - start_time
-        if timeout_occurred:
-            logger.error("Operation exceeded timeout", 
-                        operation=operation_name,
-                        timeout_seconds=timeout_seconds,
-                        actual_duration=duration)
-            raise TimeoutError(f"Operation '{operation_name}' exceeded timeout of {timeout_seconds}s")
-        else:
-            logger.debug("Operation completed within timeout", 
-                        operation=operation_name,
-                        duration_seconds=duration,
-                        timeout_seconds=timeout_seconds)
-    
     except Exception as e:
-        duration = time.time() - start_time
+        duration = _now() - start_time
         logger.error("Operation failed within timeout period", 
                     operation=operation_name,
                     duration_seconds=duration,
                     error=str(e),
                     error_type=type(e).__name__)
         raise
+    
+    # The elapsed time is checked once the operation returns, so no watchdog
+    # thread is left sleeping behind every protected block
+    duration = _now() - start_time
+    if duration > timeout_seconds:
+        logger.error("Operation exceeded timeout", 
+                    operation=operation_name,
+                    timeout_seconds=timeout_seconds,
+                    actual_duration=duration)
+        raise TimeoutError(f"Operation '{operation_name}' exceeded timeout of {timeout_seconds}s")
+    
+    logger.debug("Operation completed within timeout", 
+                operation=operation_name,
+                duration_seconds=duration,
+                timeout_seconds=timeout_seconds)
 
 
 class FallbackStorage:
@@ -326,16 +320,18 @@ class FallbackStorage:
         
         return files
     
-    def cleanup_old_files(self, max_age_hours: int = 24):
+    def cleanup_old_files(self, max_age_hours: int = 24, now: Optional[float] = None):
         """
         Clean up old files from fallback storage.
         
         Args:
             max_age_hours: Maximum age of files to keep in hours
+            now: Reference epoch timestamp for file ages; defaults to the current time
         """
-        import time
+        if now is None:
+            now = time.time()
         
-        cutoff_time = time.time() - (max_age_hours * 3600)
+        cutoff_time = now - (max_age_hours * 3600)
         removed_count = 0
         
         try:
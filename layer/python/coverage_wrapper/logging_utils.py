@@ -8,19 +8,33 @@ configurable log levels, and security-conscious error handling.
 import json
 import logging
 import os
+import re
 import sys
 import time
-from datetime import datetime
 from typing import Any, Dict, Optional, Union
 from functools import wraps
 
 
+# Escapes a str as a JSON string literal, matching json.dumps' default ASCII output
+_encode_json_string = json.encoder.encode_basestring_ascii
+
+# Keys written by the prebuilt prefix; extra fields that reuse them take the dict path
+_BASE_LOG_KEYS = frozenset({
+    'timestamp', 'level', 'logger', 'message', 'function_name', 'function_version'
+})
+
+# Optional record attributes copied into the log entry when present
+_RECORD_METRIC_ATTRS = ('request_id', 'duration_ms', 'memory_used_mb')
+
+
 class StructuredFormatter(logging.Formatter):
     """
     Custom formatter that outputs structured JSON logs.
     
     This formatter creates consistent, machine-readable log entries that include
     contextual information like Lambda function name, execution ID, and timestamps.
+    The static parts of each entry are serialized once at construction, so the
+    common case only escapes the per-record values and joins the pieces.
     """
     
     def __init__(self):
@@ -28,11 +42,73 @@ class StructuredFormatter(logging.Formatter):
         self.function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME', 'unknown')
         self.function_version = os.environ.get('AWS_LAMBDA_FUNCTION_VERSION', 'unknown')
         self.request_id = os.environ.get('AWS_LAMBDA_LOG_GROUP_NAME', 'unknown')
+        self._static_suffix = (
+            ',"function_name":' + _encode_json_string(self.function_name) +
+            ',"function_version":' + _encode_json_string(self.function_version)
+        )
+        # (whole second, formatted second) so the date part is rendered once per second
+        self._ts_cache = (None, '')
+    
+    def _format_timestamp(self, record: logging.LogRecord) -> str:
+        """
+        Format the record creation time as an ISO 8601 UTC timestamp.
+        
+        Args:
+            record: The log record being formatted
+            
+        Returns:
+            str: Timestamp such as 2024-01-15T10:30:00.123456Z
+        """
+        created = record.created
+        second = int(created)
+        cached_second, formatted_second = self._ts_cache
+        if second != cached_second:
+            formatted_second = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._ts_cache = (second, formatted_second)
+        return f"{formatted_second}.{int((created - second) * 1e6):06d}Z"
     
     def format(self, record: logging.LogRecord) -> str:
         """
         Format log record as structured JSON.
         
+        Args:
+            record: The log record to format
+            
+        Returns:
+            str: JSON-formatted log entry
+        """
+        # Exceptions, stack traces and extra fields overriding base keys are
+        # rare, so they go through the general dict-based serialization
+        if record.exc_info or (record.levelno >= logging.ERROR and record.stack_info):
+            return self._format_entry(record)
+        
+        extra = {attr: getattr(record, attr) for attr in _RECORD_METRIC_ATTRS if hasattr(record, attr)}
+        
+        extra_fields = getattr(record, 'extra_fields', None)
+        if extra_fields:
+            if not _BASE_LOG_KEYS.isdisjoint(extra_fields):
+                return self._format_entry(record)
+            extra.update(extra_fields)
+        
+        parts = [
+            '{"timestamp":"', self._format_timestamp(record),
+            '","level":', _encode_json_string(record.levelname),
+            ',"logger":', _encode_json_string(record.name),
+            ',"message":', _encode_json_string(record.getMessage()),
+            self._static_suffix
+        ]
+        
+        if extra:
+            parts.append(',')
+            parts.append(json.dumps(extra, default=str, separators=(',', ':'))[1:-1])
+        
+        parts.append('}')
+        return ''.join(parts)
+    
+    def _format_entry(self, record: logging.LogRecord) -> str:
+        """
+        Format log record by building the full entry as a dict.
+        
         Args:
             record: The log record to format
             
@@ -41,7 +117,7 @@ class StructuredFormatter(logging.Formatter):
         """
         # Base log structure
         log_entry = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': self._format_timestamp(record),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage(),
@@ -49,16 +125,10 @@ class StructuredFormatter(logging.Formatter):
             'function_version': self.function_version,
         }
         
-        # Add request ID if available from Lambda context
-        if hasattr(record, 'request_id'):
-            log_entry['request_id'] = record.request_id
-        
-        # Add execution metrics if available
-        if hasattr(record, 'duration_ms'):
-            log_entry['duration_ms'] = record.duration_ms
-        
-        if hasattr(record, 'memory_used_mb'):
-            log_entry['memory_used_mb'] = record.memory_used_mb
+        # Add request ID and execution metrics if available
+        for attr in _RECORD_METRIC_ATTRS:
+            if hasattr(record, attr):
+                log_entry[attr] = getattr(record, attr)
         
         # Add custom fields from extra parameter
         if hasattr(record, 'extra_fields'):
@@ -99,6 +169,16 @@ class SecurityFilter(logging.Filter):
         'credential',
     ]
     
+    # Single scan for every pattern; the lookahead reports overlapping matches
+    # so a pattern nested in another (e.g. 'key' in 'aws_access_key_id') is seen.
+    # Each pattern has its own group, so match.lastindex - 1 is its position in
+    # SENSITIVE_PATTERNS (earlier patterns win) even when case folding maps
+    # non-ASCII text such as 'paſsword' onto it.
+    _SENSITIVE_RE = re.compile(
+        '(?=(?:' + '|'.join(f'({re.escape(p)})' for p in SENSITIVE_PATTERNS) + '))',
+        re.IGNORECASE
+    )
+    
     def filter(self, record: logging.LogRecord) -> bool:
         """
         Filter and sanitize log record.
@@ -128,15 +208,21 @@ class SecurityFilter(logging.Filter):
         Returns:
             str: Sanitized message
         """
-        message_lower = message.lower()
+        # Find the highest-priority pattern and its first occurrence in one pass
+        best_priority = best_start = None
+        for match in self._SENSITIVE_RE.finditer(message):
+            priority = match.lastindex - 1
+            if best_priority is None or priority < best_priority:
+                best_priority, best_start = priority, match.start()
+                if priority == 0:
+                    break
         
-        for pattern in self.SENSITIVE_PATTERNS:
-            if pattern in message_lower:
-                # Replace sensitive values with masked placeholder
-                # This is a simple approach - more sophisticated regex could be used
-                return message.replace(message[message_lower.find(pattern):], f"{pattern}=***MASKED***")
+        if best_priority is None:
+            return message
         
-        return message
+        # Replace sensitive values with masked placeholder
+        pattern = self.SENSITIVE_PATTERNS[best_priority]
+        return message.replace(message[best_start:], f"{pattern}=***MASKED***")
 
 
 class CoverageLogger:
@@ -147,15 +233,18 @@ class CoverageLogger:
     performance tracking, and security filtering.
     """
     
-    def __init__(self, name: str):
+    def __init__(self, name: str, attach_default_handlers: bool = True):
         """
         Initialize the coverage logger.
         
         Args:
             name: Logger name (typically __name__ from calling module)
+            attach_default_handlers: Whether to configure the default stdout handler,
+                log level and propagation; pass False when the caller sets up handlers
         """
         self.logger = logging.getLogger(name)
-        self._setup_logger()
+        if attach_default_handlers:
+            self._setup_logger()
         self._request_id: Optional[str] = None
     
     def _setup_logger(self) -> None:
@@ -289,15 +378,16 @@ def performance_timer(operation_name: str):
         @wraps(func)
         def wrapper(*args, **kwargs):
             logger = get_logger(func.__module__)
-            start_time = time.time()
+            # Integer nanoseconds from a monotonic clock; converted to ms only when logged
+            start_ns = time.perf_counter_ns()
             
             try:
                 result = func(*args, **kwargs)
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 logger.log_performance(operation_name, duration_ms, success=True)
                 return result
             except Exception as e:
-                duration_ms = (time.time() - start_time) * 1000
+                duration_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 logger.log_performance(operation_name, duration_ms, success=False, error=str(e))
                 raise
         
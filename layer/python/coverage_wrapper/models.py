@@ -6,7 +6,7 @@ This module contains the core data classes used throughout the coverage wrapper
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Dict, Any
+from typing import List, Mapping, Optional, Dict, Any
 import os
 
 
@@ -24,23 +24,28 @@ class CoverageConfig:
     @classmethod
     def from_environment(cls) -> 'CoverageConfig':
         """Create configuration from environment variables."""
-        s3_bucket = os.environ.get('COVERAGE_S3_BUCKET')
+        return cls.from_mapping(os.environ)
+    
+    @classmethod
+    def from_mapping(cls, env: Mapping[str, str]) -> 'CoverageConfig':
+        """Create configuration from a mapping of COVERAGE_* variable names to values."""
+        s3_bucket = env.get('COVERAGE_S3_BUCKET')
         if not s3_bucket:
             raise ValueError("COVERAGE_S3_BUCKET environment variable is required")
         
-        s3_prefix = os.environ.get('COVERAGE_S3_PREFIX', 'coverage/')
-        upload_timeout = int(os.environ.get('COVERAGE_UPLOAD_TIMEOUT', '30'))
+        s3_prefix = env.get('COVERAGE_S3_PREFIX', 'coverage/')
+        upload_timeout = int(env.get('COVERAGE_UPLOAD_TIMEOUT', '30'))
         
         # Parse include/exclude patterns from comma-separated strings
         include_patterns = None
-        if os.environ.get('COVERAGE_INCLUDE_PATTERNS'):
-            include_patterns = [p.strip() for p in os.environ['COVERAGE_INCLUDE_PATTERNS'].split(',')]
+        if env.get('COVERAGE_INCLUDE_PATTERNS'):
+            include_patterns = [p.strip() for p in env['COVERAGE_INCLUDE_PATTERNS'].split(',')]
         
         exclude_patterns = None
-        if os.environ.get('COVERAGE_EXCLUDE_PATTERNS'):
-            exclude_patterns = [p.strip() for p in os.environ['COVERAGE_EXCLUDE_PATTERNS'].split(',')]
+        if env.get('COVERAGE_EXCLUDE_PATTERNS'):
+            exclude_patterns = [p.strip() for p in env['COVERAGE_EXCLUDE_PATTERNS'].split(',')]
         
-        branch_coverage = os.environ.get('COVERAGE_BRANCH_COVERAGE', 'true').lower() == 'true'
+        branch_coverage = env.get('COVERAGE_BRANCH_COVERAGE', 'true').lower() == 'true'
         
         return cls(
             s3_bucket=s3_bucket,
@@ -4,9 +4,15 @@ S3 upload utilities for coverage files.
 This module handles uploading coverage files to S3 with proper naming and error handling.
 """
 
+import functools
 import os
-from datetime import datetime
-from typing import Optional
+import string
+import tarfile
+import tempfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from types import MappingProxyType
+from typing import List, Optional, Tuple
 
 from .models import CoverageConfig
 from .logging_utils import get_logger, performance_timer
@@ -14,12 +20,45 @@ from .error_handling import GracefulErrorHandler, timeout_protection, S3UploadEr
 
 logger = get_logger(__name__)
 
+# Key prefix used when callers do not supply one
+_DEFAULT_PREFIX = 'coverage/'
 
+# bytes.translate table keeping ASCII alphanumerics, hyphens, dots and underscores
+# in S3 key components and mapping every other byte to an underscore
+_SAFE_KEY_CHARS = frozenset((string.ascii_letters + string.digits + '-._').encode('ascii'))
+_KEY_COMPONENT_TABLE = bytes(b if b in _SAFE_KEY_CHARS else ord('_') for b in range(256))
+
+# Files smaller than this (boto3's default multipart threshold) are sent with one PutObject
+_PUT_OBJECT_MAX_BYTES = 8 * 1024 * 1024
+
+# Object settings applied to every coverage upload, shared read-only across calls
+_UPLOAD_EXTRA_ARGS = MappingProxyType({
+    'ServerSideEncryption': 'AES256',
+    'ContentType': 'application/octet-stream'
+})
+
+# Seconds to wait before each retry (exponential backoff); one more attempt than delays
+_UPLOAD_RETRY_DELAYS = (1.0, 2.0)
+
+# S3 error codes that retrying cannot fix
+_NON_RETRYABLE_ERROR_CODES = frozenset({
+    'NoSuchBucket', 'AccessDenied', 'InvalidBucketName', 'InvalidAccessKeyId'
+})
+
+# Worker threads for async uploads, started on first use and reused across invocations
+_UPLOAD_MAX_WORKERS = 2
+_UPLOAD_POOL = ThreadPoolExecutor(max_workers=_UPLOAD_MAX_WORKERS, thread_name_prefix='coverage-s3-upload')
+
+
+@functools.lru_cache(maxsize=1)
 @performance_timer("s3_config_parsing")
 def get_s3_config() -> CoverageConfig:
     """
     Parse S3 settings from environment variables.
     
+    The environment does not change for the life of a Lambda container, so the
+    parsed configuration is cached; call get_s3_config.cache_clear() to re-read it.
+    
     Returns:
         CoverageConfig: Configuration object with S3 settings
         
@@ -40,11 +79,40 @@ def get_s3_config() -> CoverageConfig:
         raise ValueError(f"Failed to parse S3 configuration: {e}") from e
 
 
+@functools.lru_cache(maxsize=1)
+def _s3_client():
+    """
+    Get a cached S3 client so the service model is only loaded once per container.
+    
+    Returns:
+        S3 client shared by every upload in this process
+    """
+    import boto3
+    return boto3.client('s3')
+
+
+@functools.lru_cache(maxsize=1)
+def _lambda_environment() -> Tuple[Optional[str], str]:
+    """
+    Read the Lambda function name and log stream once per container.
+    
+    Both are fixed for the life of a Lambda container; call
+    _lambda_environment.cache_clear() to re-read them.
+    
+    Returns:
+        Tuple[Optional[str], str]: Function name (None if unset) and log stream name ('unknown' if unset)
+    """
+    return (
+        os.environ.get('AWS_LAMBDA_FUNCTION_NAME'),
+        os.environ.get('AWS_LAMBDA_LOG_STREAM_NAME', 'unknown')
+    )
+
+
 @performance_timer("s3_key_generation")
 def generate_s3_key(
     function_name: Optional[str] = None,
     execution_id: Optional[str] = None,
-    prefix: str = "coverage/",
+    prefix: Optional[str] = _DEFAULT_PREFIX,
     timestamp: Optional[datetime] = None
 ) -> str:
     """
@@ -53,7 +121,7 @@ def generate_s3_key(
     Args:
         function_name: Lambda function name (defaults to AWS_LAMBDA_FUNCTION_NAME env var)
         execution_id: Lambda execution ID (defaults to AWS_LAMBDA_LOG_STREAM_NAME env var)
-        prefix: S3 key prefix (defaults to "coverage/")
+        prefix: S3 key prefix (defaults to "coverage/"; None also uses the default)
         timestamp: Timestamp for the key (defaults to current time)
         
     Returns:
@@ -64,7 +132,7 @@ def generate_s3_key(
     """
     # Get function name from parameter or environment
     if function_name is None:
-        function_name = os.environ.get('AWS_LAMBDA_FUNCTION_NAME')
+        function_name = _lambda_environment()[0]
     
     if not function_name:
         logger.error("Function name not available for S3 key generation")
@@ -72,18 +140,24 @@ def generate_s3_key(
     
     # Get execution ID from parameter or environment
     if execution_id is None:
-        execution_id = os.environ.get('AWS_LAMBDA_LOG_STREAM_NAME', 'unknown')
+        execution_id = _lambda_environment()[1]
     
     # Use current timestamp if not provided
     if timestamp is None:
-        from datetime import timezone
         timestamp = datetime.now(timezone.utc)
     
-    # Format timestamp as ISO string with milliseconds, safe for S3 keys
-    timestamp_str = timestamp.strftime('%Y%m%d_%H%M%S_%f')[:-3]  # Remove last 3 digits for milliseconds
+    # Format timestamp as YYYYMMDD_HHMMSS_mmm (milliseconds), safe for S3 keys;
+    # formatting the fields directly avoids strftime
+    timestamp_str = (
+        f"{timestamp.year:04d}{timestamp.month:02d}{timestamp.day:02d}_"
+        f"{timestamp.hour:02d}{timestamp.minute:02d}{timestamp.second:02d}_"
+        f"{timestamp.microsecond // 1000:03d}"
+    )
     
-    # Ensure prefix ends with /
-    if prefix and not prefix.endswith('/'):
+    # Ensure a non-empty prefix ends with /
+    if prefix is None:
+        prefix = _DEFAULT_PREFIX
+    elif prefix and prefix[-1] != '/':
         prefix += '/'
     
     # Clean function name and execution ID for S3 key safety
@@ -102,10 +176,14 @@ def generate_s3_key(
     return s3_key
 
 
+@functools.lru_cache(maxsize=128)
 def _sanitize_s3_key_component(component: str) -> str:
     """
     Sanitize a string component for use in S3 keys.
     
+    Results are memoized: a container sanitizes the same function name and
+    log stream on every invocation.
+    
     Args:
         component: String component to sanitize
         
@@ -114,9 +192,8 @@ def _sanitize_s3_key_component(component: str) -> str:
     """
     # Replace problematic characters with underscores
     # S3 keys should avoid: spaces, special chars that might cause issues
-    import re
-    # Keep ASCII alphanumeric, hyphens, dots, and underscores; replace everything else with underscores
-    sanitized = re.sub(r'[^a-zA-Z0-9\-._]', '_', component)
+    # Non-ASCII characters encode to a single '?' each, which the table then replaces
+    sanitized = component.encode('ascii', 'replace').translate(_KEY_COMPONENT_TABLE).decode('ascii')
     
     # Remove leading/trailing underscores and ensure not empty
     sanitized = sanitized.strip('_')
@@ -126,6 +203,38 @@ def _sanitize_s3_key_component(component: str) -> str:
     return sanitized
 
 
+def _put_coverage_file(s3_client, coverage_file_path: str, file_size: int, bucket: str, s3_key: str) -> None:
+    """
+    Upload one coverage file, using a single PutObject request unless the file is large.
+    
+    Files below the managed transfer's multipart threshold gain nothing from
+    upload_file's transfer manager, so they are streamed directly from the open file.
+    
+    Args:
+        s3_client: boto3 S3 client
+        coverage_file_path: Path to the coverage file to upload
+        file_size: Size of the coverage file in bytes
+        bucket: Destination S3 bucket
+        s3_key: Destination S3 key
+    """
+    if file_size < _PUT_OBJECT_MAX_BYTES:
+        with open(coverage_file_path, 'rb') as body:
+            s3_client.put_object(
+                Bucket=bucket,
+                Key=s3_key,
+                Body=body,
+                **_UPLOAD_EXTRA_ARGS
+            )
+        return
+    
+    s3_client.upload_file(
+        coverage_file_path,
+        bucket,
+        s3_key,
+        ExtraArgs=_UPLOAD_EXTRA_ARGS
+    )
+
+
 @performance_timer("s3_upload")
 def upload_coverage_file(
     coverage_file_path: str,
@@ -149,19 +258,17 @@ def upload_coverage_file(
         ValueError: If configuration is invalid or file doesn't exist
         S3UploadError: If upload fails after all retry attempts (only for critical errors)
     """
-    import boto3
     import time
     from botocore.exceptions import ClientError, NoCredentialsError, PartialCredentialsError
     
     # Use graceful error handling for the entire upload process
     with GracefulErrorHandler("s3_upload_operation", critical=False) as upload_handler:
-        # Validate input file exists
-        if not os.path.exists(coverage_file_path):
+        # Validate the input file exists and get its size for metrics in one stat call
+        try:
+            file_size = os.stat(coverage_file_path).st_size
+        except FileNotFoundError:
             logger.error("Coverage file not found", file_path=coverage_file_path)
-            raise ValueError(f"Coverage file not found: {coverage_file_path}")
-        
-        # Get file size for metrics
-        file_size = os.path.getsize(coverage_file_path)
+            raise ValueError(f"Coverage file not found: {coverage_file_path}") from None
         
         # Basic file validation
         if file_size == 0:
@@ -185,18 +292,17 @@ def upload_coverage_file(
                     s3_key=s3_key,
                     timeout_seconds=timeout_seconds)
         
-        # Create S3 client with timeout protection
+        # Get the shared S3 client with timeout protection
         with timeout_protection(5.0, "s3_client_creation"):
             try:
-                s3_client = boto3.client('s3')
+                s3_client = _s3_client()
             except (NoCredentialsError, PartialCredentialsError) as e:
                 logger.error("AWS credentials not available for S3 upload", 
                             error=str(e), error_type=type(e).__name__)
                 raise S3UploadError(f"AWS credentials not available: {e}") from e
     
         # Upload with retry logic and timeout protection
-        max_retries = 3
-        base_delay = 1.0  # Base delay in seconds
+        max_retries = len(_UPLOAD_RETRY_DELAYS) + 1
         
         with timeout_protection(timeout_seconds, "s3_upload_with_retries"):
             for attempt in range(max_retries):
@@ -209,15 +315,7 @@ def upload_coverage_file(
                                file_size_bytes=file_size)
                     
                     # Upload file
-                    s3_client.upload_file(
-                        coverage_file_path,
-                        config.s3_bucket,
-                        s3_key,
-                        ExtraArgs={
-                            'ServerSideEncryption': 'AES256',
-                            'ContentType': 'application/octet-stream'
-                        }
-                    )
+                    _put_coverage_file(s3_client, coverage_file_path, file_size, config.s3_bucket, s3_key)
                     
                     logger.info("S3 upload completed successfully", 
                                bucket=config.s3_bucket,
@@ -239,7 +337,7 @@ def upload_coverage_file(
                                   key=s3_key)
                     
                     # Don't retry for certain error types
-                    if error_code in ['NoSuchBucket', 'AccessDenied', 'InvalidBucketName']:
+                    if error_code in _NON_RETRYABLE_ERROR_CODES:
                         logger.error("Non-retryable S3 error encountered", 
                                    error_code=error_code,
                                    error_message=error_message,
@@ -248,7 +346,7 @@ def upload_coverage_file(
                     
                     # Retry for other errors
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff
+                        delay = _UPLOAD_RETRY_DELAYS[attempt]
                         logger.info("Retrying S3 upload after delay", 
                                    delay_seconds=delay,
                                    next_attempt=attempt + 2)
@@ -268,7 +366,7 @@ def upload_coverage_file(
                                   error_type=type(e).__name__)
                     
                     if attempt < max_retries - 1:
-                        delay = base_delay * (2 ** attempt)  # Exponential backoff
+                        delay = _UPLOAD_RETRY_DELAYS[attempt]
                         logger.info("Retrying S3 upload after delay", 
                                    delay_seconds=delay,
                                    next_attempt=attempt + 2)
@@ -291,40 +389,183 @@ def upload_coverage_file(
     return None
 
 
+@performance_timer("s3_batch_upload")
+def upload_coverage_files_batch(
+    coverage_file_paths: List[str],
+    config: Optional[CoverageConfig] = None,
+    timeout_seconds: float = 30.0
+) -> Optional[str]:
+    """
+    Bundle several coverage files into one gzipped tarball and upload it with a single request.
+    
+    Files are stored in the archive under their base names. The archive is built in
+    a temporary file and uploaded through upload_coverage_file, so it gets the same
+    retry and timeout handling as a single coverage file.
+    
+    Args:
+        coverage_file_paths: Paths of the coverage files to bundle
+        config: S3 configuration (loaded from environment if not provided)
+        timeout_seconds: Maximum time allowed for the upload operation
+        
+    Returns:
+        Optional[str]: S3 key of the uploaded archive, or None if bundling or upload failed
+    """
+    with GracefulErrorHandler("s3_batch_upload_operation", critical=False) as batch_handler:
+        if not coverage_file_paths:
+            raise ValueError("No coverage files provided for batch upload")
+        
+        if config is None:
+            config = get_s3_config()
+        
+        s3_key = generate_s3_key(prefix=config.s3_prefix)
+        s3_key = s3_key[:-len('.coverage')] + '.tar.gz'
+        
+        with tempfile.NamedTemporaryFile(suffix='.tar.gz') as archive:
+            with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+                for path in coverage_file_paths:
+                    tar.add(path, arcname=os.path.basename(path))
+            archive.flush()
+            
+            logger.debug("Coverage files bundled for batch upload",
+                        file_count=len(coverage_file_paths),
+                        archive_size_bytes=os.path.getsize(archive.name),
+                        s3_key=s3_key)
+            
+            return upload_coverage_file(archive.name, s3_key, config, timeout_seconds)
+    
+    if batch_handler.error_occurred:
+        logger.warning("S3 batch upload failed gracefully",
+                      error_details=batch_handler.error_details)
+    return None
+
+
+def generate_upload_url(
+    s3_key: str,
+    config: Optional[CoverageConfig] = None,
+    expires_in: int = 3600
+) -> str:
+    """
+    Create a presigned URL that lets another process PUT a coverage file to S3.
+    
+    Signing happens locally, so no request is sent to S3. The uploader must send
+    the ``x-amz-server-side-encryption: AES256`` header because it is part of the signature.
+    
+    Args:
+        s3_key: S3 key the file will be stored under
+        config: S3 configuration (loaded from environment if not provided)
+        expires_in: Seconds until the URL expires
+        
+    Returns:
+        str: Presigned PUT URL
+    """
+    if config is None:
+        config = get_s3_config()
+    
+    return _s3_client().generate_presigned_url(
+        'put_object',
+        Params={
+            'Bucket': config.s3_bucket,
+            'Key': s3_key,
+            'ServerSideEncryption': 'AES256'
+        },
+        ExpiresIn=expires_in
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _http_pool():
+    """
+    Get a shared urllib3 connection pool for presigned URL uploads.
+    
+    Returns:
+        urllib3.PoolManager reused across uploads in this process
+    """
+    import urllib3
+    return urllib3.PoolManager()
+
+
+@performance_timer("s3_presigned_upload")
+def upload_via_presigned_url(coverage_file_path: str, url: str, timeout_seconds: float = 30.0) -> None:
+    """
+    Upload a coverage file to a presigned URL created by generate_upload_url.
+    
+    Args:
+        coverage_file_path: Path to the coverage file to upload
+        url: Presigned PUT URL
+        timeout_seconds: Maximum time allowed for the request
+        
+    Raises:
+        ValueError: If the coverage file doesn't exist
+        S3UploadError: If S3 rejects the upload
+    """
+    try:
+        file_size = os.stat(coverage_file_path).st_size
+    except FileNotFoundError:
+        logger.error("Coverage file not found", file_path=coverage_file_path)
+        raise ValueError(f"Coverage file not found: {coverage_file_path}") from None
+    
+    # S3 does not accept chunked bodies on presigned PUTs, so send an explicit length
+    with open(coverage_file_path, 'rb') as body:
+        response = _http_pool().request(
+            'PUT',
+            url,
+            body=body,
+            headers={
+                'Content-Length': str(file_size),
+                'x-amz-server-side-encryption': 'AES256'
+            },
+            timeout=timeout_seconds,
+            retries=False
+        )
+    
+    if not 200 <= response.status < 300:
+        logger.error("Presigned S3 upload failed",
+                    file_path=coverage_file_path,
+                    status=response.status)
+        raise S3UploadError(f"Presigned S3 upload failed with HTTP {response.status}")
+    
+    logger.info("Presigned S3 upload completed successfully",
+               file_path=coverage_file_path,
+               file_size_bytes=file_size)
+
+
 def upload_coverage_file_async(
     coverage_file_path: str,
     s3_key: Optional[str] = None,
     config: Optional[CoverageConfig] = None
-) -> None:
+) -> Future:
     """
     Upload coverage file to S3 asynchronously to minimize Lambda execution time impact.
     
-    This function starts the upload in a separate thread and returns immediately.
+    This function queues the upload on a shared worker pool and returns immediately.
     The upload will continue in the background.
     
     Args:
         coverage_file_path: Path to the coverage file to upload
         s3_key: S3 key for the file (auto-generated if not provided)
         config: S3 configuration (loaded from environment if not provided)
+        
+    Returns:
+        Future: Resolves to the uploaded S3 key, or None if the upload failed
     """
-    import threading
-    
-    def _upload_worker():
+    def _upload_worker() -> Optional[str]:
         try:
             result_key = upload_coverage_file(coverage_file_path, s3_key, config)
             logger.debug("Async S3 upload completed successfully", 
                         file_path=coverage_file_path,
                         s3_key=result_key)
+            return result_key
         except Exception as e:
             logger.error("Async S3 upload failed", 
                         file_path=coverage_file_path,
                         error=str(e),
                         error_type=type(e).__name__)
+            return None
     
-    # Start upload in background thread
-    upload_thread = threading.Thread(target=_upload_worker, daemon=True)
-    upload_thread.start()
+    # Queue upload on the shared background workers
+    future = _UPLOAD_POOL.submit(_upload_worker)
     
     logger.info("Started async upload of coverage file", 
-               file_path=coverage_file_path,
-               thread_name=upload_thread.name)
\ No newline at end of file
+               file_path=coverage_file_path)
+    
+    return future
@@ -23,6 +23,9 @@ from .error_handling import (
 _cached_config: Optional[CoverageConfig] = None
 _coverage_instance: Optional[coverage.Coverage] = None
 
+# Lambda's writable directory, holding the coverage data file and reports awaiting upload
+_REPORT_DIR = '/tmp'
+
 # Set up structured logging
 logger = get_logger(__name__)
 
@@ -86,7 +89,7 @@ def initialize_coverage() -> Optional[coverage.Coverage]:
         coverage_config = {
             'branch': config.branch_coverage,
             'source': ['.'],  # Track coverage for current directory
-            'data_file': '/tmp/.coverage',  # Use writable /tmp directory for coverage data file
+            'data_file': os.path.join(_REPORT_DIR, '.coverage'),  # Coverage data must live in a writable directory
         }
         
         # Add include patterns if specified
@@ -192,7 +195,7 @@ def finalize_coverage() -> Optional[str]:
         coverage_filename = f"coverage-{function_name}-{execution_id}.json"
         
         # Use Lambda's /tmp directory for temporary files
-        coverage_file_path = os.path.join('/tmp', coverage_filename)
+        coverage_file_path = os.path.join(_REPORT_DIR, coverage_filename)
         
         # Save coverage data in JSON format with timeout protection
         with timeout_protection(10.0, "coverage_json_report"):
@@ -0,0 +1,100 @@
+"""
+Shared pytest fixtures for the Lambda Coverage Layer test suite.
+"""
+
+import json
+
+import boto3
+import pytest
+from moto import mock_aws
+
+from layer.python.coverage_wrapper.s3_uploader import (
+    _http_pool,
+    _lambda_environment,
+    _s3_client,
+    get_s3_config
+)
+
+
+TEST_BUCKET = 'test-bucket'
+
+# Sample coverage report uploaded for every fixture object
+SAMPLE_COVERAGE_DATA = {
+    'files': {
+        '/var/task/handler.py': {
+            'executed_lines': [1, 2, 3],
+            'missing_lines': [4, 5],
+            'summary': {'covered_lines': 3, 'num_statements': 5}
+        }
+    },
+    'totals': {
+        'covered_lines': 3,
+        'num_statements': 5,
+        'percent_covered': 60.0
+    }
+}
+
+# (key, body) pairs seeded into the mocked bucket once per test session
+S3_FIXTURES = [
+    ('coverage/coverage-test-function-abc123.json', json.dumps(SAMPLE_COVERAGE_DATA)),
+    ('coverage/coverage-another-function-def456.json', json.dumps(SAMPLE_COVERAGE_DATA)),
+    ('coverage/coverage-third-function-ghi789.json', json.dumps(SAMPLE_COVERAGE_DATA)),
+    ('coverage/notes.txt', 'not a coverage file'),
+    ('invalid/coverage-broken-function-xyz000.json', 'invalid json content {'),
+]
+
+
+@pytest.fixture(autouse=True)
+def aws_default_region(monkeypatch):
+    """Pin the AWS region so parallel workers never fall back to IMDS lookups."""
+    monkeypatch.setenv('AWS_DEFAULT_REGION', 'us-east-1')
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(items):
+    """
+    Keep each test module on one xdist worker unless its tests name their own group.
+    
+    Runs before xdist's loadgroup hook reads the markers, so modules without
+    xdist_group marks are scheduled exactly as under --dist=loadfile.
+    """
+    for item in items:
+        if item.get_closest_marker('xdist_group') is None:
+            item.add_marker(pytest.mark.xdist_group(name=item.module.__name__))
+
+
+# Per-container caches in s3_uploader that tests must not share
+_S3_UPLOADER_CACHES = (get_s3_config, _lambda_environment, _s3_client, _http_pool)
+
+
+@pytest.fixture(autouse=True)
+def clear_s3_uploader_caches():
+    """Re-read the environment and rebuild the S3 and HTTP clients for each test's environment and mocks."""
+    for cached in _S3_UPLOADER_CACHES:
+        cached.cache_clear()
+    yield
+    for cached in _S3_UPLOADER_CACHES:
+        cached.cache_clear()
+
+
+@pytest.fixture(scope='session')
+def test_bucket():
+    """Name of the bucket the s3 fixture creates and seeds."""
+    return TEST_BUCKET
+
+
+@pytest.fixture(scope='session')
+def s3():
+    """
+    Provide a real boto3 S3 client backed by an in-process moto server.
+
+    The bucket is created and seeded with S3_FIXTURES once per session, so
+    tests exercise the real listing and download code paths without paying
+    for per-test mock setup.
+    """
+    with mock_aws():
+        client = boto3.client('s3', region_name='us-east-1')
+        client.create_bucket(Bucket=TEST_BUCKET)
+        for key, body in S3_FIXTURES:
+            client.put_object(Bucket=TEST_BUCKET, Key=key, Body=body)
+        yield client
@@ -6,9 +6,13 @@ download utilities, file validation, and metadata extraction functionality.
 """
 
 import os
+import io
+import gzip
 import json
 import tempfile
 import pytest
+from collections import namedtuple
+from contextlib import contextmanager
 from datetime import datetime
 from unittest.mock import patch, MagicMock, mock_open
 from pathlib import Path
@@ -16,136 +20,132 @@ from pathlib import Path
 from layer.python.coverage_wrapper.combiner import (
     download_coverage_files,
     cleanup_downloaded_files,
+    cleanup_s3_objects,
     get_coverage_file_stats,
     get_combiner_s3_config,
     _is_valid_coverage_file,
     _download_single_file,
     _extract_metadata_from_key,
-    _validate_coverage_file
+    _validate_coverage_file,
+    _load_report_summary,
+    _s3
 )
 from layer.python.coverage_wrapper.models import CoverageConfig
 
 
+# Stable stat result so report cache keys are deterministic under mock_open
+_FakeStat = namedtuple('_FakeStat', ['st_size', 'st_mtime_ns'])
+_FAKE_STAT = _FakeStat(st_size=1024, st_mtime_ns=1700000000000000000)
+
+
+@pytest.fixture(autouse=True)
+def clear_report_cache():
+    """Drop parsed report summaries so tests never see each other's files."""
+    _load_report_summary.cache_clear()
+    yield
+    _load_report_summary.cache_clear()
+
+
+def _mock_report_open(payload: bytes):
+    """
+    Build a mock_open for a serialized report that also supports readinto.
+    
+    ijson streams through readinto, which mock_open does not emulate, so each
+    open() gets a fresh stream over the same payload.
+    """
+    mocked_open = mock_open(read_data=payload)
+    reset_read_data = mocked_open.side_effect
+    
+    def reopen(*args, **kwargs):
+        mocked_open.return_value.readinto.side_effect = io.BytesIO(payload).readinto
+        return reset_read_data(*args, **kwargs)
+    
+    mocked_open.side_effect = reopen
+    return mocked_open
+
+
+# Pre-serialized fixture payloads, built once at import time
+_VALID_COVERAGE_BYTES = json.dumps({
+    'files': {
+        '/path/to/file.py': {
+            'executed_lines': [1, 2, 3],
+            'missing_lines': [4, 5],
+            'summary': {'covered_lines': 3, 'num_statements': 5}
+        }
+    },
+    'totals': {
+        'covered_lines': 3,
+        'num_statements': 5,
+        'percent_covered': 60.0
+    }
+}).encode('utf-8')
+_MISSING_TOTALS_BYTES = json.dumps({'files': {}}).encode('utf-8')
+_INVALID_JSON_BYTES = b'invalid json content {'
+_MISSING_STATEMENTS_BYTES = json.dumps({'files': {}, 'totals': {'covered_lines': 3}}).encode('utf-8')
+_NEGATIVE_LINES_BYTES = json.dumps({
+    'files': {},
+    'totals': {'covered_lines': -1, 'num_statements': 5}
+}).encode('utf-8')
+_FILES_LIST_BYTES = json.dumps({
+    'files': [1, 2],
+    'totals': {'covered_lines': 3, 'num_statements': 5}
+}).encode('utf-8')
+_COMBINED_COVERAGE_BYTES = json.dumps({
+    'files': {
+        '/var/task/lambda1.py': {'executed_lines': [1, 2, 3, 5], 'missing_lines': [4]},
+        '/var/task/lambda2.py': {'executed_lines': [1, 2], 'missing_lines': [3, 4, 5]}
+    },
+    'totals': {
+        'covered_lines': 6,
+        'num_statements': 10,
+        'percent_covered': 60.0
+    }
+}).encode('utf-8')
+
+
+@pytest.fixture(autouse=True)
+def clear_s3_client_cache():
+    """Drop the cached S3 client so each test sees its own boto3 mock."""
+    _s3.cache_clear()
+    yield
+    _s3.cache_clear()
+
+
 class TestDownloadCoverageFiles:
     """Test cases for download_coverage_files function."""
     
-    @patch('boto3.client')
-    def test_download_coverage_files_success(self, mock_boto3_client):
+    def test_download_coverage_files_success(self, s3, test_bucket, tmp_path):
         """Test successful download of coverage files from S3."""
-        # Mock S3 client and responses
-        mock_s3_client = MagicMock()
-        mock_boto3_client.return_value = mock_s3_client
+        result = download_coverage_files(test_bucket, 'coverage/', download_dir=str(tmp_path))
         
-        # Mock list_objects_v2 response
-        mock_s3_client.list_objects_v2.return_value = {
-            'Contents': [
-                {
-                    'Key': 'coverage/coverage-test-function-abc123.json',
-                    'Size': 1024,
-                    'LastModified': datetime(2024, 1, 15, 10, 30, 0)
-                },
-                {
-                    'Key': 'coverage/coverage-another-function-def456.json',
-                    'Size': 2048,
-                    'LastModified': datetime(2024, 1, 15, 11, 0, 0)
-                }
-            ],
-            'IsTruncated': False
+        # Only the .json coverage objects should be downloaded
+        assert len(result) == 3
+        assert {r['function_name'] for r in result} == {
+            'test-function', 'another-function', 'third-function'
         }
-        
-        # Mock successful file downloads
-        with patch('layer.python.coverage_wrapper.combiner._download_single_file') as mock_download:
-            mock_download.side_effect = [
-                {
-                    's3_key': 'coverage/coverage-test-function-abc123.json',
-                    'local_path': '/tmp/coverage_test1.json',
-                    'file_size': 1024,
-                    'last_modified': datetime(2024, 1, 15, 10, 30, 0),
-                    'function_name': 'test-function',
-                    'execution_id': 'abc123'
-                },
-                {
-                    's3_key': 'coverage/coverage-another-function-def456.json',
-                    'local_path': '/tmp/coverage_test2.json',
-                    'file_size': 2048,
-                    'last_modified': datetime(2024, 1, 15, 11, 0, 0),
-                    'function_name': 'another-function',
-                    'execution_id': 'def456'
-                }
-            ]
-            
-            # Call function
-            result = download_coverage_files('test-bucket', 'coverage/')
-            
-            # Verify results
-            assert len(result) == 2
-            assert result[0]['function_name'] == 'test-function'
-            assert result[1]['function_name'] == 'another-function'
-            
-            # Verify S3 client calls
-            mock_s3_client.list_objects_v2.assert_called_once_with(
-                Bucket='test-bucket',
-                Prefix='coverage/',
-                MaxKeys=1000
-            )
+        for file_info in result:
+            assert os.path.dirname(file_info['local_path']) == str(tmp_path)
+            assert os.path.exists(file_info['local_path'])
+            assert file_info['file_size'] > 0
     
-    @patch('boto3.client')
-    def test_download_coverage_files_empty_bucket(self, mock_boto3_client):
+    def test_download_coverage_files_empty_bucket(self, s3, test_bucket, tmp_path, monkeypatch):
         """Test download when no coverage files exist in bucket."""
-        mock_s3_client = MagicMock()
-        mock_boto3_client.return_value = mock_s3_client
+        monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
         
-        # Mock empty response
-        mock_s3_client.list_objects_v2.return_value = {}
-        
-        result = download_coverage_files('test-bucket', 'coverage/')
+        result = download_coverage_files(test_bucket, 'empty/')
         
         assert result == []
+        # Without a download_dir nothing is left behind in the temp directory
+        assert list(tmp_path.iterdir()) == []
     
-    @patch('boto3.client')
-    def test_download_coverage_files_with_max_files(self, mock_boto3_client):
+    def test_download_coverage_files_with_max_files(self, s3, test_bucket, tmp_path):
         """Test download with maximum file limit."""
-        mock_s3_client = MagicMock()
-        mock_boto3_client.return_value = mock_s3_client
-        
-        # Mock response with multiple files
-        mock_s3_client.list_objects_v2.return_value = {
-            'Contents': [
-                {
-                    'Key': 'coverage/coverage-func1-id1.json',
-                    'Size': 1024,
-                    'LastModified': datetime(2024, 1, 15, 10, 30, 0)
-                },
-                {
-                    'Key': 'coverage/coverage-func2-id2.json',
-                    'Size': 1024,
-                    'LastModified': datetime(2024, 1, 15, 10, 31, 0)
-                },
-                {
-                    'Key': 'coverage/coverage-func3-id3.json',
-                    'Size': 1024,
-                    'LastModified': datetime(2024, 1, 15, 10, 32, 0)
-                }
-            ],
-            'IsTruncated': False
-        }
+        # Call with max_files=2
+        result = download_coverage_files(test_bucket, 'coverage/', max_files=2,
+                                         download_dir=str(tmp_path))
         
-        with patch('layer.python.coverage_wrapper.combiner._download_single_file') as mock_download:
-            mock_download.return_value = {
-                's3_key': 'test-key',
-                'local_path': '/tmp/test.json',
-                'file_size': 1024,
-                'last_modified': datetime.now(),
-                'function_name': 'test',
-                'execution_id': 'id'
-            }
-            
-            # Call with max_files=2
-            result = download_coverage_files('test-bucket', 'coverage/', max_files=2)
-            
-            # Should only download 2 files
-            assert len(result) == 2
-            assert mock_download.call_count == 2
+        # Should only download 2 files
+        assert len(result) == 2
     
     @patch('boto3.client')
     def test_download_coverage_files_pagination(self, mock_boto3_client):
@@ -154,7 +154,8 @@ class TestDownloadCoverageFiles:
         mock_boto3_client.return_value = mock_s3_client
         
         # Mock paginated responses
-        mock_s3_client.list_objects_v2.side_effect = [
+        mock_paginator = mock_s3_client.get_paginator.return_value
+        mock_paginator.paginate.return_value = iter([
             {
                 'Contents': [
                     {
@@ -162,9 +163,7 @@ class TestDownloadCoverageFiles:
                         'Size': 1024,
                         'LastModified': datetime(2024, 1, 15, 10, 30, 0)
                     }
-                ],
-                'IsTruncated': True,
-                'NextContinuationToken': 'token123'
+                ]
             },
             {
                 'Contents': [
@@ -173,10 +172,51 @@ class TestDownloadCoverageFiles:
                         'Size': 1024,
                         'LastModified': datetime(2024, 1, 15, 10, 31, 0)
                     }
-                ],
-                'IsTruncated': False
+                ]
             }
-        ]
+        ])
+        
+        with patch('layer.python.coverage_wrapper.combiner._download_single_file') as mock_download:
+            mock_download.side_effect = lambda client, bucket, key, obj, download_dir: {
+                's3_key': key,
+                'local_path': f'/tmp/{key}',
+                'file_size': obj['Size'],
+                'last_modified': obj['LastModified'],
+                'function_name': 'test',
+                'execution_id': 'id'
+            }
+            
+            result = download_coverage_files('test-bucket', 'coverage/', download_dir='/tmp')
+            
+            # Both pages should be consumed through a single paginator
+            mock_s3_client.get_paginator.assert_called_once_with('list_objects_v2')
+            mock_paginator.paginate.assert_called_once_with(
+                Bucket='test-bucket',
+                Prefix='coverage/',
+                PaginationConfig={'PageSize': 1000}
+            )
+            assert sorted(r['s3_key'] for r in result) == [
+                'coverage/coverage-func1-id1.json',
+                'coverage/coverage-func2-id2.json'
+            ]
+    
+    @patch('boto3.client')
+    def test_download_coverage_files_streams_pages(self, mock_boto3_client):
+        """Test that later pages are not listed once max_files is satisfied."""
+        mock_s3_client = MagicMock()
+        mock_boto3_client.return_value = mock_s3_client
+        pages_listed = []
+        
+        def pages():
+            for i in range(3):
+                pages_listed.append(i)
+                yield {'Contents': [{
+                    'Key': f'coverage/coverage-func{i}-id{i}.json',
+                    'Size': 1024,
+                    'LastModified': datetime(2024, 1, 15, 10, 30, i)
+                }]}
+        
+        mock_s3_client.get_paginator.return_value.paginate.return_value = pages()
         
         with patch('layer.python.coverage_wrapper.combiner._download_single_file') as mock_download:
             mock_download.return_value = {
@@ -188,31 +228,55 @@ class TestDownloadCoverageFiles:
                 'execution_id': 'id'
             }
             
-            result = download_coverage_files('test-bucket', 'coverage/')
+            result = download_coverage_files('test-bucket', 'coverage/', max_files=1,
+                                             download_dir='/tmp')
             
-            # Should make two list_objects_v2 calls
-            assert mock_s3_client.list_objects_v2.call_count == 2
-            assert len(result) == 2
+            assert len(result) == 1
+            assert pages_listed == [0]
+    
+    def test_download_coverage_files_skips_vanished_objects(self, tmp_path):
+        """Test that keys deleted after listing are skipped without a HEAD pass."""
+        from botocore.exceptions import ClientError
+        from layer.python.coverage_wrapper import combiner
+        
+        mock_s3_client = MagicMock()
+        mock_s3_client.get_paginator.return_value.paginate.return_value = iter([{
+            'Contents': [
+                {
+                    'Key': f'coverage/coverage-function{i}-id{i}.json',
+                    'Size': 1024,
+                    'LastModified': datetime(2024, 1, 15, 10, i, 0)
+                }
+                for i in range(3)
+            ]
+        }])
+        
+        def download(bucket, key, f):
+            if key == 'coverage/coverage-function1-id1.json':
+                raise ClientError({'Error': {'Code': '404', 'Message': 'Not Found'}}, 'GetObject')
+        
+        mock_s3_client.download_fileobj.side_effect = download
+        
+        with patch('boto3.client', return_value=mock_s3_client), \
+             patch.object(combiner, '_validate_coverage_file', return_value=True), \
+             patch.object(combiner.logger, 'error') as mock_log_error:
+            result = download_coverage_files('test-bucket', download_dir=str(tmp_path))
+        
+        assert sorted(r['function_name'] for r in result) == ['function0', 'function2']
+        assert mock_s3_client.download_fileobj.call_count == 3
+        mock_s3_client.head_object.assert_not_called()
+        mock_log_error.assert_not_called()
+        assert len(os.listdir(tmp_path)) == 2
     
     def test_download_coverage_files_invalid_bucket(self):
         """Test download with invalid bucket name."""
         with pytest.raises(ValueError, match="bucket_name cannot be empty"):
             download_coverage_files('')
     
-    @patch('boto3.client')
-    def test_download_coverage_files_s3_error(self, mock_boto3_client):
+    def test_download_coverage_files_s3_error(self, s3):
         """Test download with S3 client errors."""
         from botocore.exceptions import ClientError
         
-        mock_s3_client = MagicMock()
-        mock_boto3_client.return_value = mock_s3_client
-        
-        # Mock S3 error
-        mock_s3_client.list_objects_v2.side_effect = ClientError(
-            {'Error': {'Code': 'NoSuchBucket', 'Message': 'Bucket does not exist'}},
-            'ListObjectsV2'
-        )
-        
         with pytest.raises(ClientError):
             download_coverage_files('nonexistent-bucket')
 
@@ -292,40 +356,63 @@ class TestExtractMetadataFromKey:
             assert isinstance(execution_id, (str, type(None)))
 
 
+def _write_temp_file(content: bytes) -> str:
+    """Write bytes to a named temporary file and return its path."""
+    with tempfile.NamedTemporaryFile(mode='wb', suffix='.json', delete=False) as f:
+        f.write(content)
+        return f.name
+
+
+@pytest.fixture(scope='module')
+def valid_coverage_file(tmp_path_factory):
+    """Path to a valid coverage report shared by every test in the module."""
+    path = tmp_path_factory.mktemp('coverage') / 'valid_coverage.json'
+    path.write_bytes(_VALID_COVERAGE_BYTES)
+    return str(path)
+
+
 class TestValidateCoverageFile:
     """Test cases for _validate_coverage_file function."""
     
-    def test_validate_valid_coverage_file(self):
+    def test_validate_valid_coverage_file(self, valid_coverage_file):
         """Test validation of a valid coverage file."""
-        valid_coverage_data = {
-            'files': {
-                '/path/to/file.py': {
-                    'executed_lines': [1, 2, 3],
-                    'missing_lines': [4, 5],
-                    'summary': {'covered_lines': 3, 'num_statements': 5}
-                }
-            },
-            'totals': {
-                'covered_lines': 3,
-                'num_statements': 5,
-                'percent_covered': 60.0
-            }
-        }
+        assert _validate_coverage_file(valid_coverage_file)
+    
+    def test_validate_valid_coverage_file_stdlib_fallback(self, valid_coverage_file, monkeypatch):
+        """Test validation still works when orjson and ijson are unavailable."""
+        from layer.python.coverage_wrapper import combiner
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(valid_coverage_data, f)
-            temp_path = f.name
+        monkeypatch.setattr(combiner, 'ijson', None)
+        monkeypatch.setattr(combiner, '_json_loads', json.loads)
         
-        try:
-            assert _validate_coverage_file(temp_path)
-        finally:
-            os.unlink(temp_path)
+        assert _validate_coverage_file(valid_coverage_file)
+    
+    def test_validate_reuses_parsed_report(self, valid_coverage_file):
+        """Test that basic and advanced validation share one parse per file."""
+        from layer.python.coverage_wrapper import combiner
+        
+        with patch.object(combiner, '_stream_report_summary',
+                          wraps=combiner._stream_report_summary) as mock_stream, \
+             patch.object(combiner, '_load_json_file',
+                          wraps=combiner._load_json_file) as mock_load:
+            assert _validate_coverage_file(valid_coverage_file)
+            assert combiner._perform_advanced_validation(valid_coverage_file)['valid'] is True
+            assert _validate_coverage_file(valid_coverage_file)
+        
+        assert mock_stream.call_count + mock_load.call_count == 1
+    
+    def test_validate_reparses_modified_file(self, tmp_path):
+        """Test that rewriting a file invalidates its cached parse."""
+        path = tmp_path / 'coverage.json'
+        path.write_bytes(_VALID_COVERAGE_BYTES)
+        assert _validate_coverage_file(str(path))
+        
+        path.write_bytes(_MISSING_TOTALS_BYTES)
+        assert not _validate_coverage_file(str(path))
     
     def test_validate_invalid_json(self):
         """Test validation of invalid JSON file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write('invalid json content {')
-            temp_path = f.name
+        temp_path = _write_temp_file(_INVALID_JSON_BYTES)
         
         try:
             assert not _validate_coverage_file(temp_path)
@@ -334,11 +421,7 @@ class TestValidateCoverageFile:
     
     def test_validate_missing_required_keys(self):
         """Test validation of JSON missing required keys."""
-        invalid_data = {'files': {}}  # Missing 'totals'
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(invalid_data, f)
-            temp_path = f.name
+        temp_path = _write_temp_file(_MISSING_TOTALS_BYTES)  # Missing 'totals'
         
         try:
             assert not _validate_coverage_file(temp_path)
@@ -349,10 +432,23 @@ class TestValidateCoverageFile:
         """Test validation of nonexistent file."""
         assert not _validate_coverage_file('/nonexistent/file.json')
     
+    def test_validate_tiny_file_no_parse(self, tmp_path, monkeypatch):
+        """Test that files too small to be JSON are rejected without parsing."""
+        from layer.python.coverage_wrapper import combiner
+        
+        mock_loads = MagicMock(side_effect=AssertionError("parser should not run"))
+        monkeypatch.setattr(combiner, '_json_loads', mock_loads)
+        
+        for name, content in (('empty.json', b''), ('one_byte.json', b'{')):
+            path = tmp_path / name
+            path.write_bytes(content)
+            assert not _validate_coverage_file(str(path))
+        
+        mock_loads.assert_not_called()
+    
     def test_validate_empty_file(self):
         """Test validation of empty file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_path = f.name
+        temp_path = _write_temp_file(b'')
         
         try:
             assert not _validate_coverage_file(temp_path)
@@ -363,100 +459,76 @@ class TestValidateCoverageFile:
 class TestDownloadSingleFile:
     """Test cases for _download_single_file function."""
     
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('layer.python.coverage_wrapper.combiner._validate_coverage_file')
-    def test_download_single_file_success(self, mock_validate, mock_tempfile):
+    @patch('uuid.uuid4')
+    def test_download_single_file_success(self, mock_uuid, s3, test_bucket, tmp_path):
         """Test successful single file download."""
-        # Mock temporary file
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/coverage_test.json'
-        mock_tempfile.return_value = mock_temp
+        mock_uuid.return_value.hex = 'abcdef0123456789'
+        s3_key = 'coverage/coverage-test-function-abc123.json'
+        obj_metadata = s3.list_objects_v2(Bucket=test_bucket, Prefix=s3_key)['Contents'][0]
         
-        # Mock validation
-        mock_validate.return_value = True
+        result = _download_single_file(s3, test_bucket, s3_key, obj_metadata, str(tmp_path))
         
-        # Mock S3 client
+        assert result is not None
+        assert result['s3_key'] == s3_key
+        assert result['local_path'] == str(tmp_path / 'coverage_abcdef0123456789.json')
+        assert os.path.exists(result['local_path'])
+        assert result['file_size'] == obj_metadata['Size']
+        assert result['function_name'] == 'test-function'
+        assert result['execution_id'] == 'abc123'
+        assert result['validation_status'] == 'valid'
+    
+    @patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True)
+    def test_download_single_file_does_not_head(self, mock_validate, tmp_path):
+        """Test that object metadata comes from the listing, not a HEAD request."""
         mock_s3_client = MagicMock()
-        
-        # Mock object metadata
         obj_metadata = {
             'Size': 1024,
-            'LastModified': datetime(2024, 1, 15, 10, 30, 0)
+            'LastModified': datetime(2024, 1, 15, 10, 30, 0),
+            'ETag': '"d41d8cd98f00b204e9800998ecf8427e"'
         }
         
         result = _download_single_file(
             mock_s3_client,
             'test-bucket',
             'coverage/coverage-test-func-abc123.json',
-            obj_metadata
+            obj_metadata,
+            str(tmp_path)
         )
         
-        assert result is not None
-        assert result['s3_key'] == 'coverage/coverage-test-func-abc123.json'
-        assert result['local_path'] == '/tmp/coverage_test.json'
         assert result['file_size'] == 1024
-        assert result['function_name'] == 'test-func'
-        assert result['execution_id'] == 'abc123'
-        
-        # Verify S3 download was called
+        assert result['last_modified'] == datetime(2024, 1, 15, 10, 30, 0)
         mock_s3_client.download_fileobj.assert_called_once()
+        mock_s3_client.head_object.assert_not_called()
     
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('layer.python.coverage_wrapper.combiner._validate_coverage_file')
-    @patch('os.unlink')
-    def test_download_single_file_validation_failure(self, mock_unlink, mock_validate, mock_tempfile):
+    @patch('os.unlink', wraps=os.unlink)
+    def test_download_single_file_validation_failure(self, mock_unlink, s3, test_bucket):
         """Test single file download with validation failure."""
-        # Mock temporary file
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/coverage_test.json'
-        mock_tempfile.return_value = mock_temp
-        
-        # Mock validation failure
-        mock_validate.return_value = False
-        
-        # Mock S3 client
-        mock_s3_client = MagicMock()
-        
         obj_metadata = {
             'Size': 1024,
             'LastModified': datetime(2024, 1, 15, 10, 30, 0)
         }
         
         result = _download_single_file(
-            mock_s3_client,
-            'test-bucket',
-            'coverage/invalid-file.json',
+            s3,
+            test_bucket,
+            'invalid/coverage-broken-function-xyz000.json',
             obj_metadata
         )
         
         assert result is None
-        mock_unlink.assert_called_once_with('/tmp/coverage_test.json')
+        mock_unlink.assert_called_once()
+        assert not os.path.exists(mock_unlink.call_args[0][0])
     
-    @patch('tempfile.NamedTemporaryFile')
-    def test_download_single_file_s3_error(self, mock_tempfile):
+    def test_download_single_file_s3_error(self, s3, test_bucket):
         """Test single file download with S3 error."""
-        from botocore.exceptions import ClientError
-        
-        # Mock temporary file
-        mock_temp = MagicMock()
-        mock_temp.name = '/tmp/coverage_test.json'
-        mock_tempfile.return_value = mock_temp
-        
-        # Mock S3 client with error
-        mock_s3_client = MagicMock()
-        mock_s3_client.download_fileobj.side_effect = ClientError(
-            {'Error': {'Code': 'NoSuchKey', 'Message': 'Key does not exist'}},
-            'GetObject'
-        )
-        
         obj_metadata = {
             'Size': 1024,
             'LastModified': datetime(2024, 1, 15, 10, 30, 0)
         }
         
         result = _download_single_file(
-            mock_s3_client,
-            'test-bucket',
+            s3,
+            test_bucket,
             'coverage/nonexistent-file.json',
             obj_metadata
         )
@@ -486,11 +558,10 @@ class TestCleanupDownloadedFiles:
         mock_unlink.assert_any_call('/tmp/file2.json')
         mock_unlink.assert_any_call('/tmp/file3.json')
     
-    @patch('os.path.exists')
     @patch('os.unlink')
-    def test_cleanup_downloaded_files_missing_files(self, mock_unlink, mock_exists):
+    def test_cleanup_downloaded_files_missing_files(self, mock_unlink):
         """Test cleanup when some files don't exist."""
-        mock_exists.side_effect = [True, False, True]
+        mock_unlink.side_effect = [None, FileNotFoundError(), None]
         
         file_list = [
             {'local_path': '/tmp/file1.json'},
@@ -498,13 +569,29 @@ class TestCleanupDownloadedFiles:
             {'local_path': '/tmp/file3.json'}
         ]
         
+        # Missing files should be skipped without raising
         cleanup_downloaded_files(file_list)
         
-        # Should only try to unlink existing files
-        assert mock_unlink.call_count == 2
+        assert mock_unlink.call_count == 3
         mock_unlink.assert_any_call('/tmp/file1.json')
+        mock_unlink.assert_any_call('/tmp/file2.json')
         mock_unlink.assert_any_call('/tmp/file3.json')
     
+    def test_cleanup_downloaded_files_removes_download_dir(self, tmp_path):
+        """Test that the download directory is removed in a single pass."""
+        download_dir = tmp_path / 'downloads'
+        download_dir.mkdir()
+        file_list = []
+        for name in ('file1.json', 'file2.json'):
+            (download_dir / name).write_text('{}')
+            file_list.append({'local_path': str(download_dir / name)})
+        
+        with patch('layer.python.coverage_wrapper.combiner._safe_unlink') as mock_unlink:
+            cleanup_downloaded_files(file_list, str(download_dir))
+        
+        mock_unlink.assert_not_called()
+        assert not download_dir.exists()
+    
     @patch('os.path.exists')
     @patch('os.unlink')
     def test_cleanup_downloaded_files_with_errors(self, mock_unlink, mock_exists):
@@ -524,6 +611,41 @@ class TestCleanupDownloadedFiles:
         assert mock_unlink.call_count == 3
 
 
+class TestCleanupS3Objects:
+    """Test cases for cleanup_s3_objects function."""
+    
+    def test_batches_in_1000s(self):
+        """Test that keys are deleted in DeleteObjects batches of 1000."""
+        mock_s3_client = MagicMock()
+        mock_s3_client.delete_objects.return_value = {}
+        keys = [f'coverage/coverage-func-{i}.json' for i in range(2500)]
+        
+        deleted = cleanup_s3_objects('test-bucket', keys, mock_s3_client)
+        
+        assert deleted == 2500
+        assert mock_s3_client.delete_objects.call_count == 3
+        batch_sizes = [len(c[1]['Delete']['Objects']) for c in mock_s3_client.delete_objects.call_args_list]
+        assert batch_sizes == [1000, 1000, 500]
+    
+    def test_reports_per_key_errors(self):
+        """Test that keys S3 failed to delete are not counted."""
+        mock_s3_client = MagicMock()
+        mock_s3_client.delete_objects.return_value = {
+            'Errors': [{'Key': 'coverage/a.json', 'Code': 'AccessDenied', 'Message': 'Denied'}]
+        }
+        
+        deleted = cleanup_s3_objects('test-bucket', ['coverage/a.json', 'coverage/b.json'], mock_s3_client)
+        
+        assert deleted == 1
+    
+    def test_no_keys(self):
+        """Test that an empty key list makes no requests."""
+        mock_s3_client = MagicMock()
+        
+        assert cleanup_s3_objects('test-bucket', [], mock_s3_client) == 0
+        mock_s3_client.delete_objects.assert_not_called()
+
+
 class TestGetCoverageFileStats:
     """Test cases for get_coverage_file_stats function."""
     
@@ -611,39 +733,55 @@ class TestGetCombinerS3Config:
             get_combiner_s3_config()
 
 
+_COMBINED_50_PERCENT_BYTES = json.dumps({
+    'files': {
+        '/path/to/file1.py': {'executed_lines': [1, 2, 3]},
+        '/path/to/file2.py': {'executed_lines': [1, 2]}
+    },
+    'totals': {
+        'covered_lines': 5,
+        'num_statements': 10,
+        'percent_covered': 50.0
+    }
+}).encode('utf-8')
+_COMBINED_40_PERCENT_BYTES = json.dumps({
+    'files': {'/path/to/file.py': {'executed_lines': [1, 2]}},
+    'totals': {'covered_lines': 2, 'num_statements': 5, 'percent_covered': 40.0}
+}).encode('utf-8')
+
+
+@pytest.fixture
+def combined_report(tmp_path):
+    """Factory writing a combined report to a real file and returning its path."""
+    def _write(content: bytes) -> str:
+        path = tmp_path / 'combined_coverage_test.json'
+        path.write_bytes(content)
+        return str(path)
+    return _write
+
+
 class TestMergeCoverageData:
     """Test cases for merge_coverage_data function."""
     
+    @patch('coverage.CoverageData')
     @patch('coverage.Coverage')
     @patch('tempfile.NamedTemporaryFile')
     @patch('tempfile.TemporaryDirectory')
-    def test_merge_coverage_data_success(self, mock_temp_dir, mock_temp_file, mock_coverage_class):
+    def test_merge_coverage_data_success(self, mock_temp_dir, mock_temp_file, mock_coverage_class,
+                                         mock_coverage_data_class, combined_report):
         """Test successful coverage data merging."""
         # Mock temporary directory
         mock_temp_dir.return_value.__enter__.return_value = '/tmp/coverage_merge_test'
         
-        # Mock temporary file
+        # Temporary file points at a real combined report
         mock_file = MagicMock()
-        mock_file.name = '/tmp/combined_coverage_test.json'
+        mock_file.name = combined_report(_COMBINED_50_PERCENT_BYTES)
         mock_temp_file.return_value = mock_file
         
         # Mock coverage instance
         mock_coverage = MagicMock()
         mock_coverage_class.return_value = mock_coverage
         
-        # Mock combined coverage data
-        combined_data = {
-            'files': {
-                '/path/to/file1.py': {'executed_lines': [1, 2, 3]},
-                '/path/to/file2.py': {'executed_lines': [1, 2]}
-            },
-            'totals': {
-                'covered_lines': 5,
-                'num_statements': 10,
-                'percent_covered': 50.0
-            }
-        }
-        
         # Create test files
         test_files = [
             {
@@ -665,23 +803,82 @@ class TestMergeCoverageData:
         ]
         
         with patch('os.path.exists', return_value=True), \
-             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True), \
-             patch('builtins.open', mock_open(read_data=json.dumps(combined_data))), \
-             patch('os.path.getsize', return_value=5120):
+             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True):
             
             from layer.python.coverage_wrapper.combiner import merge_coverage_data
             
             combined_file_path, merge_stats = merge_coverage_data(test_files)
             
-            assert combined_file_path == '/tmp/combined_coverage_test.json'
+            assert combined_file_path == mock_file.name
             assert merge_stats['files_processed'] == 2
             assert merge_stats['files_skipped'] == 0
             assert merge_stats['total_coverage_percentage'] == 50.0
             assert merge_stats['function_count'] == 2
             
-            # Verify coverage.combine was called
-            mock_coverage.combine.assert_called_once()
-            mock_coverage.json_report.assert_called_once_with(outfile='/tmp/combined_coverage_test.json')
+            # Verify each file was merged through CoverageData
+            assert mock_coverage_data_class.return_value.update.call_count == 2
+            mock_coverage.combine.assert_not_called()
+            mock_coverage.json_report.assert_called_once_with(outfile=mock_file.name)
+    
+    def test_merge_coverage_data_skips_unreadable_data(self, tmp_path):
+        """Test that files coverage.py cannot read are skipped during update."""
+        from layer.python.coverage_wrapper.combiner import _update_coverage_data
+        import coverage
+        
+        data_path = str(tmp_path / '.coverage.func1')
+        data = coverage.CoverageData(basename=data_path)
+        data.add_lines({'/var/task/a.py': [1, 2]})
+        data.write()
+        json_path = tmp_path / 'coverage.json'
+        json_path.write_bytes(_VALID_COVERAGE_BYTES)
+        combined_path = str(tmp_path / '.coverage_combined')
+        
+        merged = _update_coverage_data([data_path, str(json_path)], combined_path)
+        
+        assert merged == 1
+        combined = coverage.CoverageData(basename=combined_path)
+        combined.read()
+        assert combined.lines('/var/task/a.py') == [1, 2]
+    
+    def test_calculate_merge_statistics_reads_only_totals(self, tmp_path):
+        """Test that merge statistics do not build the per-file line arrays."""
+        from layer.python.coverage_wrapper import combiner
+        
+        combined_path = tmp_path / 'combined.json'
+        combined_path.write_bytes(_VALID_COVERAGE_BYTES)
+        valid_files = [{'function_name': 'func1', 'file_size': 1024,
+                        'last_modified': datetime(2024, 1, 15, 10, 0, 0)}]
+        
+        with patch.object(combiner, '_json_loads', side_effect=AssertionError('full parse')):
+            merge_stats = combiner._calculate_merge_statistics(valid_files, [], str(combined_path))
+        
+        assert merge_stats['total_coverage_percentage'] == 60.0
+        assert merge_stats['functions_merged'] == ['func1']
+    
+    def test_calculate_merge_statistics_date_range(self, tmp_path):
+        """Test the merged date range with unordered and missing timestamps."""
+        from layer.python.coverage_wrapper.combiner import _calculate_merge_statistics
+        
+        combined_path = tmp_path / 'combined.json'
+        combined_path.write_bytes(_VALID_COVERAGE_BYTES)
+        valid_files = [
+            {'function_name': 'func2', 'file_size': 2048, 'last_modified': datetime(2024, 1, 15, 11, 0, 0)},
+            {'function_name': 'func1', 'file_size': 1024, 'last_modified': None},
+            {'function_name': 'func1', 'file_size': 512, 'last_modified': datetime(2024, 1, 15, 9, 0, 0)},
+            {'file_size': 256, 'last_modified': datetime(2024, 1, 15, 12, 0, 0)}
+        ]
+        
+        merge_stats = _calculate_merge_statistics(valid_files, [], str(combined_path))
+        
+        assert merge_stats['date_range'] == {
+            'earliest': datetime(2024, 1, 15, 9, 0, 0),
+            'latest': datetime(2024, 1, 15, 12, 0, 0)
+        }
+        assert merge_stats['functions_merged'] == ['func1', 'func2']
+        assert merge_stats['total_size_bytes'] == 3840
+        
+        no_dates = _calculate_merge_statistics([{'file_size': 1}], [], str(combined_path))
+        assert no_dates['date_range'] is None
     
     def test_merge_coverage_data_empty_file_list(self):
         """Test merge with empty file list."""
@@ -707,12 +904,13 @@ class TestMergeCoverageData:
     @patch('coverage.Coverage')
     @patch('tempfile.NamedTemporaryFile')
     @patch('tempfile.TemporaryDirectory')
-    def test_merge_coverage_data_with_invalid_files(self, mock_temp_dir, mock_temp_file, mock_coverage_class):
+    def test_merge_coverage_data_with_invalid_files(self, mock_temp_dir, mock_temp_file, mock_coverage_class,
+                                                    combined_report):
         """Test merge with some invalid files that should be skipped."""
         # Mock temporary directory and file
         mock_temp_dir.return_value.__enter__.return_value = '/tmp/coverage_merge_test'
         mock_file = MagicMock()
-        mock_file.name = '/tmp/combined_coverage_test.json'
+        mock_file.name = combined_report(_COMBINED_40_PERCENT_BYTES)
         mock_temp_file.return_value = mock_file
         
         # Mock coverage instance
@@ -738,20 +936,13 @@ class TestMergeCoverageData:
         
         # Mock file existence and validation
         def mock_exists(path):
-            return path == '/tmp/valid_coverage.json'
+            return path in ('/tmp/valid_coverage.json', mock_file.name)
         
         def mock_validate(path):
             return path == '/tmp/valid_coverage.json'
         
-        combined_data = {
-            'files': {'/path/to/file.py': {'executed_lines': [1, 2]}},
-            'totals': {'covered_lines': 2, 'num_statements': 5, 'percent_covered': 40.0}
-        }
-        
         with patch('os.path.exists', side_effect=mock_exists), \
-             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', side_effect=mock_validate), \
-             patch('builtins.open', mock_open(read_data=json.dumps(combined_data))), \
-             patch('os.path.getsize', return_value=2048):
+             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', side_effect=mock_validate):
             
             from layer.python.coverage_wrapper.combiner import merge_coverage_data
             
@@ -832,28 +1023,75 @@ class TestValidateCoverageFilesIntegrity:
             assert valid_files[0]['s3_key'] == 'coverage/valid.json'
             assert any(f['s3_key'] == 'coverage/invalid.json' for f in invalid_files)
             assert any(f['s3_key'] == 'coverage/missing.json' for f in invalid_files)
+    
+    def test_validate_coverage_files_integrity_reuses_download_results(self):
+        """Test that files validated during download are not validated again."""
+        test_files = [
+            {'local_path': '/tmp/coverage1.json', 's3_key': 'coverage/coverage1.json',
+             'validation_status': 'valid'},
+            {'local_path': '/tmp/coverage2.json', 's3_key': 'coverage/coverage2.json',
+             'validation_error': 'Advanced validation failed'},
+            {'local_path': '/tmp/coverage3.json', 's3_key': 'coverage/coverage3.json'}
+        ]
+        
+        with patch('os.path.exists', return_value=True), \
+             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True) as mock_validate, \
+             patch('layer.python.coverage_wrapper.combiner._perform_advanced_validation', return_value={'valid': True}):
+            
+            from layer.python.coverage_wrapper.combiner import validate_coverage_files_integrity
+            
+            valid_files, invalid_files = validate_coverage_files_integrity(test_files)
+            
+            mock_validate.assert_called_once_with('/tmp/coverage3.json')
+            assert [f['s3_key'] for f in valid_files] == ['coverage/coverage1.json', 'coverage/coverage3.json']
+            assert [f['s3_key'] for f in invalid_files] == ['coverage/coverage2.json']
+            assert invalid_files[0]['validation_error'] == 'Advanced validation failed'
+    
+    def test_validate_coverage_files_integrity_keeps_order(self):
+        """Test that results keep the input order across valid and invalid files."""
+        test_files = [
+            {'local_path': f'/tmp/coverage{i}.json', 's3_key': f'coverage/coverage{i}.json'}
+            for i in range(6)
+        ]
+        
+        def mock_validate(path):
+            return path != '/tmp/coverage1.json'
+        
+        def mock_advanced_validate(path):
+            if path == '/tmp/coverage4.json':
+                return {'valid': False, 'error': 'Advanced validation failed'}
+            return {'valid': True}
+        
+        with patch('os.path.exists', return_value=True), \
+             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', side_effect=mock_validate), \
+             patch('layer.python.coverage_wrapper.combiner._perform_advanced_validation', side_effect=mock_advanced_validate):
+            
+            from layer.python.coverage_wrapper.combiner import validate_coverage_files_integrity
+            
+            valid_files, invalid_files = validate_coverage_files_integrity(test_files)
+            
+            assert [f['s3_key'] for f in valid_files] == [
+                'coverage/coverage0.json', 'coverage/coverage2.json',
+                'coverage/coverage3.json', 'coverage/coverage5.json'
+            ]
+            assert {f['s3_key']: f['validation_error'] for f in invalid_files} == {
+                'coverage/coverage1.json': 'Basic validation failed',
+                'coverage/coverage4.json': 'Advanced validation failed'
+            }
 
 
 class TestPerformAdvancedValidation:
     """Test cases for _perform_advanced_validation function."""
     
+    @pytest.fixture(autouse=True)
+    def fake_stat(self):
+        """Give the mock_open reports a stable cache key."""
+        with patch('os.stat', return_value=_FAKE_STAT):
+            yield
+    
     def test_perform_advanced_validation_valid_file(self):
         """Test advanced validation with valid coverage file."""
-        valid_data = {
-            'files': {
-                '/path/to/file.py': {
-                    'executed_lines': [1, 2, 3],
-                    'missing_lines': [4, 5]
-                }
-            },
-            'totals': {
-                'covered_lines': 3,
-                'num_statements': 5,
-                'percent_covered': 60.0
-            }
-        }
-        
-        with patch('builtins.open', mock_open(read_data=json.dumps(valid_data))):
+        with patch('builtins.open', _mock_report_open(_VALID_COVERAGE_BYTES)):
             from layer.python.coverage_wrapper.combiner import _perform_advanced_validation
             
             result = _perform_advanced_validation('/tmp/test.json')
@@ -862,15 +1100,7 @@ class TestPerformAdvancedValidation:
     
     def test_perform_advanced_validation_missing_keys(self):
         """Test advanced validation with missing required keys."""
-        invalid_data = {
-            'files': {},
-            'totals': {
-                'covered_lines': 3
-                # Missing 'num_statements'
-            }
-        }
-        
-        with patch('builtins.open', mock_open(read_data=json.dumps(invalid_data))):
+        with patch('builtins.open', _mock_report_open(_MISSING_STATEMENTS_BYTES)):
             from layer.python.coverage_wrapper.combiner import _perform_advanced_validation
             
             result = _perform_advanced_validation('/tmp/test.json')
@@ -880,25 +1110,78 @@ class TestPerformAdvancedValidation:
     
     def test_perform_advanced_validation_invalid_values(self):
         """Test advanced validation with invalid numeric values."""
-        invalid_data = {
-            'files': {},
-            'totals': {
-                'covered_lines': -1,  # Invalid negative value
-                'num_statements': 5
-            }
+        with patch('builtins.open', _mock_report_open(_NEGATIVE_LINES_BYTES)):
+            from layer.python.coverage_wrapper.combiner import _perform_advanced_validation
+            
+            result = _perform_advanced_validation('/tmp/test.json')
+            
+            assert result['valid'] is False
+            assert 'covered_lines' in result['error']
+    
+    @pytest.mark.parametrize("data, error", [
+        ([], 'Invalid coverage report structure'),
+        ({'files': [], 'totals': {}}, 'Invalid files section structure'),
+        ({'files': {}, 'totals': []}, 'Invalid totals section structure'),
+        ({'files': {}, 'totals': {'covered_lines': 1}}, 'Missing required total key: num_statements'),
+        ({'files': {}, 'totals': {'covered_lines': True, 'num_statements': 1}}, 'Invalid covered_lines value'),
+        ({'files': {}, 'totals': {'covered_lines': 1, 'num_statements': '2'}}, 'Invalid num_statements value'),
+        ({'files': {}, 'totals': {'covered_lines': 1.0, 'num_statements': 2}}, None),
+    ])
+    def test_first_report_error(self, data, error):
+        """Test the structural checks applied to every decoded report."""
+        from layer.python.coverage_wrapper.combiner import _first_report_error
+        
+        assert _first_report_error(data) == error
+    
+    def test_perform_advanced_validation_stdlib_fallback(self, monkeypatch, tmp_path):
+        """Test advanced validation parses the whole report without ijson or orjson."""
+        from layer.python.coverage_wrapper import combiner
+        
+        monkeypatch.setattr(combiner, 'ijson', None)
+        monkeypatch.setattr(combiner, '_json_loads', json.loads)
+        report_path = tmp_path / 'coverage.json'
+        report_path.write_bytes(_VALID_COVERAGE_BYTES)
+        
+        result = combiner._perform_advanced_validation(str(report_path))
+        
+        assert result['valid'] is True
+    
+    def test_perform_advanced_validation_skips_file_details(self, tmp_path):
+        """Test that streamed validation never builds per-file coverage data."""
+        from layer.python.coverage_wrapper import combiner
+        
+        report = {
+            'files': {
+                '/path/to/a.py': {'executed_lines': [1, 2], 'missing_lines': []},
+                '/path/to/b.py': {'executed_lines': [1], 'missing_lines': [2]}
+            },
+            'totals': {'covered_lines': 3, 'num_statements': 4, 'percent_covered': 75.0}
         }
         
-        with patch('builtins.open', mock_open(read_data=json.dumps(invalid_data))):
+        report_path = tmp_path / 'coverage.json'
+        report_path.write_text(json.dumps(report))
+        
+        with open(report_path, 'rb') as f:
+            summary = combiner._stream_report_summary(f)
+        
+        assert summary == {
+            'files': {'/path/to/a.py': None, '/path/to/b.py': None},
+            'totals': {'covered_lines': 3, 'num_statements': 4, 'percent_covered': 75.0}
+        }
+    
+    def test_perform_advanced_validation_files_not_object(self):
+        """Test that a non-object files section fails validation when streamed."""
+        with patch('builtins.open', _mock_report_open(_FILES_LIST_BYTES)):
             from layer.python.coverage_wrapper.combiner import _perform_advanced_validation
             
             result = _perform_advanced_validation('/tmp/test.json')
             
             assert result['valid'] is False
-            assert 'covered_lines' in result['error']
+            assert 'files' in result['error']
     
     def test_perform_advanced_validation_json_error(self):
         """Test advanced validation with invalid JSON."""
-        with patch('builtins.open', mock_open(read_data='invalid json {')):
+        with patch('builtins.open', _mock_report_open(b'invalid json {')):
             from layer.python.coverage_wrapper.combiner import _perform_advanced_validation
             
             result = _perform_advanced_validation('/tmp/test.json')
@@ -971,44 +1254,67 @@ class TestCombinerIntegration:
         'COVERAGE_S3_PREFIX': 'coverage/'
     })
     @patch('boto3.client')
-    def test_download_coverage_files_integration(self, mock_boto3_client):
+    def test_download_coverage_files_integration(self, mock_boto3_client, tmp_path):
         """Integration test for the complete download workflow."""
         # Mock S3 client
         mock_s3_client = MagicMock()
         mock_boto3_client.return_value = mock_s3_client
         
-        # Mock S3 response
-        mock_s3_client.list_objects_v2.return_value = {
+        # Mock S3 listing as a single page
+        mock_s3_client.get_paginator.return_value.paginate.return_value = iter([{
             'Contents': [
                 {
                     'Key': 'coverage/coverage-test-function-abc123.json',
                     'Size': 1024,
                     'LastModified': datetime(2024, 1, 15, 10, 30, 0)
                 }
-            ],
-            'IsTruncated': False
-        }
+            ]
+        }])
         
-        # Mock file download and validation
-        with patch('tempfile.NamedTemporaryFile') as mock_tempfile, \
-             patch('layer.python.coverage_wrapper.combiner._validate_coverage_file') as mock_validate:
-            
-            mock_temp = MagicMock()
-            mock_temp.name = '/tmp/coverage_test.json'
-            mock_tempfile.return_value = mock_temp
+        # Mock file validation
+        with patch('layer.python.coverage_wrapper.combiner._validate_coverage_file') as mock_validate:
             mock_validate.return_value = True
             
             # Test the integration
-            result = download_coverage_files('test-bucket')
+            result = download_coverage_files('test-bucket', download_dir=str(tmp_path))
             
             assert len(result) == 1
             assert result[0]['function_name'] == 'test-function'
             assert result[0]['execution_id'] == 'abc123'
     
+    @patch.dict(os.environ, {'COVERAGE_DL_CONCURRENCY': '4'})
+    @patch('boto3.client')
+    def test_download_coverage_files_concurrent_integration(self, mock_boto3_client, tmp_path):
+        """Integration test that every key is downloaded through the worker pool."""
+        mock_s3_client = MagicMock()
+        mock_boto3_client.return_value = mock_s3_client
+        
+        mock_s3_client.get_paginator.return_value.paginate.return_value = iter([{
+            'Contents': [
+                {
+                    'Key': f'coverage/coverage-function{i}-id{i}.json',
+                    'Size': 1024,
+                    'LastModified': datetime(2024, 1, 15, 10, i, 0)
+                }
+                for i in range(8)
+            ]
+        }])
+        
+        with patch('layer.python.coverage_wrapper.combiner._validate_coverage_file') as mock_validate:
+            mock_validate.return_value = True
+            
+            result = download_coverage_files('test-bucket', download_dir=str(tmp_path))
+            
+            assert mock_s3_client.download_fileobj.call_count == 8
+            assert sorted(r['function_name'] for r in result) == [f'function{i}' for i in range(8)]
+            assert len({r['local_path'] for r in result}) == 8
+    
+    @patch('coverage.CoverageData')
     @patch('coverage.Coverage')
     @patch('tempfile.NamedTemporaryFile')
     @patch('tempfile.TemporaryDirectory')
-    def test_complete_merge_workflow_integration(self, mock_temp_dir, mock_temp_file, mock_coverage_class):
+    def test_complete_merge_workflow_integration(self, mock_temp_dir, mock_temp_file, mock_coverage_class,
+                                                 mock_coverage_data_class):
         """Integration test for the complete merge workflow."""
         # Mock temporary directory and file
         mock_temp_dir.return_value.__enter__.return_value = '/tmp/coverage_merge_test'
@@ -1040,21 +1346,10 @@ class TestCombinerIntegration:
             }
         ]
         
-        combined_data = {
-            'files': {
-                '/var/task/lambda1.py': {'executed_lines': [1, 2, 3, 5], 'missing_lines': [4]},
-                '/var/task/lambda2.py': {'executed_lines': [1, 2], 'missing_lines': [3, 4, 5]}
-            },
-            'totals': {
-                'covered_lines': 6,
-                'num_statements': 10,
-                'percent_covered': 60.0
-            }
-        }
-        
         with patch('os.path.exists', return_value=True), \
+             patch('os.stat', return_value=_FAKE_STAT), \
              patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True), \
-             patch('builtins.open', mock_open(read_data=json.dumps(combined_data))), \
+             patch('builtins.open', _mock_report_open(_COMBINED_COVERAGE_BYTES)), \
              patch('os.path.getsize', return_value=3072):
             
             from layer.python.coverage_wrapper.combiner import (
@@ -1079,8 +1374,9 @@ class TestCombinerIntegration:
             assert report['merge_summary']['files_successfully_merged'] == 2
             assert report['merged_functions']['function_count'] == 2
             
-            # Verify coverage operations were called
-            mock_coverage.combine.assert_called_once()
+            # Verify coverage operations were called, one update per input file
+            assert mock_coverage_data_class.return_value.update.call_count == 2
+            mock_coverage.load.assert_called_once()
             mock_coverage.json_report.assert_called_once()
 
 
@@ -1088,23 +1384,21 @@ class TestUploadCombinedReport:
     """Test cases for upload_combined_report function."""
     
     @patch('boto3.client')
-    @patch('os.path.exists')
-    @patch('os.path.getsize')
-    @patch('builtins.open', new_callable=mock_open, read_data=b'{"test": "data"}')
-    def test_upload_combined_report_success(self, mock_file, mock_getsize, mock_exists, mock_boto3_client):
+    def test_upload_combined_report_success(self, mock_boto3_client, tmp_path):
         """Test successful upload of combined report."""
-        # Mock file system
-        mock_exists.return_value = True
-        mock_getsize.return_value = 1024
+        combined_path = tmp_path / 'combined_coverage.json'
+        combined_path.write_bytes(b'{"test": "data"}')
         
-        # Mock S3 client
+        # Mock S3 client, keeping the uploaded body before its temp file closes
         mock_s3_client = MagicMock()
         mock_boto3_client.return_value = mock_s3_client
+        uploaded = {}
+        mock_s3_client.upload_fileobj.side_effect = lambda body, *args, **kwargs: uploaded.update(body=body.read())
         
         from layer.python.coverage_wrapper.combiner import upload_combined_report
         
         result = upload_combined_report(
-            '/tmp/combined_coverage.json',
+            str(combined_path),
             'test-bucket',
             'coverage/combined-report.json',
             {'CustomKey': 'CustomValue'}
@@ -1113,7 +1407,7 @@ class TestUploadCombinedReport:
         assert result['success'] is True
         assert result['bucket_name'] == 'test-bucket'
         assert result['output_key'] == 'coverage/combined-report.json'
-        assert result['file_size'] == 1024
+        assert result['file_size'] == 16
         
         # Verify S3 upload was called
         mock_s3_client.upload_fileobj.assert_called_once()
@@ -1121,6 +1415,51 @@ class TestUploadCombinedReport:
         assert call_args[0][1] == 'test-bucket'
         assert call_args[0][2] == 'coverage/combined-report.json'
         assert 'CustomKey' in call_args[1]['ExtraArgs']['Metadata']
+        assert call_args[1]['Config'].max_concurrency == 10
+        assert call_args[1]['Config'].multipart_chunksize == 8 * 1024 * 1024
+        
+        # A plain .json key receives the report unchanged
+        assert 'ContentEncoding' not in call_args[1]['ExtraArgs']
+        assert 'Content-Encoding' not in call_args[1]['ExtraArgs']['Metadata']
+        assert uploaded['body'] == b'{"test": "data"}'
+        assert result['compressed_size'] == 16
+    
+    @patch('boto3.client')
+    def test_upload_combined_report_gzip_key(self, mock_boto3_client, tmp_path):
+        """Test that a .gz output key stores the report gzip-encoded."""
+        combined_path = tmp_path / 'combined_coverage.json'
+        combined_path.write_bytes(b'{"test": "data"}')
+        
+        mock_s3_client = MagicMock()
+        mock_boto3_client.return_value = mock_s3_client
+        uploaded = {}
+        mock_s3_client.upload_fileobj.side_effect = lambda body, *args, **kwargs: uploaded.update(body=body.read())
+        
+        from layer.python.coverage_wrapper.combiner import upload_combined_report
+        
+        result = upload_combined_report(str(combined_path), 'test-bucket', 'coverage/combined-report.json.gz')
+        
+        call_args = mock_s3_client.upload_fileobj.call_args
+        assert call_args[0][2] == 'coverage/combined-report.json.gz'
+        assert call_args[1]['ExtraArgs']['ContentEncoding'] == 'gzip'
+        assert call_args[1]['ExtraArgs']['ContentType'] == 'application/json'
+        assert gzip.decompress(uploaded['body']) == b'{"test": "data"}'
+        assert result['file_size'] == 16
+        assert result['compressed_size'] == len(uploaded['body'])
+    
+    @patch.dict(os.environ, {'COVERAGE_UL_CONCURRENCY': '4'})
+    @patch('boto3.client')
+    def test_upload_combined_report_concurrency_override(self, mock_boto3_client, tmp_path):
+        """Test that COVERAGE_UL_CONCURRENCY sets the multipart upload concurrency."""
+        from layer.python.coverage_wrapper.combiner import upload_combined_report
+        
+        combined_path = tmp_path / 'combined_coverage.json'
+        combined_path.write_bytes(b'{"test": "data"}')
+        
+        upload_combined_report(str(combined_path), 'test-bucket', 'coverage/combined-report.json')
+        
+        call_args = mock_boto3_client.return_value.upload_fileobj.call_args
+        assert call_args[1]['Config'].max_concurrency == 4
     
     def test_upload_combined_report_file_not_exists(self):
         """Test upload when file doesn't exist."""
@@ -1144,13 +1483,13 @@ class TestUploadCombinedReport:
                 upload_combined_report('/tmp/test.json', 'test-bucket', '')
     
     @patch('boto3.client')
-    @patch('os.path.exists')
-    def test_upload_combined_report_s3_error(self, mock_exists, mock_boto3_client):
+    def test_upload_combined_report_s3_error(self, mock_boto3_client, tmp_path):
         """Test upload with S3 error."""
         from botocore.exceptions import ClientError
         from layer.python.coverage_wrapper.combiner import upload_combined_report
         
-        mock_exists.return_value = True
+        combined_path = tmp_path / 'test.json'
+        combined_path.write_bytes(b'test')
         
         # Mock S3 client with error
         mock_s3_client = MagicMock()
@@ -1160,11 +1499,44 @@ class TestUploadCombinedReport:
         )
         mock_boto3_client.return_value = mock_s3_client
         
-        with patch('os.path.getsize', return_value=1024), \
-             patch('builtins.open', mock_open(read_data=b'test')):
-            
-            with pytest.raises(ClientError):
-                upload_combined_report('/tmp/test.json', 'test-bucket', 'test-key')
+        with pytest.raises(ClientError):
+            upload_combined_report(str(combined_path), 'test-bucket', 'test-key')
+    
+    @patch('boto3.client')
+    def test_upload_combined_report_reuses_s3_client(self, mock_boto3_client, tmp_path):
+        """Test that repeated uploads share one cached S3 client."""
+        from layer.python.coverage_wrapper.combiner import upload_combined_report
+
+        combined_path = tmp_path / 'combined_coverage.json'
+        combined_path.write_bytes(b'{"test": "data"}')
+
+        upload_combined_report(str(combined_path), 'test-bucket', 'coverage/first.json')
+        upload_combined_report(str(combined_path), 'test-bucket', 'coverage/second.json')
+
+        mock_boto3_client.assert_called_once_with('s3', region_name=None)
+        assert mock_boto3_client.return_value.upload_fileobj.call_count == 2
+
+    def test_copy_stream_reuses_pooled_buffer(self):
+        """Test that stream copies borrow and return the same pooled buffer."""
+        from layer.python.coverage_wrapper import combiner
+        
+        payload = os.urandom(combiner._COPY_BUFFER_SIZE * 2 + 10)
+        buffers = []
+        original = combiner._pooled_buffer
+        
+        @contextmanager
+        def tracking_buffer():
+            with original() as buffer:
+                buffers.append(buffer)
+                yield buffer
+        
+        with patch.object(combiner, '_pooled_buffer', tracking_buffer):
+            for _ in range(2):
+                dst = io.BytesIO()
+                assert combiner._copy_stream(io.BytesIO(payload), dst) == len(payload)
+                assert dst.getvalue() == payload
+        
+        assert buffers[0] is buffers[1]
 
 
 class TestCombineCoverageFiles:
@@ -1174,10 +1546,13 @@ class TestCombineCoverageFiles:
     @patch('layer.python.coverage_wrapper.combiner.validate_coverage_files_integrity')
     @patch('layer.python.coverage_wrapper.combiner.merge_coverage_data')
     @patch('layer.python.coverage_wrapper.combiner.upload_combined_report')
-    @patch('layer.python.coverage_wrapper.combiner.cleanup_downloaded_files')
-    def test_combine_coverage_files_success(self, mock_cleanup, mock_upload, mock_merge, 
+    @patch('tempfile.TemporaryDirectory')
+    def test_combine_coverage_files_success(self, mock_temp_dir, mock_upload, mock_merge, 
                                           mock_validate, mock_download):
         """Test successful coverage file combination."""
+        # Mock download directory
+        mock_temp_dir.return_value.__enter__.return_value = '/tmp/coverage_download_test'
+        
         # Mock download
         downloaded_files = [
             {'local_path': '/tmp/file1.json', 's3_key': 'coverage/file1.json'},
@@ -1213,11 +1588,15 @@ class TestCombineCoverageFiles:
         assert len(result.errors) == 0
         
         # Verify all steps were called
-        mock_download.assert_called_once_with('test-bucket', 'coverage/', None)
+        mock_download.assert_called_once_with('test-bucket', 'coverage/', None,
+                                              download_dir='/tmp/coverage_download_test')
         mock_validate.assert_called_once_with(downloaded_files)
         mock_merge.assert_called_once_with(valid_files)
         mock_upload.assert_called_once()
-        mock_cleanup.assert_called_once_with(downloaded_files)
+        
+        # Downloads are removed with the directory when the context exits
+        mock_temp_dir.return_value.__enter__.assert_called_once()
+        mock_temp_dir.return_value.__exit__.assert_called_once()
     
     @patch('layer.python.coverage_wrapper.combiner.download_coverage_files')
     def test_combine_coverage_files_no_files_found(self, mock_download):
@@ -1231,6 +1610,12 @@ class TestCombineCoverageFiles:
         assert result.success is False
         assert result.files_processed == 0
         assert "No coverage files found" in result.errors[0]
+        
+        # Early-exit results never share state with each other
+        result.errors.append('mutated')
+        assert combine_coverage_files('test-bucket', 'coverage/').errors == [
+            "No coverage files found in the specified S3 location"
+        ]
     
     @patch('layer.python.coverage_wrapper.combiner.download_coverage_files')
     @patch('layer.python.coverage_wrapper.combiner.validate_coverage_files_integrity')
@@ -1345,6 +1730,31 @@ class TestCoverageCombinerHandler:
         assert response['success'] is False
         assert "max_files must be a positive integer" in response['errors'][0]
     
+    def test_coverage_combiner_handler_invalid_prefix(self):
+        """Test handler with a non-string prefix."""
+        from layer.python.coverage_wrapper.combiner import coverage_combiner_handler
+        
+        response = coverage_combiner_handler({'bucket_name': 'test-bucket', 'prefix': 123}, MagicMock())
+        
+        assert response['success'] is False
+        assert "prefix must be a string" in response['errors'][0]
+    
+    @pytest.mark.parametrize("event, error", [
+        ({'bucket_name': ''}, "bucket_name is required in event"),
+        ({'bucket_name': 123}, "bucket_name is required in event"),
+        ({'bucket_name': 'test-bucket', 'output_key': 123}, "output_key must be a string"),
+        ({'bucket_name': 'test-bucket', 'max_files': 0}, "max_files must be a positive integer"),
+        ({'bucket_name': 'test-bucket', 'max_files': 5.0}, "max_files must be a positive integer"),
+        ({'bucket_name': 'test-bucket', 'max_files': True}, "max_files must be a positive integer"),
+        ({'bucket_name': 'test-bucket', 'max_files': '5'}, "max_files must be a positive integer"),
+    ])
+    def test_parse_combiner_event_rejects_invalid_values(self, event, error):
+        """Test that each invalid event parameter is reported with its own message."""
+        from layer.python.coverage_wrapper.combiner import _parse_combiner_event
+        
+        with pytest.raises(ValueError, match=error):
+            _parse_combiner_event(event)
+    
     @patch('layer.python.coverage_wrapper.combiner.combine_coverage_files')
     def test_coverage_combiner_handler_with_defaults(self, mock_combine):
         """Test handler with default parameters."""
@@ -1400,17 +1810,19 @@ class TestCombinerFullIntegration:
     """Full integration tests for the complete combiner workflow."""
     
     @patch('boto3.client')
+    @patch('coverage.CoverageData')
     @patch('coverage.Coverage')
     @patch('tempfile.NamedTemporaryFile')
     @patch('tempfile.TemporaryDirectory')
-    def test_full_combiner_workflow(self, mock_temp_dir, mock_temp_file, mock_coverage_class, mock_boto3_client):
+    def test_full_combiner_workflow(self, mock_temp_dir, mock_temp_file, mock_coverage_class,
+                                    mock_coverage_data_class, mock_boto3_client):
         """Test the complete end-to-end combiner workflow."""
         # Mock S3 client
         mock_s3_client = MagicMock()
         mock_boto3_client.return_value = mock_s3_client
         
         # Mock S3 list response
-        mock_s3_client.list_objects_v2.return_value = {
+        mock_s3_client.get_paginator.return_value.paginate.return_value = iter([{
             'Contents': [
                 {
                     'Key': 'coverage/coverage-func1-id1.json',
@@ -1422,23 +1834,16 @@ class TestCombinerFullIntegration:
                     'Size': 2048,
                     'LastModified': datetime(2024, 1, 15, 11, 0, 0)
                 }
-            ],
-            'IsTruncated': False
-        }
+            ]
+        }])
         
         # Mock temporary directory and files
         mock_temp_dir.return_value.__enter__.return_value = '/tmp/coverage_merge_test'
         
-        # Mock downloaded files
-        mock_temp_download1 = MagicMock()
-        mock_temp_download1.name = '/tmp/coverage_download1.json'
-        mock_temp_download2 = MagicMock()
-        mock_temp_download2.name = '/tmp/coverage_download2.json'
-        
-        # Mock combined file
+        # Mock combined file (downloads are written straight into a temp directory)
         mock_temp_combined = MagicMock()
         mock_temp_combined.name = '/tmp/combined_coverage.json'
-        mock_temp_file.side_effect = [mock_temp_download1, mock_temp_download2, mock_temp_combined]
+        mock_temp_file.return_value = mock_temp_combined
         
         # Mock coverage instance
         mock_coverage = MagicMock()
@@ -1457,10 +1862,15 @@ class TestCombinerFullIntegration:
             }
         }
         
+        # ijson streams the combined report through readinto rather than read
+        combined_bytes = json.dumps(combined_data).encode('utf-8')
+        mock_file = mock_open(read_data=combined_bytes)
+        mock_file.return_value.readinto.side_effect = io.BytesIO(combined_bytes).readinto
+        
         with patch('os.path.exists', return_value=True), \
              patch('layer.python.coverage_wrapper.combiner._validate_coverage_file', return_value=True), \
              patch('layer.python.coverage_wrapper.combiner._perform_advanced_validation', return_value={'valid': True}), \
-             patch('builtins.open', mock_open(read_data=json.dumps(combined_data))), \
+             patch('builtins.open', mock_file), \
              patch('os.path.getsize', return_value=3072), \
              patch('os.unlink'):
             
@@ -1482,10 +1892,10 @@ class TestCombinerFullIntegration:
             assert len(result.errors) == 0
             
             # Verify S3 operations
-            mock_s3_client.list_objects_v2.assert_called_once()
+            mock_s3_client.get_paginator.return_value.paginate.assert_called_once()
             mock_s3_client.download_fileobj.assert_called()  # Called for each file
             mock_s3_client.upload_fileobj.assert_called_once()  # Called for combined report
             
             # Verify coverage operations
-            mock_coverage.combine.assert_called_once()
+            assert mock_coverage_data_class.return_value.update.call_count == 2
             mock_coverage.json_report.assert_called_once()
\ No newline at end of file
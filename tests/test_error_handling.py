@@ -6,10 +6,11 @@ error handlers, fallback mechanisms, and timeout protection.
 """
 
 import os
-import tempfile
+import json
 import time
-import unittest
-from unittest.mock import patch, MagicMock, mock_open
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch, mock_open
 from contextlib import contextmanager
 
 from layer.python.coverage_wrapper.error_handling import (
@@ -27,35 +28,23 @@ from layer.python.coverage_wrapper.error_handling import (
 )
 
 
-class TestCustomExceptions(unittest.TestCase):
+class TestCustomExceptions:
     """Test custom exception classes."""
     
-    def test_coverage_error(self):
-        """Test CoverageError exception."""
-        error = CoverageError("Test error")
-        self.assertIsInstance(error, Exception)
-        self.assertEqual(str(error), "Test error")
-    
-    def test_coverage_initialization_error(self):
-        """Test CoverageInitializationError exception."""
-        error = CoverageInitializationError("Init error")
-        self.assertIsInstance(error, CoverageError)
-        self.assertEqual(str(error), "Init error")
-    
-    def test_s3_upload_error(self):
-        """Test S3UploadError exception."""
-        error = S3UploadError("Upload error")
-        self.assertIsInstance(error, CoverageError)
-        self.assertEqual(str(error), "Upload error")
-    
-    def test_timeout_error(self):
-        """Test TimeoutError exception."""
-        error = TimeoutError("Timeout error")
-        self.assertIsInstance(error, CoverageError)
-        self.assertEqual(str(error), "Timeout error")
+    @pytest.mark.parametrize('exception_class, base_class, message', [
+        (CoverageError, Exception, "Test error"),
+        (CoverageInitializationError, CoverageError, "Init error"),
+        (S3UploadError, CoverageError, "Upload error"),
+        (TimeoutError, CoverageError, "Timeout error"),
+    ])
+    def test_exception_hierarchy(self, exception_class, base_class, message):
+        """Test that each custom exception subclasses its base and keeps its message."""
+        error = exception_class(message)
+        assert isinstance(error, base_class)
+        assert str(error) == message
 
 
-class TestGracefulErrorHandler(unittest.TestCase):
+class TestGracefulErrorHandler:
     """Test the GracefulErrorHandler class."""
     
     def test_successful_operation(self):
@@ -64,8 +53,8 @@ class TestGracefulErrorHandler(unittest.TestCase):
             # Simulate successful operation
             pass
         
-        self.assertFalse(handler.error_occurred)
-        self.assertIsNone(handler.error_details)
+        assert not handler.error_occurred
+        assert handler.error_details is None
     
     def test_non_critical_error_suppression(self):
         """Test that non-critical errors are suppressed."""
@@ -73,199 +62,217 @@ class TestGracefulErrorHandler(unittest.TestCase):
             raise ValueError("Test error")
         
         # Should not raise exception due to graceful handling
-        self.assertTrue(handler.error_occurred)
-        self.assertIsNotNone(handler.error_details)
-        self.assertEqual(handler.error_details['type'], 'ValueError')
-        self.assertEqual(handler.error_details['message'], 'Test error')
+        assert handler.error_occurred
+        assert handler.error_details is not None
+        assert handler.error_details['type'] == 'ValueError'
+        assert handler.error_details['message'] == 'Test error'
     
     def test_critical_error_propagation(self):
         """Test that critical errors are propagated."""
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             with GracefulErrorHandler("test_operation", critical=True) as handler:
                 raise ValueError("Critical error")
         
         # Error should still be recorded
-        self.assertTrue(handler.error_occurred)
-        self.assertIsNotNone(handler.error_details)
+        assert handler.error_occurred
+        assert handler.error_details is not None
+
+
+# Decorated once at import rather than inside every test
+@graceful_operation("test_op", critical=False)
+def _successful_operation():
+    return "success"
+
+
+@graceful_operation("test_op", critical=False)
+def _failing_operation():
+    raise ValueError("Test error")
+
+
+@graceful_operation("test_op", critical=True)
+def _failing_critical_operation():
+    raise ValueError("Critical error")
 
 
-class TestGracefulOperationDecorator(unittest.TestCase):
+class TestGracefulOperationDecorator:
     """Test the graceful_operation decorator."""
     
     def test_successful_function(self):
         """Test decorator with successful function."""
-        @graceful_operation("test_op", critical=False)
-        def test_function():
-            return "success"
-        
-        result = test_function()
-        self.assertEqual(result, "success")
+        result = _successful_operation()
+        assert result == "success"
     
     def test_non_critical_function_error(self):
         """Test decorator with non-critical function error."""
-        @graceful_operation("test_op", critical=False)
-        def test_function():
-            raise ValueError("Test error")
-        
-        result = test_function()
-        self.assertIsNone(result)  # Should return None due to graceful handling
+        result = _failing_operation()
+        assert result is None  # Should return None due to graceful handling
     
     def test_critical_function_error(self):
         """Test decorator with critical function error."""
-        @graceful_operation("test_op", critical=True)
-        def test_function():
-            raise ValueError("Critical error")
-        
-        with self.assertRaises(ValueError):
-            test_function()
+        with pytest.raises(ValueError):
+            _failing_critical_operation()
 
 
-class TestTimeoutProtection(unittest.TestCase):
+class TestTimeoutProtection:
     """Test the timeout_protection context manager."""
     
-    def test_operation_within_timeout(self):
+    @patch('layer.python.coverage_wrapper.error_handling._now', side_effect=[0.0, 0.1])
+    def test_operation_within_timeout(self, mock_now):
         """Test operation that completes within timeout."""
         with timeout_protection(1.0, "test_operation"):
-            time.sleep(0.1)  # Short operation
+            pass  # Clock advances 0.1s
         
         # Should complete without raising exception
+        assert mock_now.call_count == 2
     
-    def test_operation_exceeds_timeout(self):
+    @patch('layer.python.coverage_wrapper.error_handling._now', side_effect=[0.0, 0.2])
+    def test_operation_exceeds_timeout(self, mock_now):
         """Test operation that exceeds timeout."""
-        with self.assertRaises(TimeoutError):
+        with pytest.raises(TimeoutError):
             with timeout_protection(0.1, "test_operation"):
-                time.sleep(0.2)  # Long operation
+                pass  # Clock advances 0.2s
     
-    def test_operation_with_exception(self):
+    @patch('layer.python.coverage_wrapper.error_handling._now', side_effect=[0.0, 0.05])
+    def test_operation_with_exception(self, mock_now):
         """Test operation that raises exception within timeout."""
-        with self.assertRaises(ValueError):
+        with pytest.raises(ValueError):
             with timeout_protection(1.0, "test_operation"):
                 raise ValueError("Test error")
 
 
-class TestFallbackStorage(unittest.TestCase):
+# Fixed metadata timestamp so stored metadata is identical across runs
+FIXED_TS = 1_700_000_000.0
+
+
+@pytest.fixture
+def fallback_storage(tmp_path):
+    """FallbackStorage rooted in a fresh per-test directory under tmp_path."""
+    return FallbackStorage(str(tmp_path / "fallback"))
+
+
+@pytest.fixture
+def source_file(tmp_path):
+    """Coverage file to store, kept outside the fallback directory."""
+    path = tmp_path / "source.json"
+    path.write_text('{"test": "data"}')
+    return str(path)
+
+
+class TestFallbackStorage:
     """Test the FallbackStorage class."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.fallback_storage = FallbackStorage(self.temp_dir)
-    
-    def tearDown(self):
-        """Clean up test fixtures."""
-        import shutil
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
-    
-    def test_directory_creation(self):
+    def test_directory_creation(self, fallback_storage):
         """Test that fallback directory is created."""
-        self.assertTrue(os.path.exists(self.temp_dir))
-        self.assertTrue(os.path.isdir(self.temp_dir))
+        assert os.path.exists(fallback_storage.base_path)
+        assert os.path.isdir(fallback_storage.base_path)
     
-    def test_store_coverage_file(self):
+    def test_store_coverage_file(self, fallback_storage, source_file):
         """Test storing a coverage file."""
-        # Create a temporary source file
-        source_file = os.path.join(self.temp_dir, "source.json")
-        with open(source_file, 'w') as f:
-            f.write('{"test": "data"}')
-        
         # Store the file
-        metadata = {"function": "test_function", "timestamp": time.time()}
-        stored_path = self.fallback_storage.store_coverage_file(source_file, metadata)
+        metadata = {"function": "test_function", "timestamp": FIXED_TS}
+        stored_path = fallback_storage.store_coverage_file(source_file, metadata)
         
         # Verify file was stored
-        self.assertTrue(os.path.exists(stored_path))
-        self.assertIn("coverage-", os.path.basename(stored_path))
+        assert os.path.exists(stored_path)
+        assert "coverage-" in os.path.basename(stored_path)
         
-        # Verify metadata file was created
+        # Verify metadata file was created with the given content
         metadata_path = stored_path + '.metadata'
-        self.assertTrue(os.path.exists(metadata_path))
+        with open(metadata_path) as f:
+            assert json.load(f) == metadata
     
-    def test_list_stored_files(self):
+    def test_list_stored_files(self, fallback_storage, source_file):
         """Test listing stored files."""
         # Store a test file
-        source_file = os.path.join(self.temp_dir, "source.json")
-        with open(source_file, 'w') as f:
-            f.write('{"test": "data"}')
-        
-        stored_path = self.fallback_storage.store_coverage_file(source_file)
+        stored_path = fallback_storage.store_coverage_file(source_file)
         
         # List files
-        files = self.fallback_storage.list_stored_files()
+        files = fallback_storage.list_stored_files()
         
-        self.assertEqual(len(files), 1)
-        self.assertEqual(files[0]['path'], stored_path)
-        self.assertGreater(files[0]['size'], 0)
+        assert len(files) == 1
+        assert files[0]['path'] == stored_path
+        assert files[0]['size'] > 0
     
-    def test_cleanup_old_files(self):
-        """Test cleanup of old files."""
-        # Create an old file by modifying its timestamp
-        source_file = os.path.join(self.temp_dir, "source.json")
-        with open(source_file, 'w') as f:
-            f.write('{"test": "data"}')
+    def test_cleanup_old_files_relative_to_now(self, fallback_storage, source_file):
+        """Test that files older than max_age_hours relative to now are removed."""
+        stored_path = fallback_storage.store_coverage_file(source_file, {"function": "test_function"})
+        
+        # Keep the file when evaluated an hour from now
+        fallback_storage.cleanup_old_files(max_age_hours=24, now=time.time() + 3600)
+        assert os.path.exists(stored_path)
         
-        stored_path = self.fallback_storage.store_coverage_file(source_file)
+        # Remove it, with its metadata, once it is 26 hours old
+        fallback_storage.cleanup_old_files(max_age_hours=24, now=time.time() + 26 * 3600)
+        assert not os.path.exists(stored_path)
+        assert not os.path.exists(stored_path + '.metadata')
+    
+    def test_cleanup_old_files(self, fallback_storage, source_file):
+        """Test cleanup of old files using a real file modification time."""
+        # Create an old file by modifying its timestamp
+        stored_path = fallback_storage.store_coverage_file(source_file)
         
         # Make the file appear old
         old_time = time.time() - (25 * 3600)  # 25 hours ago
         os.utime(stored_path, (old_time, old_time))
         
         # Cleanup files older than 24 hours
-        self.fallback_storage.cleanup_old_files(max_age_hours=24)
+        fallback_storage.cleanup_old_files(max_age_hours=24)
         
         # File should be removed
-        self.assertFalse(os.path.exists(stored_path))
+        assert not os.path.exists(stored_path)
 
 
-class TestLambdaTimeUtilities(unittest.TestCase):
+def _make_ctx(ms=None, exc=None):
+    """
+    Build a lightweight Lambda context stand-in.
+    
+    With neither argument the context has no get_remaining_time_in_millis
+    method; with exc the method raises it.
+    """
+    if exc is not None:
+        def _raise():
+            raise exc
+        return SimpleNamespace(get_remaining_time_in_millis=_raise)
+    if ms is None:
+        return SimpleNamespace()
+    return SimpleNamespace(get_remaining_time_in_millis=lambda: ms)
+
+
+class TestLambdaTimeUtilities:
     """Test Lambda time-related utility functions."""
     
     def test_get_remaining_lambda_time_with_context(self):
         """Test getting remaining time with valid context."""
-        mock_context = MagicMock()
-        mock_context.get_remaining_time_in_millis.return_value = 30000
+        remaining_time = get_remaining_lambda_time(_make_ctx(ms=30000))
         
-        remaining_time = get_remaining_lambda_time(mock_context)
-        
-        self.assertEqual(remaining_time, 30.0)
+        assert remaining_time == 30.0
     
     def test_get_remaining_lambda_time_without_method(self):
         """Test getting remaining time with context missing method."""
-        mock_context = MagicMock()
-        del mock_context.get_remaining_time_in_millis
-        
-        remaining_time = get_remaining_lambda_time(mock_context)
+        remaining_time = get_remaining_lambda_time(_make_ctx())
         
-        self.assertEqual(remaining_time, 0.0)
+        assert remaining_time == 0.0
     
     def test_get_remaining_lambda_time_with_exception(self):
         """Test getting remaining time when method raises exception."""
-        mock_context = MagicMock()
-        mock_context.get_remaining_time_in_millis.side_effect = Exception("Test error")
+        remaining_time = get_remaining_lambda_time(_make_ctx(exc=Exception("Test error")))
         
-        remaining_time = get_remaining_lambda_time(mock_context)
-        
-        self.assertEqual(remaining_time, 0.0)
+        assert remaining_time == 0.0
     
     def test_ensure_lambda_completion_time_sufficient(self):
         """Test ensuring completion time when sufficient time remains."""
-        mock_context = MagicMock()
-        mock_context.get_remaining_time_in_millis.return_value = 10000  # 10 seconds
-        
-        result = ensure_lambda_completion_time(mock_context, min_buffer_seconds=5.0)
+        result = ensure_lambda_completion_time(_make_ctx(ms=10000), min_buffer_seconds=5.0)  # 10 seconds
         
-        self.assertTrue(result)
+        assert result
     
     def test_ensure_lambda_completion_time_insufficient(self):
         """Test ensuring completion time when insufficient time remains."""
-        mock_context = MagicMock()
-        mock_context.get_remaining_time_in_millis.return_value = 3000  # 3 seconds
+        result = ensure_lambda_completion_time(_make_ctx(ms=3000), min_buffer_seconds=5.0)  # 3 seconds
         
-        result = ensure_lambda_completion_time(mock_context, min_buffer_seconds=5.0)
-        
-        self.assertFalse(result)
+        assert not result
 
 
-class TestGlobalFallbackStorage(unittest.TestCase):
+class TestGlobalFallbackStorage:
     """Test the global fallback storage functionality."""
     
     def test_get_fallback_storage_singleton(self):
@@ -273,9 +280,6 @@ class TestGlobalFallbackStorage(unittest.TestCase):
         storage1 = get_fallback_storage()
         storage2 = get_fallback_storage()
         
-        self.assertIs(storage1, storage2)
-        self.assertIsInstance(storage1, FallbackStorage)
-
+        assert storage1 is storage2
+        assert isinstance(storage1, FallbackStorage)
 
-if __name__ == '__main__':
-    unittest.main()
\ No newline at end of file
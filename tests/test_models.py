@@ -3,9 +3,9 @@ Unit tests for data models.
 """
 
 import os
+import dataclasses
 import pytest
 from datetime import datetime
-from unittest.mock import patch
 
 from layer.python.coverage_wrapper.models import (
     CoverageConfig,
@@ -15,12 +15,18 @@ from layer.python.coverage_wrapper.models import (
 )
 
 
+@pytest.fixture(scope="module")
+def base_config():
+    """Default CoverageConfig built once; tests derive variants with dataclasses.replace."""
+    return CoverageConfig(s3_bucket="test-bucket")
+
+
 class TestCoverageConfig:
     """Test cases for CoverageConfig data model."""
     
-    def test_default_values(self):
+    def test_default_values(self, base_config):
         """Test CoverageConfig with default values."""
-        config = CoverageConfig(s3_bucket="test-bucket")
+        config = base_config
         
         assert config.s3_bucket == "test-bucket"
         assert config.s3_prefix == "coverage/"
@@ -29,9 +35,10 @@ class TestCoverageConfig:
         assert config.exclude_patterns is None
         assert config.branch_coverage is True
     
-    def test_custom_values(self):
+    def test_custom_values(self, base_config):
         """Test CoverageConfig with custom values."""
-        config = CoverageConfig(
+        config = dataclasses.replace(
+            base_config,
             s3_bucket="custom-bucket",
             s3_prefix="custom/prefix/",
             upload_timeout=60,
@@ -47,63 +54,91 @@ class TestCoverageConfig:
         assert config.exclude_patterns == ["test_*.py"]
         assert config.branch_coverage is False
     
-    @patch.dict(os.environ, {
-        'COVERAGE_S3_BUCKET': 'env-bucket',
-        'COVERAGE_S3_PREFIX': 'env/prefix/',
-        'COVERAGE_UPLOAD_TIMEOUT': '45',
-        'COVERAGE_INCLUDE_PATTERNS': '*.py,*.pyx',
-        'COVERAGE_EXCLUDE_PATTERNS': 'test_*.py,*_test.py',
-        'COVERAGE_BRANCH_COVERAGE': 'false'
-    })
-    def test_from_environment(self):
-        """Test creating config from environment variables."""
-        config = CoverageConfig.from_environment()
+    @pytest.fixture
+    def coverage_env(self, monkeypatch):
+        """Clear COVERAGE_* variables and return a setter for the test's own values."""
+        for name in list(os.environ):
+            if name.startswith('COVERAGE_'):
+                monkeypatch.delenv(name)
         
-        assert config.s3_bucket == "env-bucket"
-        assert config.s3_prefix == "env/prefix/"
-        assert config.upload_timeout == 45
-        assert config.include_patterns == ["*.py", "*.pyx"]
-        assert config.exclude_patterns == ["test_*.py", "*_test.py"]
-        assert config.branch_coverage is False
+        def set_env(env):
+            for name, value in env.items():
+                monkeypatch.setenv(name, value)
+        return set_env
+    
+    @pytest.mark.parametrize('env, expected', [
+        pytest.param(
+            {
+                'COVERAGE_S3_BUCKET': 'env-bucket',
+                'COVERAGE_S3_PREFIX': 'env/prefix/',
+                'COVERAGE_UPLOAD_TIMEOUT': '45',
+                'COVERAGE_INCLUDE_PATTERNS': '*.py,*.pyx',
+                'COVERAGE_EXCLUDE_PATTERNS': 'test_*.py,*_test.py',
+                'COVERAGE_BRANCH_COVERAGE': 'false'
+            },
+            {
+                's3_bucket': "env-bucket",
+                's3_prefix': "env/prefix/",
+                'upload_timeout': 45,
+                'include_patterns': ["*.py", "*.pyx"],
+                'exclude_patterns': ["test_*.py", "*_test.py"],
+                'branch_coverage': False
+            },
+            id='custom'
+        ),
+        pytest.param(
+            {'COVERAGE_S3_BUCKET': 'test-bucket'},
+            {
+                's3_bucket': "test-bucket",
+                's3_prefix': "coverage/",
+                'upload_timeout': 30,
+                'include_patterns': None,
+                'exclude_patterns': None,
+                'branch_coverage': True
+            },
+            id='defaults'
+        ),
+    ])
+    def test_from_mapping(self, env, expected):
+        """Test creating config from a mapping of COVERAGE_* variables."""
+        config = CoverageConfig.from_mapping(env)
+        
+        for name, value in expected.items():
+            assert getattr(config, name) == value
     
-    @patch.dict(os.environ, {}, clear=True)
-    def test_from_environment_missing_bucket(self):
+    def test_from_mapping_missing_bucket(self):
         """Test error when S3 bucket is not provided."""
         with pytest.raises(ValueError, match="COVERAGE_S3_BUCKET environment variable is required"):
-            CoverageConfig.from_environment()
+            CoverageConfig.from_mapping({})
     
-    @patch.dict(os.environ, {'COVERAGE_S3_BUCKET': 'test-bucket'})
-    def test_from_environment_defaults(self):
-        """Test environment config with default values."""
+    def test_from_environment(self, coverage_env):
+        """Test that from_environment reads os.environ."""
+        coverage_env({'COVERAGE_S3_BUCKET': 'env-bucket', 'COVERAGE_UPLOAD_TIMEOUT': '45'})
         config = CoverageConfig.from_environment()
         
-        assert config.s3_bucket == "test-bucket"
+        assert config.s3_bucket == "env-bucket"
+        assert config.upload_timeout == 45
         assert config.s3_prefix == "coverage/"
-        assert config.upload_timeout == 30
-        assert config.include_patterns is None
-        assert config.exclude_patterns is None
-        assert config.branch_coverage is True
     
-    def test_validate_success(self):
+    def test_validate_success(self, base_config):
         """Test successful validation."""
-        config = CoverageConfig(s3_bucket="test-bucket")
+        # validate() normalizes in place, so work on a copy of the shared config
+        config = dataclasses.replace(base_config)
         config.validate()  # Should not raise
     
-    def test_validate_empty_bucket(self):
-        """Test validation with empty bucket name."""
-        config = CoverageConfig(s3_bucket="")
-        with pytest.raises(ValueError, match="s3_bucket cannot be empty"):
-            config.validate()
-    
-    def test_validate_negative_timeout(self):
-        """Test validation with negative timeout."""
-        config = CoverageConfig(s3_bucket="test-bucket", upload_timeout=-1)
-        with pytest.raises(ValueError, match="upload_timeout must be positive"):
+    @pytest.mark.parametrize('changes, message', [
+        pytest.param({'s3_bucket': ""}, "s3_bucket cannot be empty", id='empty-bucket'),
+        pytest.param({'upload_timeout': -1}, "upload_timeout must be positive", id='negative-timeout'),
+    ])
+    def test_validate_invalid(self, base_config, changes, message):
+        """Test validation errors for invalid settings."""
+        config = dataclasses.replace(base_config, **changes)
+        with pytest.raises(ValueError, match=message):
             config.validate()
     
-    def test_validate_adds_trailing_slash(self):
+    def test_validate_adds_trailing_slash(self, base_config):
         """Test validation adds trailing slash to prefix."""
-        config = CoverageConfig(s3_bucket="test-bucket", s3_prefix="coverage")
+        config = dataclasses.replace(base_config, s3_prefix="coverage")
         config.validate()
         assert config.s3_prefix == "coverage/"
 
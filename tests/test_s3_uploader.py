@@ -3,16 +3,20 @@ Unit tests for S3 uploader utilities.
 """
 
 import os
+import tarfile
 import pytest
 from datetime import datetime
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import ANY, patch, MagicMock
 
 from layer.python.coverage_wrapper.s3_uploader import (
     get_s3_config,
     generate_s3_key,
+    upload_coverage_file,
     _sanitize_s3_key_component
 )
 from layer.python.coverage_wrapper.models import CoverageConfig
+from layer.python.coverage_wrapper.error_handling import S3UploadError
 
 
 class TestGetS3Config:
@@ -32,6 +36,16 @@ class TestGetS3Config:
         assert config.s3_prefix == 'test/prefix/'
         assert config.upload_timeout == 45
     
+    @patch.dict(os.environ, {'COVERAGE_S3_BUCKET': 'test-bucket'})
+    def test_get_s3_config_is_cached(self):
+        """Test that the parsed configuration is reused until the cache is cleared."""
+        config = get_s3_config()
+        
+        assert get_s3_config() is config
+        
+        get_s3_config.cache_clear()
+        assert get_s3_config() is not config
+    
     @patch.dict(os.environ, {}, clear=True)
     def test_get_s3_config_missing_bucket(self):
         """Test error when required S3 bucket is missing."""
@@ -87,6 +101,20 @@ class TestGenerateS3Key:
             assert key.startswith('coverage/')
             assert key.endswith('.coverage')
     
+    def test_generate_s3_key_reads_lambda_environment_once(self, monkeypatch):
+        """Test that the Lambda name and stream are read once until the cache is cleared."""
+        from layer.python.coverage_wrapper.s3_uploader import _lambda_environment
+        
+        monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'first-function')
+        monkeypatch.setenv('AWS_LAMBDA_LOG_STREAM_NAME', 'first-stream')
+        assert '/first-function/' in generate_s3_key()
+        
+        monkeypatch.setenv('AWS_LAMBDA_FUNCTION_NAME', 'second-function')
+        assert '/first-function/' in generate_s3_key()
+        
+        _lambda_environment.cache_clear()
+        assert '/second-function/' in generate_s3_key()
+    
     def test_generate_s3_key_no_function_name(self):
         """Test error when function name cannot be determined."""
         with patch.dict(os.environ, {}, clear=True):
@@ -125,6 +153,16 @@ class TestGenerateS3Key:
         # Should start directly with function name
         assert key.startswith("test-function/")
     
+    def test_generate_s3_key_none_prefix(self):
+        """Test that a None prefix falls back to the default prefix."""
+        key = generate_s3_key(
+            function_name="test-function",
+            execution_id="exec-123",
+            prefix=None
+        )
+        
+        assert key.startswith("coverage/test-function/")
+    
     def test_generate_s3_key_special_characters(self):
         """Test S3 key generation with special characters in names."""
         key = generate_s3_key(
@@ -190,225 +228,365 @@ class TestSanitizeS3KeyComponent:
         """Test sanitizing string with unicode characters."""
         result = _sanitize_s3_key_component("test-función-λ")
         assert result == "test-funci_n-"
+    
+    @pytest.mark.parametrize('component, expected', [
+        pytest.param("fn\U0001F600name", "fn_name", id='astral-plane'),
+        pytest.param("cafe\u0301-fn", "cafe_-fn", id='combining-mark'),
+        pytest.param("fn\udcffname", "fn_name", id='lone-surrogate'),
+        pytest.param("what?", "what", id='ascii-question-mark'),
+    ])
+    def test_sanitize_replaces_each_non_ascii_character_once(self, component, expected):
+        """Test that every non-ASCII code point becomes exactly one underscore."""
+        assert _sanitize_s3_key_component(component) == expected
 
 
 class TestUploadCoverageFile:
     """Test cases for upload_coverage_file function."""
     
-    @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
-    @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_success(self, mock_exists, mock_generate_key, mock_get_config, mock_boto3_client):
+    GENERATED_KEY = "coverage/test-function/20240115_103045_123_exec-123.coverage"
+    
+    @pytest.fixture
+    def coverage_file(self, tmp_path):
+        """Small coverage file on disk, below the single-request upload threshold."""
+        path = tmp_path / "coverage.json"
+        path.write_text('{"test": "data"}')
+        return str(path)
+    
+    @pytest.fixture
+    def s3_mocks(self):
+        """Patch the S3 client, config loading, key generation, retry sleeps and logging in one place."""
+        with patch('boto3.client') as boto_client, \
+                patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config') as get_config, \
+                patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key') as generate_key, \
+                patch('time.sleep') as sleep, \
+                patch('layer.python.coverage_wrapper.s3_uploader.logger') as logger:
+            get_config.return_value = CoverageConfig(s3_bucket="test-bucket", s3_prefix="coverage/")
+            generate_key.return_value = self.GENERATED_KEY
+            yield SimpleNamespace(
+                boto_client=boto_client,
+                client=boto_client.return_value,
+                get_config=get_config,
+                generate_key=generate_key,
+                sleep=sleep,
+                logger=logger
+            )
+    
+    @staticmethod
+    def _assert_put_object(mock_s3_client, coverage_file, bucket, key):
+        """Assert one PutObject request streamed coverage_file to bucket/key."""
+        mock_s3_client.put_object.assert_called_once()
+        mock_s3_client.upload_file.assert_not_called()
+        kwargs = mock_s3_client.put_object.call_args.kwargs
+        assert kwargs['Body'].name == coverage_file
+        assert {k: v for k, v in kwargs.items() if k != 'Body'} == {
+            'Bucket': bucket,
+            'Key': key,
+            'ServerSideEncryption': 'AES256',
+            'ContentType': 'application/octet-stream'
+        }
+    
+    @staticmethod
+    def _graceful_failure(logger):
+        """Return the error details upload_coverage_file logged when it gave up without raising."""
+        logger.warning.assert_called_with("S3 upload failed gracefully", error_details=ANY)
+        return logger.warning.call_args.kwargs['error_details']
+    
+    def test_upload_coverage_file_success(self, s3_mocks, coverage_file):
         """Test successful coverage file upload."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
+        # Execute
+        result = upload_coverage_file(coverage_file)
         
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_generate_key.return_value = "coverage/test-function/20240115_103045_123_exec-123.coverage"
-        mock_config = CoverageConfig(s3_bucket="test-bucket", s3_prefix="coverage/")
-        mock_get_config.return_value = mock_config
+        # Verify
+        assert result == self.GENERATED_KEY
+        self._assert_put_object(s3_mocks.client, coverage_file, "test-bucket", self.GENERATED_KEY)
+    
+    def test_upload_coverage_file_large_file_uses_managed_transfer(self, s3_mocks, coverage_file, monkeypatch):
+        """Test that files at or above the threshold go through upload_file."""
+        from layer.python.coverage_wrapper import s3_uploader
         
-        mock_s3_client = mock_boto3_client.return_value
-        mock_s3_client.upload_file.return_value = None
+        monkeypatch.setattr(s3_uploader, '_PUT_OBJECT_MAX_BYTES', os.path.getsize(coverage_file))
         
-        # Execute
-        result = upload_coverage_file("/path/to/coverage.json")
+        result = upload_coverage_file(coverage_file)
         
-        # Verify
-        assert result == "coverage/test-function/20240115_103045_123_exec-123.coverage"
-        mock_exists.assert_called_once_with("/path/to/coverage.json")
-        mock_s3_client.upload_file.assert_called_once_with(
-            "/path/to/coverage.json",
+        assert result == self.GENERATED_KEY
+        s3_mocks.client.put_object.assert_not_called()
+        s3_mocks.client.upload_file.assert_called_once_with(
+            coverage_file,
             "test-bucket",
-            "coverage/test-function/20240115_103045_123_exec-123.coverage",
+            self.GENERATED_KEY,
             ExtraArgs={
                 'ServerSideEncryption': 'AES256',
                 'ContentType': 'application/octet-stream'
             }
         )
     
-    @patch('os.path.exists')
-    def test_upload_coverage_file_missing_file(self, mock_exists):
-        """Test error when coverage file doesn't exist."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
+    def test_upload_coverage_file_missing_file(self, s3_mocks, tmp_path):
+        """Test that a missing coverage file is logged and nothing is uploaded."""
+        missing_path = str(tmp_path / "missing.json")
         
-        mock_exists.return_value = False
+        assert upload_coverage_file(missing_path) is None
         
-        with pytest.raises(ValueError, match="Coverage file not found"):
-            upload_coverage_file("/path/to/missing.json")
+        s3_mocks.logger.error.assert_called_once_with("Coverage file not found", file_path=missing_path)
+        details = self._graceful_failure(s3_mocks.logger)
+        assert details['type'] == 'ValueError'
+        assert details['message'].startswith("Coverage file not found")
+        s3_mocks.client.put_object.assert_not_called()
     
-    @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
-    @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_with_custom_params(self, mock_exists, mock_generate_key, mock_get_config, mock_boto3_client):
+    def test_upload_coverage_file_with_custom_params(self, s3_mocks, coverage_file):
         """Test upload with custom S3 key and config."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
-        
-        # Setup mocks
-        mock_exists.return_value = True
         custom_config = CoverageConfig(s3_bucket="custom-bucket", s3_prefix="custom/")
         
-        mock_s3_client = mock_boto3_client.return_value
-        mock_s3_client.upload_file.return_value = None
-        
         # Execute with custom parameters
         result = upload_coverage_file(
-            "/path/to/coverage.json",
+            coverage_file,
             s3_key="custom/key.coverage",
             config=custom_config
         )
         
         # Verify
         assert result == "custom/key.coverage"
-        mock_generate_key.assert_not_called()  # Should not generate key when provided
-        mock_get_config.assert_not_called()  # Should not load config when provided
-        mock_s3_client.upload_file.assert_called_once_with(
-            "/path/to/coverage.json",
-            "custom-bucket",
-            "custom/key.coverage",
-            ExtraArgs={
-                'ServerSideEncryption': 'AES256',
-                'ContentType': 'application/octet-stream'
-            }
-        )
+        s3_mocks.generate_key.assert_not_called()  # Should not generate key when provided
+        s3_mocks.get_config.assert_not_called()  # Should not load config when provided
+        self._assert_put_object(s3_mocks.client, coverage_file, "custom-bucket", "custom/key.coverage")
     
-    @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
-    @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_no_credentials(self, mock_exists, mock_generate_key, mock_get_config, mock_boto3_client):
+    def test_upload_coverage_file_reuses_s3_client(self, s3_mocks, coverage_file):
+        """Test that repeated uploads share one S3 client."""
+        upload_coverage_file(coverage_file, s3_key="coverage/first.coverage")
+        upload_coverage_file(coverage_file, s3_key="coverage/second.coverage")
+        
+        s3_mocks.boto_client.assert_called_once_with('s3')
+        assert s3_mocks.client.put_object.call_count == 2
+    
+    def test_upload_coverage_file_no_credentials(self, s3_mocks, coverage_file):
         """Test error when AWS credentials are not available."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
         from botocore.exceptions import NoCredentialsError
         
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_generate_key.return_value = "coverage/test.coverage"
-        mock_config = CoverageConfig(s3_bucket="test-bucket")
-        mock_get_config.return_value = mock_config
-        mock_boto3_client.side_effect = NoCredentialsError()
+        s3_mocks.boto_client.side_effect = NoCredentialsError()
+        
+        assert upload_coverage_file(coverage_file) is None
         
-        with pytest.raises(Exception, match="AWS credentials not available"):
-            upload_coverage_file("/path/to/coverage.json")
+        s3_mocks.logger.error.assert_called_once_with(
+            "AWS credentials not available for S3 upload",
+            error="Unable to locate credentials",
+            error_type="NoCredentialsError"
+        )
+        details = self._graceful_failure(s3_mocks.logger)
+        assert details['type'] == 'S3UploadError'
+        assert details['message'].startswith("AWS credentials not available")
     
-    @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
-    @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('time.sleep')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_retry_success(self, mock_exists, mock_sleep, mock_generate_key, mock_get_config, mock_boto3_client):
+    def test_upload_coverage_file_retry_success(self, s3_mocks, coverage_file):
         """Test successful upload after retry."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
         from botocore.exceptions import ClientError
         
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_generate_key.return_value = "coverage/test.coverage"
-        mock_config = CoverageConfig(s3_bucket="test-bucket")
-        mock_get_config.return_value = mock_config
-        
-        mock_s3_client = mock_boto3_client.return_value
         # First call fails, second succeeds
-        mock_s3_client.upload_file.side_effect = [
-            ClientError({'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service unavailable'}}, 'upload_file'),
+        s3_mocks.client.put_object.side_effect = [
+            ClientError({'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service unavailable'}}, 'put_object'),
             None
         ]
         
         # Execute
-        result = upload_coverage_file("/path/to/coverage.json")
+        result = upload_coverage_file(coverage_file)
         
         # Verify
-        assert result == "coverage/test.coverage"
-        assert mock_s3_client.upload_file.call_count == 2
-        mock_sleep.assert_called_once_with(1.0)  # First retry delay
+        assert result == self.GENERATED_KEY
+        assert s3_mocks.client.put_object.call_count == 2
+        s3_mocks.sleep.assert_called_once_with(1.0)  # First retry delay
     
-    @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
-    @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('time.sleep')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_non_retryable_error(self, mock_exists, mock_sleep, mock_generate_key, mock_get_config, mock_boto3_client):
-        """Test non-retryable error (e.g., AccessDenied)."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
+    @pytest.mark.parametrize('error_code', ['NoSuchBucket', 'AccessDenied', 'InvalidBucketName', 'InvalidAccessKeyId'])
+    def test_upload_coverage_file_non_retryable_codes(self, s3_mocks, coverage_file, error_code):
+        """Test that each non-retryable error code fails gracefully after a single attempt."""
         from botocore.exceptions import ClientError
         
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_generate_key.return_value = "coverage/test.coverage"
-        mock_config = CoverageConfig(s3_bucket="test-bucket")
-        mock_get_config.return_value = mock_config
+        s3_mocks.client.put_object.side_effect = ClientError(
+            {'Error': {'Code': error_code, 'Message': 'Not retryable'}}, 'put_object'
+        )
         
-        mock_s3_client = mock_boto3_client.return_value
-        mock_s3_client.upload_file.side_effect = ClientError(
-            {'Error': {'Code': 'AccessDenied', 'Message': 'Access denied'}}, 'upload_file'
+        result = upload_coverage_file(coverage_file)
+        
+        # The failure is handled gracefully without retrying
+        assert result is None
+        s3_mocks.client.put_object.assert_called_once()
+        s3_mocks.client.upload_file.assert_not_called()
+        s3_mocks.sleep.assert_not_called()
+        s3_mocks.logger.error.assert_called_once_with(
+            "Non-retryable S3 error encountered",
+            error_code=error_code,
+            error_message='Not retryable',
+            bucket="test-bucket"
+        )
+    
+    def test_upload_coverage_file_max_retries_exceeded(self, s3_mocks, coverage_file):
+        """Test failure after maximum retries."""
+        from botocore.exceptions import ClientError
+        
+        s3_mocks.client.put_object.side_effect = ClientError(
+            {'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service unavailable'}}, 'put_object'
         )
         
         # Execute and verify
-        with pytest.raises(Exception, match="S3 upload failed: AccessDenied"):
-            upload_coverage_file("/path/to/coverage.json")
+        assert upload_coverage_file(coverage_file) is None
+        
+        details = self._graceful_failure(s3_mocks.logger)
+        assert details['type'] == 'S3UploadError'
+        assert details['message'].startswith("S3 upload failed after 3 attempts")
         
-        # Should not retry for AccessDenied
-        assert mock_s3_client.upload_file.call_count == 1
-        mock_sleep.assert_not_called()
+        # Should retry 3 times total
+        assert s3_mocks.client.put_object.call_count == 3
+        # Should sleep twice (between retries)
+        assert s3_mocks.sleep.call_count == 2
+        s3_mocks.sleep.assert_any_call(1.0)  # First retry delay
+        s3_mocks.sleep.assert_any_call(2.0)  # Second retry delay (exponential backoff)
+
+
+class TestBatchUpload:
+    """Test cases for upload_coverage_files_batch function."""
     
+    @pytest.fixture
+    def coverage_files(self, tmp_path):
+        """Three small coverage files in separate directories."""
+        paths = []
+        for name in ('alpha', 'beta', 'gamma'):
+            directory = tmp_path / name
+            directory.mkdir()
+            path = directory / f'coverage-{name}.json'
+            path.write_text(f'{{"function": "{name}"}}')
+            paths.append(str(path))
+        return paths
+    
+    @pytest.mark.parametrize('file_count', [1, 3])
     @patch('boto3.client')
-    @patch('layer.python.coverage_wrapper.s3_uploader.get_s3_config')
     @patch('layer.python.coverage_wrapper.s3_uploader.generate_s3_key')
-    @patch('time.sleep')
-    @patch('os.path.exists')
-    def test_upload_coverage_file_max_retries_exceeded(self, mock_exists, mock_sleep, mock_generate_key, mock_get_config, mock_boto3_client):
-        """Test failure after maximum retries."""
-        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
-        from layer.python.coverage_wrapper.models import CoverageConfig
-        from botocore.exceptions import ClientError
+    def test_batch_upload_single_request(self, mock_generate_key, mock_boto3_client, coverage_files, file_count):
+        """Test that any number of files is uploaded as one gzipped tarball."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_files_batch
+        
+        mock_generate_key.return_value = "coverage/test-function/20240115_103045_123_exec-123.coverage"
+        config = CoverageConfig(s3_bucket="test-bucket", s3_prefix="coverage/")
+        
+        # Capture the archive members while the temporary file still exists
+        uploaded_members = []
+        
+        def capture_upload(Body, **kwargs):
+            with tarfile.open(fileobj=Body, mode='r:gz') as tar:
+                uploaded_members.extend(tar.getnames())
+        
+        mock_s3_client = mock_boto3_client.return_value
+        mock_s3_client.put_object.side_effect = capture_upload
         
-        # Setup mocks
-        mock_exists.return_value = True
-        mock_generate_key.return_value = "coverage/test.coverage"
-        mock_config = CoverageConfig(s3_bucket="test-bucket")
-        mock_get_config.return_value = mock_config
+        # Execute
+        result = upload_coverage_files_batch(coverage_files[:file_count], config=config)
+        
+        # Verify
+        assert result == "coverage/test-function/20240115_103045_123_exec-123.tar.gz"
+        mock_s3_client.put_object.assert_called_once()
+        kwargs = mock_s3_client.put_object.call_args.kwargs
+        assert (kwargs['Bucket'], kwargs['Key']) == ("test-bucket", result)
+        assert uploaded_members == [os.path.basename(path) for path in coverage_files[:file_count]]
+    
+    @patch('boto3.client')
+    def test_batch_upload_no_files(self, mock_boto3_client):
+        """Test that an empty batch is rejected without contacting S3."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_files_batch
+        
+        config = CoverageConfig(s3_bucket="test-bucket")
+        
+        assert upload_coverage_files_batch([], config=config) is None
+        mock_boto3_client.assert_not_called()
+    
+    @patch('boto3.client')
+    def test_batch_upload_missing_file(self, mock_boto3_client, coverage_files, tmp_path):
+        """Test that a missing input file fails the batch gracefully."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_files_batch
+        
+        config = CoverageConfig(s3_bucket="test-bucket")
+        paths = coverage_files + [str(tmp_path / 'missing.json')]
+        
+        assert upload_coverage_files_batch(paths, config=config) is None
+        mock_boto3_client.return_value.put_object.assert_not_called()
+
+
+class TestPresignedUpload:
+    """Test cases for presigned URL generation and upload."""
+    
+    @patch('boto3.client')
+    def test_generate_upload_url(self, mock_boto3_client):
+        """Test that the URL is presigned for an encrypted PUT to the configured bucket."""
+        from layer.python.coverage_wrapper.s3_uploader import generate_upload_url
         
         mock_s3_client = mock_boto3_client.return_value
-        mock_s3_client.upload_file.side_effect = ClientError(
-            {'Error': {'Code': 'ServiceUnavailable', 'Message': 'Service unavailable'}}, 'upload_file'
+        mock_s3_client.generate_presigned_url.return_value = "https://test-bucket.s3.amazonaws.com/key?sig"
+        
+        url = generate_upload_url("coverage/key.coverage", config=CoverageConfig(s3_bucket="test-bucket"), expires_in=600)
+        
+        assert url == "https://test-bucket.s3.amazonaws.com/key?sig"
+        mock_s3_client.generate_presigned_url.assert_called_once_with(
+            'put_object',
+            Params={
+                'Bucket': 'test-bucket',
+                'Key': 'coverage/key.coverage',
+                'ServerSideEncryption': 'AES256'
+            },
+            ExpiresIn=600
         )
+    
+    @patch('urllib3.PoolManager')
+    def test_upload_via_presigned_url_success(self, mock_pool_manager, tmp_path):
+        """Test that the file is PUT with its length and the signed encryption header."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_via_presigned_url
+        
+        coverage_file = tmp_path / "coverage.json"
+        coverage_file.write_text('{"test": "data"}')
+        mock_request = mock_pool_manager.return_value.request
+        mock_request.return_value.status = 200
+        
+        upload_via_presigned_url(str(coverage_file), "https://example.com/upload")
+        
+        mock_request.assert_called_once()
+        args, kwargs = mock_request.call_args
+        assert args == ('PUT', "https://example.com/upload")
+        assert kwargs['body'].name == str(coverage_file)
+        assert kwargs['headers'] == {
+            'Content-Length': str(len('{"test": "data"}')),
+            'x-amz-server-side-encryption': 'AES256'
+        }
+    
+    @patch('urllib3.PoolManager')
+    def test_upload_via_presigned_url_rejected(self, mock_pool_manager, tmp_path):
+        """Test that a non-2xx response raises S3UploadError."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_via_presigned_url
         
-        # Execute and verify
-        with pytest.raises(Exception, match="S3 upload failed after 3 attempts"):
-            upload_coverage_file("/path/to/coverage.json")
+        coverage_file = tmp_path / "coverage.json"
+        coverage_file.write_text('{"test": "data"}')
+        mock_pool_manager.return_value.request.return_value.status = 403
         
-        # Should retry 3 times total
-        assert mock_s3_client.upload_file.call_count == 3
-        # Should sleep twice (between retries)
-        assert mock_sleep.call_count == 2
-        mock_sleep.assert_any_call(1.0)  # First retry delay
-        mock_sleep.assert_any_call(2.0)  # Second retry delay (exponential backoff)
+        with pytest.raises(S3UploadError, match="HTTP 403"):
+            upload_via_presigned_url(str(coverage_file), "https://example.com/upload")
 
 
 class TestUploadCoverageFileAsync:
     """Test cases for upload_coverage_file_async function."""
     
-    @patch('threading.Thread')
-    def test_upload_coverage_file_async(self, mock_thread):
-        """Test asynchronous upload starts thread."""
+    @patch('layer.python.coverage_wrapper.s3_uploader._UPLOAD_POOL')
+    def test_upload_coverage_file_async(self, mock_pool):
+        """Test asynchronous upload is queued on the shared worker pool."""
         from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file_async
         
-        mock_thread_instance = mock_thread.return_value
-        
         # Execute
-        upload_coverage_file_async("/path/to/coverage.json")
+        future = upload_coverage_file_async("/path/to/coverage.json")
+        
+        # Verify the upload was submitted once and its future returned
+        mock_pool.submit.assert_called_once()
+        assert future is mock_pool.submit.return_value
+    
+    @patch('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file')
+    def test_upload_coverage_file_async_result(self, mock_upload):
+        """Test that the returned future resolves to the uploaded key, or None on failure."""
+        from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file_async
         
-        # Verify thread was created and started
-        mock_thread.assert_called_once()
-        mock_thread_instance.start.assert_called_once()
+        mock_upload.return_value = 'coverage/test-function/key.coverage'
+        future = upload_coverage_file_async("/path/to/coverage.json")
+        assert future.result(timeout=5) == 'coverage/test-function/key.coverage'
         
-        # Verify thread was created as daemon
-        args, kwargs = mock_thread.call_args
-        assert kwargs.get('daemon') is True
\ No newline at end of file
+        mock_upload.side_effect = S3UploadError("Upload failed")
+        future = upload_coverage_file_async("/path/to/coverage.json")
+        assert future.result(timeout=5) is None
\ No newline at end of file
@@ -5,36 +5,109 @@ Tests configuration parsing, coverage initialization, and caching mechanisms.
 """
 
 import os
+import re
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from uuid import UUID
+from unittest.mock import Mock, create_autospec, patch
 import coverage
 
+from layer.python.coverage_wrapper import wrapper as wrapper_module
 from layer.python.coverage_wrapper.wrapper import (
     get_cached_config,
     initialize_coverage,
     reset_coverage_cache,
     is_coverage_initialized,
-    _cached_config,
-    _coverage_instance
+    finalize_coverage,
+    CoverageContext,
+    coverage_handler
 )
 from layer.python.coverage_wrapper.models import CoverageConfig
+from layer.python.coverage_wrapper.s3_uploader import upload_coverage_file
 
 
+# Minimal environments shared by the tests that drive configuration through os.environ
+_BASE_ENV = {'COVERAGE_S3_BUCKET': 'test-bucket'}
+_LAMBDA_ENV = {**_BASE_ENV, 'AWS_LAMBDA_FUNCTION_NAME': 'test-func'}
+
+# Expected error messages, compiled once for pytest.raises(match=...)
+_BUCKET_RE = re.compile(r"COVERAGE_S3_BUCKET environment variable is required")
+_TIMEOUT_RE = re.compile(r"upload_timeout must be positive")
+_STOP_FAILED_RE = re.compile(r"Stop failed")
+
+
+@pytest.fixture(autouse=True)
+def reset_wrapper_cache():
+    """Start and finish every test without a cached configuration or coverage instance."""
+    reset_coverage_cache()
+    yield
+    reset_coverage_cache()
+
+
+@pytest.fixture
+def coverage_env(monkeypatch):
+    """Clear COVERAGE_* variables and return a setter for the test's own values."""
+    for name in list(os.environ):
+        if name.startswith('COVERAGE_'):
+            monkeypatch.delenv(name)
+    
+    def set_env(env):
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+    return set_env
+
+
+@pytest.fixture
+def mock_cov(monkeypatch):
+    """Replace coverage.Coverage in the wrapper with a mock class returning one started mock instance."""
+    instance = Mock(spec=coverage.Coverage, _started=True)
+    coverage_class = Mock(return_value=instance)
+    monkeypatch.setattr('layer.python.coverage_wrapper.wrapper.coverage.Coverage', coverage_class)
+    return coverage_class, instance
+
+
+@pytest.fixture
+def mock_upload(monkeypatch):
+    """Replace the S3 upload used by the wrapper with a signature-checked mock."""
+    upload = create_autospec(upload_coverage_file)
+    monkeypatch.setattr('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file', upload)
+    return upload
+
+
+@pytest.fixture
+def wrapper_logger(monkeypatch):
+    """Record what the wrapper logs, for failures it handles without raising."""
+    logger = Mock()
+    monkeypatch.setattr(wrapper_module, 'logger', logger)
+    return logger
+
+
+@pytest.fixture
+def fake_config(monkeypatch):
+    """
+    Serve a prebuilt configuration from get_cached_config.
+    
+    Tests that only need a valid configuration skip environment parsing; tests
+    that verify parsing itself keep driving it through os.environ.
+    """
+    config = CoverageConfig(s3_bucket='test-bucket')
+    monkeypatch.setattr('layer.python.coverage_wrapper.wrapper.get_cached_config', lambda: config)
+    return config
+
+
+def _inject_cov(instance):
+    """Install instance as the wrapper's active coverage without going through initialize_coverage."""
+    wrapper_module._coverage_instance = instance
+
+
+@pytest.mark.xdist_group(name="wrapper_config")
 class TestConfigurationParsing:
     """Test configuration parsing and caching."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    def test_get_cached_config_creates_new_config(self):
+    def test_get_cached_config_creates_new_config(self, coverage_env):
         """Test that get_cached_config creates new configuration from environment."""
         env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
+            **_BASE_ENV,
             'COVERAGE_S3_PREFIX': 'test-prefix/',
             'COVERAGE_UPLOAD_TIMEOUT': '60',
             'COVERAGE_INCLUDE_PATTERNS': 'src/*,lib/*',
@@ -42,235 +115,181 @@ class TestConfigurationParsing:
             'COVERAGE_BRANCH_COVERAGE': 'false'
         }
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            config = get_cached_config()
-            
-            assert config.s3_bucket == 'test-bucket'
-            assert config.s3_prefix == 'test-prefix/'
-            assert config.upload_timeout == 60
-            assert config.include_patterns == ['src/*', 'lib/*']
-            assert config.exclude_patterns == ['tests/*', '*.pyc']
-            assert config.branch_coverage is False
+        coverage_env(env_vars)
+        config = get_cached_config()
+        
+        assert config.s3_bucket == 'test-bucket'
+        assert config.s3_prefix == 'test-prefix/'
+        assert config.upload_timeout == 60
+        assert config.include_patterns == ['src/*', 'lib/*']
+        assert config.exclude_patterns == ['tests/*', '*.pyc']
+        assert config.branch_coverage is False
     
-    def test_get_cached_config_uses_defaults(self):
+    def test_get_cached_config_uses_defaults(self, coverage_env):
         """Test that get_cached_config uses default values when environment variables are not set."""
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        coverage_env(_BASE_ENV)
+        config = get_cached_config()
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            config = get_cached_config()
-            
-            assert config.s3_bucket == 'test-bucket'
-            assert config.s3_prefix == 'coverage/'
-            assert config.upload_timeout == 30
-            assert config.include_patterns is None
-            assert config.exclude_patterns is None
-            assert config.branch_coverage is True
+        assert config.s3_bucket == 'test-bucket'
+        assert config.s3_prefix == 'coverage/'
+        assert config.upload_timeout == 30
+        assert config.include_patterns is None
+        assert config.exclude_patterns is None
+        assert config.branch_coverage is True
     
-    def test_get_cached_config_caches_result(self):
+    def test_get_cached_config_caches_result(self, coverage_env):
         """Test that get_cached_config caches the configuration."""
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch.object(CoverageConfig, 'from_environment') as mock_from_env:
-                mock_config = CoverageConfig(s3_bucket='test-bucket')
-                mock_from_env.return_value = mock_config
-                
-                # First call should create config
-                config1 = get_cached_config()
-                assert mock_from_env.call_count == 1
-                
-                # Second call should use cached config
-                config2 = get_cached_config()
-                assert mock_from_env.call_count == 1
-                assert config1 is config2
+        coverage_env(_BASE_ENV)
+        with patch.object(CoverageConfig, 'from_environment') as mock_from_env:
+            mock_config = CoverageConfig(s3_bucket='test-bucket')
+            mock_from_env.return_value = mock_config
+            
+            # First call should create config
+            config1 = get_cached_config()
+            assert mock_from_env.call_count == 1
+            
+            # Second call should use cached config
+            config2 = get_cached_config()
+            assert mock_from_env.call_count == 1
+            assert config1 is config2
     
-    def test_get_cached_config_missing_bucket_raises_error(self):
+    def test_get_cached_config_missing_bucket_raises_error(self, coverage_env):
         """Test that missing S3 bucket raises ValueError."""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError, match="COVERAGE_S3_BUCKET environment variable is required"):
-                get_cached_config()
+        with pytest.raises(ValueError, match=_BUCKET_RE):
+            get_cached_config()
     
-    def test_get_cached_config_validates_configuration(self):
+    def test_get_cached_config_validates_configuration(self, coverage_env):
         """Test that configuration validation is called."""
         env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
+            **_BASE_ENV,
             'COVERAGE_UPLOAD_TIMEOUT': '-1'  # Invalid timeout
         }
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            with pytest.raises(ValueError, match="upload_timeout must be positive"):
-                get_cached_config()
+        coverage_env(env_vars)
+        with pytest.raises(ValueError, match=_TIMEOUT_RE):
+            get_cached_config()
 
 
+@pytest.mark.xdist_group(name="wrapper_initialization")
 class TestCoverageInitialization:
     """Test coverage initialization functionality."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_initialize_coverage_creates_instance(self, mock_coverage_class):
+    def test_initialize_coverage_creates_instance(self, mock_cov, fake_config):
         """Test that initialize_coverage creates and starts coverage instance."""
         # Setup mocks
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
+        mock_coverage_class, mock_coverage_instance = mock_cov
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        result = initialize_coverage()
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            result = initialize_coverage()
-            
-            # Verify coverage instance was created with correct config
-            mock_coverage_class.assert_called_once_with(
-                config_file=False,
-                branch=True,
-                source=['.']
-            )
-            
-            # Verify coverage was started
-            mock_coverage_instance.start.assert_called_once()
-            
-            # Verify correct instance returned
-            assert result is mock_coverage_instance
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_initialize_coverage_with_patterns(self, mock_coverage_class):
-        """Test coverage initialization with include/exclude patterns."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
+        # Verify coverage instance was created with correct config
+        mock_coverage_class.assert_called_once_with(
+            config_file=False,
+            branch=True,
+            source=['.'],
+            data_file=os.path.join(wrapper_module._REPORT_DIR, '.coverage')
+        )
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
-            'COVERAGE_INCLUDE_PATTERNS': 'src/*,lib/*',
-            'COVERAGE_EXCLUDE_PATTERNS': 'tests/*,*.pyc',
-            'COVERAGE_BRANCH_COVERAGE': 'false'
-        }
+        # Verify coverage was started
+        mock_coverage_instance.start.assert_called_once()
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            initialize_coverage()
-            
-            # Verify coverage instance was created with patterns
-            mock_coverage_class.assert_called_once_with(
-                config_file=False,
-                branch=False,
-                source=['.'],
-                include=['src/*', 'lib/*'],
-                omit=['tests/*', '*.pyc']
-            )
+        # Verify correct instance returned
+        assert result is mock_coverage_instance
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_initialize_coverage_caches_instance(self, mock_coverage_class):
+    def test_initialize_coverage_with_patterns(self, mock_cov, fake_config):
+        """Test coverage initialization with include/exclude patterns."""
+        mock_coverage_class, mock_coverage_instance = mock_cov
+        fake_config.include_patterns = ['src/*', 'lib/*']
+        fake_config.exclude_patterns = ['tests/*', '*.pyc']
+        fake_config.branch_coverage = False
+        
+        initialize_coverage()
+        
+        # Verify coverage instance was created with patterns
+        mock_coverage_class.assert_called_once_with(
+            config_file=False,
+            branch=False,
+            source=['.'],
+            data_file=os.path.join(wrapper_module._REPORT_DIR, '.coverage'),
+            include=['src/*', 'lib/*'],
+            omit=['tests/*', '*.pyc']
+        )
+    
+    def test_initialize_coverage_caches_instance(self, mock_cov, fake_config):
         """Test that initialize_coverage caches the coverage instance."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
+        mock_coverage_class, mock_coverage_instance = mock_cov
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        # First call should create instance
+        result1 = initialize_coverage()
+        assert mock_coverage_class.call_count == 1
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            # First call should create instance
-            result1 = initialize_coverage()
-            assert mock_coverage_class.call_count == 1
-            
-            # Second call should return cached instance
-            result2 = initialize_coverage()
-            assert mock_coverage_class.call_count == 1
-            assert result1 is result2
+        # Second call should return cached instance
+        result2 = initialize_coverage()
+        assert mock_coverage_class.call_count == 1
+        assert result1 is result2
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_initialize_coverage_handles_failure(self, mock_coverage_class):
-        """Test that initialize_coverage handles initialization failures."""
+    def test_initialize_coverage_handles_failure(self, mock_cov, fake_config, wrapper_logger):
+        """Test that initialize_coverage degrades to None when coverage cannot start."""
+        mock_coverage_class, _ = mock_cov
         mock_coverage_class.side_effect = Exception("Coverage init failed")
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        assert initialize_coverage() is None
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            with pytest.raises(Exception, match="Coverage init failed"):
-                initialize_coverage()
-            
-            # Verify cache is reset on failure
-            assert not is_coverage_initialized()
+        wrapper_logger.error.assert_called_once_with(
+            "Failed to initialize coverage", error="Coverage init failed", error_type="Exception"
+        )
+        
+        # Verify cache is reset on failure
+        assert not is_coverage_initialized()
     
-    def test_initialize_coverage_config_error_propagates(self):
-        """Test that configuration errors are propagated."""
-        with patch.dict(os.environ, {}, clear=True):
-            with pytest.raises(ValueError, match="COVERAGE_S3_BUCKET environment variable is required"):
-                initialize_coverage()
+    def test_initialize_coverage_config_error_returns_none(self, coverage_env, wrapper_logger):
+        """Test that a missing bucket is logged as critical and coverage stays off."""
+        assert initialize_coverage() is None
+        
+        wrapper_logger.critical.assert_called_once_with(
+            "Critical configuration error - S3 bucket not configured"
+        )
+        error_kwargs = wrapper_logger.error.call_args.kwargs
+        assert error_kwargs['error_type'] == 'ValueError'
+        assert _BUCKET_RE.search(error_kwargs['error'])
+        assert not is_coverage_initialized()
 
 
+@pytest.mark.xdist_group(name="wrapper_utilities")
 class TestCoverageUtilities:
     """Test utility functions for coverage management."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
     def test_is_coverage_initialized_false_when_not_initialized(self):
         """Test is_coverage_initialized returns False when coverage not initialized."""
         assert not is_coverage_initialized()
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_is_coverage_initialized_true_when_initialized(self, mock_coverage_class):
+    def test_is_coverage_initialized_true_when_initialized(self, mock_cov, fake_config):
         """Test is_coverage_initialized returns True when coverage is initialized."""
-        mock_coverage_instance = Mock()
-        mock_coverage_instance._started = True
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        mock_coverage_class, mock_coverage_instance = mock_cov
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            initialize_coverage()
-            assert is_coverage_initialized()
+        initialize_coverage()
+        assert is_coverage_initialized()
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_reset_coverage_cache_stops_coverage(self, mock_coverage_class):
+    def test_reset_coverage_cache_stops_coverage(self, mock_cov, fake_config):
         """Test that reset_coverage_cache stops active coverage."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
+        mock_coverage_class, mock_coverage_instance = mock_cov
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        # Initialize coverage
+        initialize_coverage()
+        assert is_coverage_initialized()
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            # Initialize coverage
-            initialize_coverage()
-            assert is_coverage_initialized()
-            
-            # Reset cache
-            reset_coverage_cache()
-            
-            # Verify coverage was stopped
-            mock_coverage_instance.stop.assert_called_once()
-            assert not is_coverage_initialized()
+        # Reset cache
+        reset_coverage_cache()
+        
+        # Verify coverage was stopped
+        mock_coverage_instance.stop.assert_called_once()
+        assert not is_coverage_initialized()
     
     def test_reset_coverage_cache_handles_stop_error(self):
         """Test that reset_coverage_cache handles errors when stopping coverage."""
         # Manually set a mock coverage instance that raises error on stop
-        import layer.python.coverage_wrapper.wrapper as wrapper_module
-        mock_coverage = Mock()
+        mock_coverage = Mock(spec=coverage.Coverage)
         mock_coverage.stop.side_effect = Exception("Stop failed")
-        wrapper_module._coverage_instance = mock_coverage
+        _inject_cov(mock_coverage)
         
         # Should not raise exception
         reset_coverage_cache()
@@ -279,370 +298,225 @@ class TestCoverageUtilities:
         assert not is_coverage_initialized()
 
 
+@pytest.mark.xdist_group(name="wrapper_integration")
 class TestIntegration:
     """Integration tests for coverage initialization."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    def test_full_initialization_flow(self):
+    @pytest.mark.slow
+    def test_full_initialization_flow(self, coverage_env):
         """Test complete initialization flow with real coverage instance."""
         env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
+            **_BASE_ENV,
             'COVERAGE_S3_PREFIX': 'integration-test/',
             'COVERAGE_BRANCH_COVERAGE': 'true'
         }
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            # Initialize coverage
-            cov = initialize_coverage()
-            
-            # Verify it's a real coverage instance
-            assert isinstance(cov, coverage.Coverage)
-            assert is_coverage_initialized()
-            
-            # Verify configuration was cached
-            config = get_cached_config()
-            assert config.s3_bucket == 'test-bucket'
-            assert config.s3_prefix == 'integration-test/'
-            assert config.branch_coverage is True
-            
-            # Verify second call returns same instance
-            cov2 = initialize_coverage()
-            assert cov is cov2
+        coverage_env(env_vars)
+        
+        # Initialize coverage
+        cov = initialize_coverage()
+        
+        # Verify it's a real coverage instance
+        assert isinstance(cov, coverage.Coverage)
+        assert is_coverage_initialized()
+        
+        # Verify configuration was cached
+        config = get_cached_config()
+        assert config.s3_bucket == 'test-bucket'
+        assert config.s3_prefix == 'integration-test/'
+        assert config.branch_coverage is True
+        
+        # Verify second call returns same instance
+        cov2 = initialize_coverage()
+        assert cov is cov2
 
 
+@pytest.mark.xdist_group(name="wrapper_finalization")
 class TestCoverageFinalization:
     """Test coverage finalization functionality."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    @patch('os.path.join')
-    @patch('uuid.uuid4')
-    def test_finalize_coverage_creates_file(self, mock_uuid, mock_path_join, mock_coverage_class):
+    @patch('uuid.uuid4', return_value=UUID('12345678-1234-1234-1234-123456789012'))
+    def test_finalize_coverage_creates_file(self, mock_uuid, mock_cov, fake_config, coverage_env, tmp_path, monkeypatch):
         """Test that finalize_coverage creates coverage file."""
         # Setup mocks
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        mock_uuid.return_value = Mock()
-        mock_uuid.return_value.__str__ = Mock(return_value='12345678-1234-1234-1234-123456789012')
-        mock_path_join.return_value = '/tmp/coverage-test-func-12345678.json'
+        mock_coverage_class, mock_coverage_instance = mock_cov
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
-            'AWS_LAMBDA_FUNCTION_NAME': 'test-func'
-        }
+        def write_report(outfile):
+            with open(outfile, 'w') as report:
+                report.write('{"files": {}}')
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            # Initialize coverage first
-            initialize_coverage()
-            
-            # Finalize coverage
-            from layer.python.coverage_wrapper.wrapper import finalize_coverage
-            result = finalize_coverage()
-            
-            # Verify coverage was stopped
-            mock_coverage_instance.stop.assert_called_once()
-            
-            # Verify JSON report was generated
-            mock_coverage_instance.json_report.assert_called_once_with(
-                outfile='/tmp/coverage-test-func-12345678.json'
-            )
-            
-            # Verify correct file path returned
-            assert result == '/tmp/coverage-test-func-12345678.json'
+        mock_coverage_instance.json_report.side_effect = write_report
+        monkeypatch.setattr(wrapper_module, '_REPORT_DIR', str(tmp_path))
+        expected_path = str(tmp_path / 'coverage-test-func-12345678.json')
+        
+        coverage_env(_LAMBDA_ENV)
+        
+        # Initialize coverage first
+        initialize_coverage()
+        
+        # Finalize coverage
+        result = finalize_coverage()
+        
+        # Verify coverage was stopped
+        mock_coverage_instance.stop.assert_called_once()
+        
+        # Verify JSON report was generated
+        mock_coverage_instance.json_report.assert_called_once_with(outfile=expected_path)
+        
+        # Verify correct file path returned
+        assert result == expected_path
     
     def test_finalize_coverage_no_instance_returns_none(self):
         """Test that finalize_coverage returns None when no coverage instance exists."""
-        from layer.python.coverage_wrapper.wrapper import finalize_coverage
         result = finalize_coverage()
         assert result is None
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_finalize_coverage_handles_error(self, mock_coverage_class):
-        """Test that finalize_coverage handles errors during finalization."""
-        mock_coverage_instance = Mock()
+    def test_finalize_coverage_handles_error(self, wrapper_logger):
+        """Test that finalize_coverage returns None and drops the instance when stopping fails."""
+        mock_coverage_instance = Mock(spec=coverage.Coverage)
         mock_coverage_instance.stop.side_effect = Exception("Stop failed")
-        mock_coverage_class.return_value = mock_coverage_instance
+        _inject_cov(mock_coverage_instance)
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
+        assert finalize_coverage() is None
         
-        with patch.dict(os.environ, env_vars, clear=True):
-            initialize_coverage()
+        error_kwargs = wrapper_logger.error.call_args.kwargs
+        assert _STOP_FAILED_RE.search(error_kwargs['error'])
+        assert not is_coverage_initialized()
+
+
+def _run_in_context(workload):
+    """Run workload inside a CoverageContext block."""
+    with CoverageContext():
+        return workload()
+
+
+@coverage_handler
+def _workload_handler(event, context):
+    """Lambda handler that runs the workload carried in its event."""
+    return event['workload']()
+
+
+# Lambda context stand-in with enough remaining time for finalization and upload
+_LAMBDA_CONTEXT = SimpleNamespace(
+    aws_request_id='test-request-id',
+    function_name='test-func',
+    function_version='1',
+    memory_limit_in_mb=128,
+    get_remaining_time_in_millis=lambda: 30000
+)
+
+
+def _run_in_handler(workload):
+    """Run workload as the body of a coverage_handler-decorated Lambda handler."""
+    return _workload_handler({"workload": workload}, _LAMBDA_CONTEXT)
+
+
+def _failing_workload():
+    raise ValueError("Test error")
+
+
+# Runs each shared behaviour test through both coverage entry points
+_ENTRY_POINTS = pytest.mark.parametrize(
+    'run', [_run_in_context, _run_in_handler], ids=['context', 'handler']
+)
+
+
+@pytest.mark.xdist_group(name="wrapper_entry_points")
+class TestCoverageEntryPoints:
+    """Test behaviour shared by CoverageContext and coverage_handler."""
+    
+    @pytest.fixture
+    def report_file(self, tmp_path):
+        """Coverage report on disk, as finalize_coverage would leave it."""
+        path = tmp_path / 'coverage-test.json'
+        path.write_text('{"files": {}}')
+        return str(path)
+    
+    @_ENTRY_POINTS
+    def test_normal_flow(self, run, mock_cov, mock_upload, fake_config, report_file):
+        """Test that coverage is started, finalized, uploaded and cleaned up."""
+        mock_coverage_class, _ = mock_cov
+        
+        with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
+            mock_finalize.return_value = report_file
+            
+            result = run(lambda: {"statusCode": 200, "body": "success"})
+            
+            # Verify result
+            assert result == {"statusCode": 200, "body": "success"}
             
-            from layer.python.coverage_wrapper.wrapper import finalize_coverage
-            with pytest.raises(Exception, match="Stop failed"):
-                finalize_coverage()
+            # Verify coverage was initialized
+            mock_coverage_class.assert_called_once()
+            
+            # Verify finalize was called
+            mock_finalize.assert_called_once()
+            
+            # Verify upload was called
+            mock_upload.assert_called_once_with(report_file)
+            
+            # Verify the temporary report was cleaned up
+            assert not os.path.exists(report_file)
+    
+    @_ENTRY_POINTS
+    def test_handles_upload_error(self, run, mock_cov, mock_upload, fake_config):
+        """Test that upload errors are handled gracefully."""
+        mock_upload.side_effect = Exception("Upload failed")
+        
+        with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
+            mock_finalize.return_value = '/tmp/coverage-test.json'
+            
+            # Should not raise exception despite upload failure
+            result = run(lambda: {"statusCode": 200})
+            assert result == {"statusCode": 200}
+    
+    @_ENTRY_POINTS
+    def test_propagates_exceptions(self, run, mock_cov, fake_config):
+        """Test that exceptions from the tracked code propagate after finalization."""
+        with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
+            mock_finalize.return_value = None
+            
+            # Exception should be propagated
+            with pytest.raises(ValueError, match="Test error"):
+                run(_failing_workload)
+            
+            # Finalize should still be called
+            mock_finalize.assert_called_once()
 
 
+@pytest.mark.xdist_group(name="wrapper_context")
 class TestCoverageContext:
     """Test CoverageContext context manager."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    @patch('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file')
-    @patch('os.remove')
-    def test_coverage_context_normal_flow(self, mock_remove, mock_upload, mock_coverage_class):
-        """Test CoverageContext normal execution flow."""
-        # Setup mocks
-        mock_coverage_instance = Mock()
-        mock_coverage_instance._started = True
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
-            'AWS_LAMBDA_FUNCTION_NAME': 'test-func'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = '/tmp/coverage-test.json'
-                
-                from layer.python.coverage_wrapper.wrapper import CoverageContext
-                
-                # Use context manager
-                with CoverageContext() as ctx:
-                    assert ctx is not None
-                
-                # Verify finalize was called
-                mock_finalize.assert_called_once()
-                
-                # Verify upload was called
-                mock_upload.assert_called_once_with('/tmp/coverage-test.json')
-                
-                # Verify cleanup was called
-                mock_remove.assert_called_once_with('/tmp/coverage-test.json')
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_coverage_context_handles_init_error(self, mock_coverage_class):
+    def test_coverage_context_handles_init_error(self, mock_cov, fake_config):
         """Test CoverageContext handles initialization errors gracefully."""
+        mock_coverage_class, _ = mock_cov
         mock_coverage_class.side_effect = Exception("Init failed")
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            from layer.python.coverage_wrapper.wrapper import CoverageContext
-            
-            # Should not raise exception
-            with CoverageContext() as ctx:
-                assert ctx is not None
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    @patch('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file')
-    def test_coverage_context_handles_upload_error(self, mock_upload, mock_coverage_class):
-        """Test CoverageContext handles upload errors gracefully."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        mock_upload.side_effect = Exception("Upload failed")
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = '/tmp/coverage-test.json'
-                
-                from layer.python.coverage_wrapper.wrapper import CoverageContext
-                
-                # Should not raise exception
-                with CoverageContext():
-                    pass
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_coverage_context_with_exception_in_block(self, mock_coverage_class):
-        """Test CoverageContext handles exceptions in the with block."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = None
-                
-                from layer.python.coverage_wrapper.wrapper import CoverageContext
-                
-                # Exception in with block should be propagated
-                with pytest.raises(ValueError, match="Test error"):
-                    with CoverageContext():
-                        raise ValueError("Test error")
-                
-                # Finalize should still be called
-                mock_finalize.assert_called_once()
+        # Should not raise exception
+        with CoverageContext() as ctx:
+            assert ctx is not None
 
 
+@pytest.mark.xdist_group(name="wrapper_handler")
 class TestCoverageHandlerDecorator:
     """Test coverage_handler decorator."""
     
-    def setup_method(self):
-        """Reset cache before each test."""
-        reset_coverage_cache()
-    
-    def teardown_method(self):
-        """Clean up after each test."""
-        reset_coverage_cache()
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    @patch('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file')
-    @patch('os.remove')
-    def test_coverage_handler_normal_flow(self, mock_remove, mock_upload, mock_coverage_class):
-        """Test coverage_handler decorator normal execution flow."""
-        # Setup mocks
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket',
-            'AWS_LAMBDA_FUNCTION_NAME': 'test-func'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = '/tmp/coverage-test.json'
-                
-                from layer.python.coverage_wrapper.wrapper import coverage_handler
-                
-                # Create test Lambda handler
-                @coverage_handler
-                def test_handler(event, context):
-                    return {"statusCode": 200, "body": "success"}
-                
-                # Call the handler
-                result = test_handler({"test": "event"}, {"test": "context"})
-                
-                # Verify result
-                assert result == {"statusCode": 200, "body": "success"}
-                
-                # Verify coverage was initialized
-                mock_coverage_class.assert_called_once()
-                
-                # Verify finalize was called
-                mock_finalize.assert_called_once()
-                
-                # Verify upload was called
-                mock_upload.assert_called_once_with('/tmp/coverage-test.json')
-                
-                # Verify cleanup was called
-                mock_remove.assert_called_once_with('/tmp/coverage-test.json')
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_coverage_handler_preserves_function_metadata(self, mock_coverage_class):
+    def test_coverage_handler_preserves_function_metadata(self):
         """Test that coverage_handler preserves original function metadata."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage'):
-                from layer.python.coverage_wrapper.wrapper import coverage_handler
-                
-                @coverage_handler
-                def test_handler(event, context):
-                    """Test handler docstring."""
-                    return {"statusCode": 200}
-                
-                # Verify function metadata is preserved
-                assert test_handler.__name__ == 'test_handler'
-                assert test_handler.__doc__ == 'Test handler docstring.'
+        assert _workload_handler.__name__ == '_workload_handler'
+        assert _workload_handler.__doc__ == 'Lambda handler that runs the workload carried in its event.'
     
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_coverage_handler_propagates_exceptions(self, mock_coverage_class):
-        """Test that coverage_handler propagates exceptions from handler."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = None
-                
-                from layer.python.coverage_wrapper.wrapper import coverage_handler
-                
-                @coverage_handler
-                def failing_handler(event, context):
-                    raise ValueError("Handler failed")
-                
-                # Exception should be propagated
-                with pytest.raises(ValueError, match="Handler failed"):
-                    failing_handler({"test": "event"}, {"test": "context"})
-                
-                # Finalize should still be called in finally block
-                mock_finalize.assert_called_once()
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    @patch('layer.python.coverage_wrapper.s3_uploader.upload_coverage_file')
-    def test_coverage_handler_handles_finalize_error(self, mock_upload, mock_coverage_class):
-        """Test that coverage_handler handles finalization errors gracefully."""
-        mock_coverage_instance = Mock()
-        mock_coverage_class.return_value = mock_coverage_instance
-        mock_upload.side_effect = Exception("Upload failed")
-        
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
-                mock_finalize.return_value = '/tmp/coverage-test.json'
-                
-                from layer.python.coverage_wrapper.wrapper import coverage_handler
-                
-                @coverage_handler
-                def test_handler(event, context):
-                    return {"statusCode": 200}
-                
-                # Should not raise exception despite upload failure
-                result = test_handler({"test": "event"}, {"test": "context"})
-                assert result == {"statusCode": 200}
-    
-    @patch('layer.python.coverage_wrapper.wrapper.coverage.Coverage')
-    def test_coverage_handler_handles_init_error(self, mock_coverage_class):
-        """Test that coverage_handler handles initialization errors gracefully."""
+    def test_coverage_handler_handles_init_error(self, mock_cov, fake_config):
+        """Test that coverage_handler runs the handler without coverage when initialization fails."""
+        mock_coverage_class, _ = mock_cov
         mock_coverage_class.side_effect = Exception("Init failed")
         
-        env_vars = {
-            'COVERAGE_S3_BUCKET': 'test-bucket'
-        }
-        
-        with patch.dict(os.environ, env_vars, clear=True):
-            from layer.python.coverage_wrapper.wrapper import coverage_handler
+        with patch('layer.python.coverage_wrapper.wrapper.finalize_coverage') as mock_finalize:
+            # initialize_coverage degrades to None, so the handler still runs
+            result = _run_in_handler(lambda: {"statusCode": 200})
             
-            @coverage_handler
-            def test_handler(event, context):
-                return {"statusCode": 200}
+            assert result == {"statusCode": 200}
+            assert not is_coverage_initialized()
             
-            # Should propagate the initialization error
-            with pytest.raises(Exception, match="Init failed"):
-                test_handler({"test": "event"}, {"test": "context"})
\ No newline at end of file
+            # Nothing to finalize without coverage
+            mock_finalize.assert_not_called()